@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Benchmark of the XML serialization of large settings trees (see pymodaq_gui.parameter.ioxml)
+
+A tree holding a given number of parameters (of all the types handled by ioxml) is built once,
+then the benchmark measures the time taken to:
+
+* encode: convert the tree into a XML string (parameter_to_xml_string)
+* decode: convert the XML string back into a list of dict (XML_string_to_parameter)
+* options: get the XML attributes of all parameters (dict_from_param)
+
+It only uses the public API of ioxml so that a reference version of the ioxml module (for
+instance taken from an older commit) can be benchmarked alongside the current one to measure the
+speed-up. Runs of both versions are interleaved so that both suffer the same system load, and the
+output of both versions is checked to be identical. Results can be written as JSON.
+
+Examples
+--------
+python benchmarks/ioxml_benchmark.py --output ioxml.json
+git show HEAD~1:src/pymodaq_gui/parameter/ioxml.py > old_ioxml.py
+python benchmarks/ioxml_benchmark.py --params 5000 --reference old_ioxml.py
+"""
+import argparse
+import datetime
+import gc
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+from qtpy import QtGui, QtWidgets, QT_VERSION, API_NAME
+from qtpy.QtCore import QDateTime
+
+from pymodaq_gui.parameter import Parameter, ioxml
+from pymodaq_gui.parameter import utils as putils
+
+
+PARAMS_PER_GROUP = 20
+
+
+def make_children(index: int) -> List[dict]:
+    """Parameters of all the types serialized by ioxml, their values depending on index"""
+    return [
+        {'title': 'Float:', 'name': 'float', 'type': 'float', 'value': 0.1 * index, 'suffix': 's'},
+        {'title': 'Int:', 'name': 'int', 'type': 'int', 'value': index, 'min': 0},
+        {'title': 'Slide:', 'name': 'slide', 'type': 'slide', 'value': 0.5, 'limits': [0, 1]},
+        {'title': 'Str:', 'name': 'str', 'type': 'str', 'value': f'some text {index}'},
+        {'title': 'Text:', 'name': 'text', 'type': 'text', 'value': 'a longer\ntext'},
+        {'title': 'Bool:', 'name': 'bool', 'type': 'bool', 'value': index % 2 == 0},
+        {'title': 'Push:', 'name': 'bool_push', 'type': 'bool_push', 'value': False, 'label': 'Push'},
+        {'title': 'Led:', 'name': 'led', 'type': 'led', 'value': True},
+        {'title': 'List:', 'name': 'list', 'type': 'list', 'limits': ['DAQ0D', 'DAQ1D', 'DAQ2D'],
+         'value': 'DAQ1D'},
+        {'title': 'Dict list:', 'name': 'dict_list', 'type': 'list', 'limits': {'a': 0, 'b': 1}, 'value': 1},
+        {'title': 'Float list:', 'name': 'float_list', 'type': 'list', 'limits': [0.1, 0.2], 'value': 0.2},
+        {'title': 'Items:', 'name': 'itemselect', 'type': 'itemselect',
+         'value': dict(all_items=['item0', 'item1', 'item2'], selected=['item1'])},
+        {'title': 'Color:', 'name': 'color', 'type': 'color', 'value': QtGui.QColor(index % 256, 0, 255)},
+        {'title': 'Date time:', 'name': 'date_time', 'type': 'date_time',
+         'value': QDateTime.fromMSecsSinceEpoch(1_700_000_000_000 + index)},
+        {'title': 'Date:', 'name': 'date', 'type': 'date',
+         'value': QDateTime.fromMSecsSinceEpoch(1_700_000_000_000).date()},
+        {'title': 'Table:', 'name': 'table', 'type': 'table',
+         'value': OrderedDict(key1=float(index), key2='value')},
+        {'title': 'Browse:', 'name': 'browse', 'type': 'browsepath', 'value': '', 'filetype': False},
+        {'title': 'Group list:', 'name': 'group_list', 'type': 'list', 'limits': ['a', 'b'],
+         'addList': ['a', 'b'], 'value': 'a'},
+        {'title': 'Action:', 'name': 'action', 'type': 'action'},
+        {'title': 'Readonly:', 'name': 'readonly', 'type': 'float', 'value': 1., 'readonly': True,
+         'visible': False},
+    ]
+
+
+def make_settings(n_params: int) -> Parameter:
+    """A settings tree of about n_params parameters, grouped by PARAMS_PER_GROUP"""
+    n_groups = max(1, n_params // (PARAMS_PER_GROUP + 1))
+    return Parameter.create(name='settings', type='group', children=[
+        {'title': f'Group {ind}', 'name': f'group{ind:04d}', 'type': 'group', 'children': make_children(ind)}
+        for ind in range(n_groups)])
+
+
+def load_reference(file_path: Path) -> ModuleType:
+    """Load another version of the ioxml module from its file"""
+    spec = importlib.util.spec_from_file_location('reference_ioxml', file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_function(function: Callable) -> float:
+    """Duration (in ms) of a call to function, the garbage collector being disabled"""
+    gc.collect()
+    gc.disable()
+    try:
+        tic = time.perf_counter()
+        function()
+        return (time.perf_counter() - tic) * 1000
+    finally:
+        gc.enable()
+
+
+def get_cases(module: ModuleType, settings: Parameter, params: List[Parameter], xml_string: bytes) \
+        -> Dict[str, Callable]:
+    return dict(encode=lambda: module.parameter_to_xml_string(settings),
+                decode=lambda: module.XML_string_to_parameter(xml_string),
+                options=lambda: [module.dict_from_param(param) for param in params])
+
+
+def run(n_params=5000, n_repeat=5, reference: ModuleType = None) -> List[dict]:
+    settings = make_settings(n_params)
+    params = putils.iter_children_params(settings, [])
+    xml_string = ioxml.parameter_to_xml_string(settings)
+    modules = dict(current=ioxml)
+    if reference is not None:
+        if reference.parameter_to_xml_string(settings) != xml_string:
+            raise ValueError('The reference and the current ioxml do not produce the same XML')
+        modules['reference'] = reference
+
+    cases = {version: get_cases(module, settings, params, xml_string) for version, module in modules.items()}
+    durations = {(version, name): [] for version in modules for name in cases['current']}
+    for _ in range(n_repeat):
+        for version in modules:
+            for name, function in cases[version].items():
+                durations[(version, name)].append(time_function(function))
+
+    results = []
+    for name in cases['current']:
+        result = dict(key=f'{name}/params={len(params)}', n_params=len(params), xml_bytes=len(xml_string))
+        for version in modules:
+            result[version] = dict(best=float(np.min(durations[(version, name)])),
+                                   median=float(np.median(durations[(version, name)])))
+        if 'reference' in result:
+            result['speedup'] = result['reference']['best'] / result['current']['best']
+        results.append(result)
+    return results
+
+
+def get_metadata() -> dict:
+    return dict(date=datetime.datetime.now().isoformat(timespec='seconds'),
+                python=platform.python_version(),
+                platform=platform.platform(),
+                qt_api=API_NAME,
+                qt=QT_VERSION,
+                ioxml=ioxml.__file__)
+
+
+def print_results(results: List[dict]):
+    print(f'{"case":<24} {"best ms":>9} {"median ms":>10} {"ref. ms":>9} {"speed-up":>9}')
+    for result in results:
+        comparison = ''
+        if 'reference' in result:
+            comparison = f'{result["reference"]["best"]:>9.1f} {result["speedup"]:>9.2f}'
+        print(f'{result["key"]:<24} {result["current"]["best"]:>9.1f} {result["current"]["median"]:>10.1f} '
+              f'{comparison}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of the XML serialization of settings trees')
+    parser.add_argument('--params', type=int, default=5000, help='Number of parameters of the tree')
+    parser.add_argument('--repeat', type=int, default=10, help='Number of timed runs per case')
+    parser.add_argument('--reference', type=Path, default=None,
+                        help='File of another version of the ioxml module to compare to')
+    parser.add_argument('--output', type=Path, default=None, help='JSON file where to save the results')
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication(sys.argv)
+
+    reference = load_reference(args.reference) if args.reference is not None else None
+    results = run(args.params, args.repeat, reference)
+    print_results(results)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(dict(metadata=get_metadata(), results=results), f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Benchmark of the show_data hot paths of the data viewers (Viewer0D, Viewer1D, Viewer2D and ViewerND)
+
+For each viewer, data size, number of channels, number of ROIs and crosshair state, the benchmark
+measures the throughput (frames per second), the per frame latency percentiles and the memory
+allocated per show_data call (peak, as measured by tracemalloc).
+
+It runs headless (using the Qt offscreen platform if no other platform is specified) and writes its
+results as JSON. A previous result file can be used as a baseline to detect regressions.
+
+Examples
+--------
+python benchmarks/viewers_benchmark.py --output bench.json
+python benchmarks/viewers_benchmark.py --viewers Viewer1D Viewer2D --quick
+python benchmarks/viewers_benchmark.py --output new.json --compare bench.json --tolerance 0.2
+"""
+import argparse
+import datetime
+import gc
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, List
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+from qtpy import QtWidgets, QT_VERSION, API_NAME
+
+from pymodaq_data import data as data_mod
+from pymodaq_gui.plotting.data_viewers.viewer0D import Viewer0D
+from pymodaq_gui.plotting.data_viewers.viewer1D import Viewer1D
+from pymodaq_gui.plotting.data_viewers.viewer2D import Viewer2D
+from pymodaq_gui.plotting.data_viewers.viewerND import ViewerND
+
+
+VIEWERS = dict(Viewer0D=Viewer0D, Viewer1D=Viewer1D, Viewer2D=Viewer2D, ViewerND=ViewerND)
+
+SIZES = dict(Viewer0D=[1], Viewer1D=[256, 4096, 65536], Viewer2D=[64, 256, 1024], ViewerND=[16, 64])
+QUICK_SIZES = dict(Viewer0D=[1], Viewer1D=[1024], Viewer2D=[128], ViewerND=[16])
+CHANNELS = dict(Viewer0D=[1, 4], Viewer1D=[1, 4], Viewer2D=[1, 3], ViewerND=[1])
+ROIS = dict(Viewer0D=[0], Viewer1D=[0, 1, 8], Viewer2D=[0, 1, 4], ViewerND=[0])
+CROSSHAIR = dict(Viewer0D=[False], Viewer1D=[False, True], Viewer2D=[False, True], ViewerND=[False])
+
+
+@dataclass
+class BenchmarkCase:
+    viewer: str
+    size: int
+    n_channels: int = 1
+    n_rois: int = 0
+    crosshair: bool = False
+
+    @property
+    def key(self) -> str:
+        return (f'{self.viewer}/size={self.size}/channels={self.n_channels}/rois={self.n_rois}/'
+                f'crosshair={self.crosshair}')
+
+
+@dataclass
+class BenchmarkResult:
+    case: BenchmarkCase
+    n_frames: int
+    fps: float
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    memory_kb: float = 0.
+
+    def to_dict(self) -> dict:
+        result = asdict(self)
+        result['key'] = self.case.key
+        return result
+
+
+def get_cases(viewers: List[str], quick=False) -> List[BenchmarkCase]:
+    sizes = QUICK_SIZES if quick else SIZES
+    cases = []
+    for viewer in viewers:
+        for size, n_channels, n_rois, crosshair in itertools.product(
+                sizes[viewer], CHANNELS[viewer], ROIS[viewer], CROSSHAIR[viewer]):
+            if quick and n_rois > 1:
+                continue
+            cases.append(BenchmarkCase(viewer, size, n_channels, n_rois, crosshair))
+    return cases
+
+
+def make_data(case: BenchmarkCase, frame_index: int = 0) -> data_mod.DataRaw:
+    """Create some data whose shape is defined by the benchmark case"""
+    rng = np.random.default_rng(frame_index)
+    if case.viewer == 'Viewer0D':
+        shape = (1,)
+    elif case.viewer == 'Viewer1D':
+        shape = (case.size,)
+    elif case.viewer == 'Viewer2D':
+        shape = (case.size, case.size)
+    else:
+        shape = (case.size, case.size, 128)
+    arrays = [rng.random(shape) for _ in range(case.n_channels)]
+    if case.viewer == 'ViewerND':
+        return data_mod.DataRaw('bench', data=arrays, nav_indexes=(0, 1),
+                                axes=[data_mod.Axis(f'axis{ind}', data=np.arange(shape[ind]), index=ind)
+                                      for ind in range(len(shape))])
+    return data_mod.DataRaw('bench', data=arrays)
+
+
+def setup_viewer(case: BenchmarkCase):
+    widget = QtWidgets.QWidget()
+    viewer = VIEWERS[case.viewer](widget)
+    widget.show()
+    if case.n_rois > 0:
+        viewer.show_data(make_data(case))
+        for _ in range(case.n_rois):
+            viewer.roi_manager.add_roi_programmatically('' if case.viewer == 'Viewer1D' else 'RectROI')
+        viewer.activate_roi(True)
+    if case.crosshair:
+        viewer.trigger_action('crosshair')
+    QtWidgets.QApplication.processEvents()
+    return widget, viewer
+
+
+def run_case(case: BenchmarkCase, n_frames=100, n_warmup=10, n_memory=10,
+             process_events=True) -> BenchmarkResult:
+    """Measure the show_data throughput, latency and memory for a given case
+
+    The data frames are created before the measurements, so that only the viewer is timed. If
+    process_events is True, the Qt event loop is processed after each frame (rendering included)
+    """
+    widget, viewer = setup_viewer(case)
+    n_distinct = min(n_frames, 10)
+    frames = [make_data(case, ind) for ind in range(n_distinct)]
+
+    for ind in range(n_warmup):
+        viewer.show_data(frames[ind % n_distinct])
+        if process_events:
+            QtWidgets.QApplication.processEvents()
+
+    gc.collect()
+    latencies = np.zeros((n_frames,))
+    start = time.perf_counter()
+    for ind in range(n_frames):
+        tic = time.perf_counter()
+        viewer.show_data(frames[ind % n_distinct])
+        if process_events:
+            QtWidgets.QApplication.processEvents()
+        latencies[ind] = time.perf_counter() - tic
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    peaks = []
+    for ind in range(n_memory):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        viewer.show_data(frames[ind % n_distinct])
+        if process_events:
+            QtWidgets.QApplication.processEvents()
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    widget.close()
+    widget.deleteLater()
+    QtWidgets.QApplication.processEvents()
+
+    latencies_ms = latencies * 1000
+    return BenchmarkResult(case=case, n_frames=n_frames, fps=n_frames / total,
+                           latency_ms=dict(mean=float(np.mean(latencies_ms)),
+                                           p50=float(np.percentile(latencies_ms, 50)),
+                                           p90=float(np.percentile(latencies_ms, 90)),
+                                           p99=float(np.percentile(latencies_ms, 99)),
+                                           max=float(np.max(latencies_ms))),
+                           memory_kb=float(np.mean(peaks)) / 1024)
+
+
+def get_metadata() -> dict:
+    return dict(date=datetime.datetime.now().isoformat(timespec='seconds'),
+                python=platform.python_version(),
+                platform=platform.platform(),
+                numpy=np.__version__,
+                qt_api=API_NAME,
+                qt=QT_VERSION,
+                qpa_platform=os.environ.get('QT_QPA_PLATFORM', ''))
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance=0.2) -> List[dict]:
+    """Compare results with a baseline, return the list of regressions
+
+    A case is a regression if its fps decreased, or its median latency or memory per call increased,
+    by more than tolerance (relative)
+    """
+    baseline_dict = {result['key']: result for result in baseline}
+    regressions = []
+    for result in results:
+        ref = baseline_dict.get(result['key'])
+        if ref is None:
+            continue
+        ratios = dict(fps=result['fps'] / ref['fps'] if ref['fps'] > 0 else 1.,
+                      p50=(result['latency_ms']['p50'] / ref['latency_ms']['p50']
+                           if ref['latency_ms']['p50'] > 0 else 1.),
+                      memory=(result['memory_kb'] / ref['memory_kb'] if ref['memory_kb'] > 0 else 1.))
+        result['baseline_ratio'] = ratios
+        if ratios['fps'] < 1 - tolerance or ratios['p50'] > 1 + tolerance or \
+                ratios['memory'] > 1 + tolerance:
+            regressions.append(result)
+    return regressions
+
+
+def print_results(results: List[dict]):
+    print(f'{"case":<70} {"fps":>9} {"p50 ms":>8} {"p90 ms":>8} {"p99 ms":>8} {"mem kB":>9}'
+          f' {"fps ratio":>9}')
+    for result in results:
+        ratio = result.get('baseline_ratio', {}).get('fps', None)
+        print(f'{result["key"]:<70} {result["fps"]:>9.1f} {result["latency_ms"]["p50"]:>8.2f} '
+              f'{result["latency_ms"]["p90"]:>8.2f} {result["latency_ms"]["p99"]:>8.2f} '
+              f'{result["memory_kb"]:>9.1f} {"" if ratio is None else f"{ratio:>9.2f}"}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark of the data viewers show_data method')
+    parser.add_argument('--viewers', nargs='+', default=list(VIEWERS.keys()), choices=list(VIEWERS.keys()))
+    parser.add_argument('--frames', type=int, default=100, help='Number of timed frames per case')
+    parser.add_argument('--warmup', type=int, default=10, help='Number of untimed frames per case')
+    parser.add_argument('--quick', action='store_true', help='Run a reduced set of cases')
+    parser.add_argument('--no-events', action='store_true',
+                        help='Do not process the Qt events (rendering) after each frame')
+    parser.add_argument('--output', type=Path, default=None, help='JSON file where to save the results')
+    parser.add_argument('--compare', type=Path, default=None, help='JSON file of a baseline to compare to')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Relative tolerance before reporting a regression')
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication(sys.argv)
+
+    results = []
+    for case in get_cases(args.viewers, args.quick):
+        result = run_case(case, n_frames=args.frames, n_warmup=args.warmup,
+                          process_events=not args.no_events)
+        results.append(result.to_dict())
+
+    regressions = []
+    if args.compare is not None:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+
+    print_results(results)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(dict(metadata=get_metadata(), results=results), f, indent=2)
+
+    if len(regressions) > 0:
+        print(f'\n{len(regressions)} regression(s) compared to {args.compare}:')
+        for result in regressions:
+            print(f'    {result["key"]}: {result["baseline_ratio"]}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Background writing of data into h5 files from a dedicated thread fed by a bounded queue
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from qtpy.QtCore import QObject, Signal
+
+from pymodaq_utils.logger import set_logger, get_module_name
+
+from pymodaq_data.h5modules.backends import H5Backend, EARRAY
+
+
+logger = set_logger(get_module_name(__file__))
+
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_MAX_COALESCED = 64
+
+
+@dataclass
+class WriteRequest:
+    """A write operation to be executed in the writer thread
+
+    kind is either 'append' (append data to the enlargeable array), 'call' (execute function with
+    args and kwargs), 'flush' (flush the file and set the event) or 'stop'
+    """
+    kind: str
+    array: Optional[EARRAY] = None
+    data: Optional[np.ndarray] = None
+    function: Optional[Callable] = None
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    event: Optional[threading.Event] = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes if self.data is not None else 0
+
+
+def append_rows(array: EARRAY, rows: np.ndarray):
+    """Append in a single write several elements (stacked along the first axis) to an EARRAY"""
+    if array.backend == 'tables':
+        array.array.append(rows)
+    else:
+        nrows = array.array.len()
+        array.array.resize(nrows + len(rows), axis=0)
+        array.array[nrows:] = rows
+    shape = list(array.attrs['shape'])
+    shape[0] += len(rows)
+    array.attrs['shape'] = tuple(shape)
+
+
+class H5AsyncWriter(QObject):
+    """Execute the write operations on a h5 file in a dedicated thread
+
+    Operations are put in a bounded queue: when it is full, the calling thread is blocked until
+    room is available (or until the optional timeout, raising queue.Full) so that producers faster
+    than the disk are throttled instead of exhausting the memory. Consecutive appends of single
+    elements to the same enlargeable array are coalesced into a single chunked write.
+
+    The writer thread holds lock while writing, any other access to the file while the writer is
+    running should be done holding it or through submit.
+
+    Parameters
+    ----------
+    h5saver: H5SaverLowLevel
+        the object whose file is flushed on flush requests
+    max_queue_size: int
+        maximum number of pending operations
+    max_coalesced: int
+        maximum number of appends coalesced into a single write
+    """
+    flushed = Signal()
+    write_failed = Signal(str)
+
+    def __init__(self, h5saver, max_queue_size: int = DEFAULT_QUEUE_SIZE,
+                 max_coalesced: int = DEFAULT_MAX_COALESCED, parent: QObject = None):
+        super().__init__(parent)
+        self.h5saver = h5saver
+        self.max_coalesced = max_coalesced
+        self.lock = threading.RLock()
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._metrics_lock = threading.Lock()
+        self.reset_metrics()
+
+    @property
+    def max_queue_size(self) -> int:
+        return self._queue.maxsize
+
+    @max_queue_size.setter
+    def max_queue_size(self, max_queue_size: int):
+        with self._queue.mutex:
+            self._queue.maxsize = max_queue_size
+            self._queue.not_full.notify_all()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def in_writer_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def reset_metrics(self):
+        with self._metrics_lock:
+            self._max_queue_depth = 0
+            self._n_requests = 0
+            self._n_writes = 0
+            self._written_bytes = 0
+            self._write_time = 0.
+            self._blocked_time = 0.
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get the writing statistics since the last reset
+
+        Returns
+        -------
+        dict with keys: queue_depth, max_queue_depth, n_requests, n_writes (number of effective
+        writes once coalesced), written_bytes, throughput (in MB/s of writing time) and blocked_time
+        (total time in s the producers waited for room in the queue)
+        """
+        with self._metrics_lock:
+            return dict(queue_depth=self.queue_depth,
+                        max_queue_depth=self._max_queue_depth,
+                        n_requests=self._n_requests,
+                        n_writes=self._n_writes,
+                        written_bytes=self._written_bytes,
+                        throughput=self._written_bytes / 1024 ** 2 / self._write_time
+                        if self._write_time > 0 else 0.,
+                        blocked_time=self._blocked_time)
+
+    def start(self):
+        if self.is_running:
+            return
+        self._thread = threading.Thread(target=self._run, name='H5AsyncWriter', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """Process all pending operations then stop the writer thread"""
+        if not self.is_running:
+            return
+        if self.in_writer_thread():
+            raise RuntimeError('The writer thread cannot stop itself')
+        self._queue.put(WriteRequest('stop'))
+        self._thread.join(timeout)
+        self._thread = None
+
+    def wait(self):
+        """Block until all pending operations have been processed"""
+        if self.is_running and not self.in_writer_thread():
+            self._queue.join()
+
+    def _put(self, request: WriteRequest, timeout: float = None):
+        if not self.is_running:
+            raise RuntimeError('The writer thread is not running')
+        if self.in_writer_thread():  # the writer cannot wait for itself, execute it right away
+            self._process([request])
+            return
+        start = time.perf_counter()
+        try:
+            self._queue.put(request, block=True, timeout=timeout)
+        finally:
+            with self._metrics_lock:
+                self._blocked_time += time.perf_counter() - start
+        with self._metrics_lock:
+            self._n_requests += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+
+    def append(self, array: EARRAY, data: np.ndarray, timeout: float = None):
+        """Queue the appending of data to an enlargeable array
+
+        data is copied so that the caller can reuse its buffer. Blocks while the queue is full.
+
+        Raises
+        ------
+        queue.Full if timeout is not None and no room was available in time
+        """
+        if not isinstance(data, np.ndarray):
+            raise TypeError('The appended object should be a ndarray')
+        self._put(WriteRequest('append', array=array, data=np.array(data, copy=True)), timeout)
+
+    def submit(self, function: Callable, *args, timeout: float = None, **kwargs):
+        """Queue the call of function(*args, **kwargs) in the writer thread"""
+        self._put(WriteRequest('call', function=function, args=args, kwargs=kwargs), timeout)
+
+    def flush(self, timeout: float = None) -> threading.Event:
+        """Queue a flush of the file once the operations queued before are written
+
+        Returns
+        -------
+        threading.Event: set once the flush is done, the flushed signal is emitted as well
+        """
+        event = threading.Event()
+        self._put(WriteRequest('flush', event=event), timeout)
+        return event
+
+    def _run(self):
+        while True:
+            requests = [self._queue.get()]
+            while True:
+                try:
+                    requests.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any([request.kind == 'stop' for request in requests])
+            try:
+                with self.lock:
+                    self._process([request for request in requests if request.kind != 'stop'])
+            finally:
+                for _ in requests:
+                    self._queue.task_done()
+            if stop:
+                break
+
+    def _group_appends(self, requests: List[WriteRequest]) -> List[List[WriteRequest]]:
+        """Split the requests into groups: consecutive appends to the same array are put together"""
+        groups = []
+        for request in requests:
+            if request.kind == 'append' and len(groups) > 0 and groups[-1][0].kind == 'append' \
+                    and groups[-1][0].array.node is request.array.node \
+                    and len(groups[-1]) < self.max_coalesced:
+                groups[-1].append(request)
+            else:
+                groups.append([request])
+        return groups
+
+    def _process(self, requests: List[WriteRequest]):
+        for group in self._group_appends(requests):
+            start = time.perf_counter()
+            request = group[0]
+            try:
+                if request.kind == 'append':
+                    self._append(group)
+                elif request.kind == 'call':
+                    request.function(*request.args, **request.kwargs)
+                elif request.kind == 'flush':
+                    H5Backend.flush(self.h5saver)  # bypass the queuing flush of the saver
+            except Exception as e:
+                logger.exception(f'Error while writing into the h5 file: {e}')
+                self.write_failed.emit(str(e))
+            finally:
+                with self._metrics_lock:
+                    self._write_time += time.perf_counter() - start
+                    self._written_bytes += sum([req.nbytes for req in group])
+                if request.kind == 'flush':
+                    request.event.set()
+                    self.flushed.emit()
+
+    def _append(self, group: List[WriteRequest]):
+        array = group[0].array
+        element_shape = tuple(array.attrs['shape'][1:])
+        if len(group) > 1 and len(element_shape) > 0 and \
+                all([request.data.shape == element_shape for request in group]):
+            append_rows(array, np.stack([request.data for request in group]))
+            n_writes = 1
+        else:
+            for request in group:
+                array.append(request.data)
+            n_writes = len(group)
+        with self._metrics_lock:
+            self._n_writes += n_writes
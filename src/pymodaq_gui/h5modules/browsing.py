@@ -29,7 +29,13 @@ from pymodaq_data.h5modules.browsing import H5BrowserUtil
 
 from pymodaq_gui.parameter import ioxml
 from pymodaq_gui.utils.widgets.tree_layout import TreeLayout
-from pymodaq_gui.utils.utils import h5tree_to_QTree, pngbinary2Qlabel
+from pymodaq_gui.h5modules.tree_model import H5TreeModel
+from pymodaq_gui.h5modules.node_loader import H5NodeLoader
+from pymodaq_gui.h5modules.data_cache import CachedDataLoader
+from pymodaq_gui.h5modules.preview import H5Previewer, PreviewWidget
+from pymodaq_gui.h5modules.pixmap_cache import PixmapCache
+from pymodaq_gui.h5modules.bulk_export import H5BulkExporter, get_export_filters, get_format_from_filter
+from pymodaq_gui.h5modules.search_index import H5SearchIndex, H5IndexBuilder
 from pymodaq_gui.utils.file_io import select_file, select_file_filter
 from pymodaq_gui.plotting.data_viewers.viewerND import ViewerND
 from pymodaq_gui.managers.action_manager import ActionManager
@@ -44,15 +50,35 @@ logger = set_logger(get_module_name(__file__))
 class View(QObject):
     item_clicked_sig = Signal(object)
     item_double_clicked_sig = Signal(object)
-    
+    current_changed_sig = Signal(object)
+    search_sig = Signal(str)
+
     def __init__(self, widget: QtWidgets.QWidget, settings_tree, settings_attributes_tree):
         super().__init__()
         self.parent_widget = widget
         self.h5file_tree: TreeLayout = None
+        self.tree_model = H5TreeModel()
+        self.pixmap_cache = PixmapCache(parent=self)
+        self.pixmap_height = 90
 
         self._viewer_widget: QtWidgets.QWidget = None
         self._text_list: QtWidgets.QListWidget = None
         self._pixmap_widget: QtWidgets.QWidget = None
+        self._pixmap_labels: List[QtWidgets.QLabel] = []
+        self._pixmap_keys: list = []
+        self._tree_pixmap_labels: dict = dict()
+        self._preview_widget: PreviewWidget = None
+        self._loading_widget: QtWidgets.QWidget = None
+        self._loading_label: QtWidgets.QLabel = None
+        self._abort_button: QtWidgets.QToolButton = None
+        self._export_widget: QtWidgets.QWidget = None
+        self._export_bar: QtWidgets.QProgressBar = None
+        self._abort_export_button: QtWidgets.QToolButton = None
+        self._search_edit: QtWidgets.QLineEdit = None
+        self._search_results: QtWidgets.QListWidget = None
+        self._search_timer = QtCore.QTimer()
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(200)
 
         self.setup_ui(settings_tree, settings_attributes_tree)
 
@@ -65,36 +91,140 @@ class View(QObject):
 
         widget = QtWidgets.QWidget()
         # self.ui.h5file_tree = TreeLayout(Form,col_counts=2,labels=["Node",'Pixmap'])
-        self.h5file_tree = TreeLayout(widget, col_counts=1, labels=["Node"])
+        self.h5file_tree = TreeLayout(widget, col_counts=1, model=self.tree_model)
         self.h5file_tree.tree.setMinimumWidth(300)
+        self.h5file_tree.tree.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.tree_model.pixmap_items_fetched.connect(self.add_widget_to_tree)
+        self.pixmap_cache.pixmap_ready.connect(self.set_pixmap)
 
         self.h5file_tree.item_clicked_sig.connect(self.item_clicked_sig.emit)
         self.h5file_tree.item_double_clicked_sig.connect(self.item_double_clicked_sig.emit)
+        self.h5file_tree.tree.selectionModel().currentChanged.connect(
+            lambda current, previous: self.current_changed_sig.emit(current))
         
-        v_splitter.addWidget(widget)
+        tree_container = QtWidgets.QWidget()
+        tree_container.setLayout(QtWidgets.QVBoxLayout())
+        tree_container.layout().setContentsMargins(0, 0, 0, 0)
+        self._search_edit = QtWidgets.QLineEdit()
+        self._search_edit.setPlaceholderText('Search nodes: text or attribute=value')
+        self._search_edit.setClearButtonEnabled(True)
+        self._search_edit.textChanged.connect(lambda: self._search_timer.start())
+        self._search_timer.timeout.connect(lambda: self.search_sig.emit(self._search_edit.text()))
+        self._search_results = QtWidgets.QListWidget()
+        self._search_results.setVisible(False)
+        self._search_results.itemClicked.connect(lambda item: self.select_node(item.text()))
+        tree_container.layout().addWidget(self._search_edit)
+        tree_container.layout().addWidget(self._search_results)
+        tree_container.layout().addWidget(widget)
+
+        v_splitter.addWidget(tree_container)
         v_splitter.addWidget(settings_attributes_tree)
 
         h_splitter.addWidget(v_splitter)
         self._pixmap_widget = QtWidgets.QWidget()
+        self._pixmap_widget.setLayout(QtWidgets.QHBoxLayout())
         self._pixmap_widget.setMaximumHeight(100)
         v_splitter2.addWidget(self._pixmap_widget)
+        self._preview_widget = PreviewWidget()
+        self._preview_widget.setVisible(False)
+        v_splitter2.addWidget(self._preview_widget)
 
         v_splitter2.addWidget(settings_tree)
         self._text_list = QtWidgets.QListWidget()
 
         v_splitter2.addWidget(self._text_list)
         h_splitter.addWidget(v_splitter2)
+
+        viewer_container = QtWidgets.QWidget()
+        viewer_container.setLayout(QtWidgets.QVBoxLayout())
+        viewer_container.layout().setContentsMargins(0, 0, 0, 0)
+        self._loading_widget = QtWidgets.QWidget()
+        self._loading_widget.setLayout(QtWidgets.QHBoxLayout())
+        self._loading_widget.layout().setContentsMargins(0, 0, 0, 0)
+        self._loading_label = QtWidgets.QLabel()
+        loading_bar = QtWidgets.QProgressBar()
+        loading_bar.setRange(0, 0)  # busy indicator
+        self._abort_button = QtWidgets.QToolButton()
+        self._loading_widget.layout().addWidget(self._loading_label)
+        self._loading_widget.layout().addWidget(loading_bar)
+        self._loading_widget.layout().addWidget(self._abort_button)
+        self._loading_widget.setVisible(False)
+        viewer_container.layout().addWidget(self._loading_widget)
+
+        self._export_widget = QtWidgets.QWidget()
+        self._export_widget.setLayout(QtWidgets.QHBoxLayout())
+        self._export_widget.layout().setContentsMargins(0, 0, 0, 0)
+        self._export_bar = QtWidgets.QProgressBar()
+        self._export_bar.setFormat('Exporting: %v/%m')
+        self._abort_export_button = QtWidgets.QToolButton()
+        self._export_widget.layout().addWidget(self._export_bar)
+        self._export_widget.layout().addWidget(self._abort_export_button)
+        self._export_widget.setVisible(False)
+        viewer_container.layout().addWidget(self._export_widget)
+
         self._viewer_widget = QtWidgets.QWidget()
-        h_splitter.addWidget(self._viewer_widget)
+        viewer_container.layout().addWidget(self._viewer_widget)
+        h_splitter.addWidget(viewer_container)
         layout.addWidget(h_splitter)
         self.parent_widget.setLayout(layout)
 
     def current_node_path(self):
         return self.h5file_tree.current_node_path()
 
+    def selected_node_paths(self) -> List[str]:
+        """Paths of the selected nodes, ordered as displayed"""
+        indexes = sorted(self.h5file_tree.tree.selectionModel().selectedRows(0),
+                         key=lambda index: self.h5file_tree.tree.visualRect(index).top())
+        return [self.tree_model.item_from_index(index).path for index in indexes]
+
+    def search_text(self) -> str:
+        return self._search_edit.text()
+
+    def show_search_results(self, node_paths: List[str], message: str = ''):
+        """Display the paths of the nodes matching the search, or a message if there is none"""
+        self._search_results.clear()
+        self._search_results.addItems(node_paths)
+        if len(node_paths) == 0 and message != '':
+            self._search_results.addItem(message)
+            self._search_results.item(0).setFlags(Qt.NoItemFlags)
+        self._search_results.setVisible(self._search_results.count() > 0)
+
+    def select_node(self, node_path: str) -> bool:
+        """Expand the tree down to a node, select it and emit item_clicked_sig"""
+        index = self.tree_model.index_from_path(node_path)
+        if not index.isValid():
+            return False
+        self.h5file_tree.tree.setCurrentIndex(index)
+        self.h5file_tree.tree.scrollTo(index)
+        self.item_clicked_sig.emit(index)
+        return True
+
     def add_actions(self, actions: List[QtWidgets.QAction]):
         for action in actions:
             self.h5file_tree.tree.addAction(action)
+
+    def set_abort_action(self, action: QtWidgets.QAction):
+        self._abort_button.setDefaultAction(action)
+
+    def set_abort_export_action(self, action: QtWidgets.QAction):
+        self._abort_export_button.setDefaultAction(action)
+
+    def show_export_progress(self, done: int, total: int):
+        """Show the progress of a bulk export, hidden once all the nodes are exported"""
+        self._export_bar.setRange(0, total)
+        self._export_bar.setValue(done)
+        self._export_widget.setVisible(done < total)
+
+    def set_preview_visible(self, visible=True):
+        self._preview_widget.setVisible(visible)
+
+    def show_preview(self, preview, title=''):
+        self._preview_widget.show_preview(preview, title)
+
+    def show_loading(self, loading: bool, node_path: str = ''):
+        """Show or hide the busy indicator displayed while a node is loaded"""
+        self._loading_label.setText(f'Loading {node_path}' if loading else '')
+        self._loading_widget.setVisible(loading)
           
     @property  
     def viewer_widget(self):
@@ -109,32 +239,57 @@ class View(QObject):
         return self._pixmap_widget
 
     def clear(self):
-        self.h5file_tree.tree.clear()
+        self.tree_model.clear()
+        self.pixmap_cache.clear()
+        self._tree_pixmap_labels = dict()
+
+    def show_pixmaps(self, keys: list, pixmaps: list):
+        """Display binary images in the pixmap widget, reusing its labels
+
+        The images are decoded in the background by the pixmap cache and displayed when ready
 
-    def add_base_item(self, base_tree_item):
-        self.h5file_tree.tree.addTopLevelItem(base_tree_item)
+        Parameters
+        ----------
+        keys: list
+            the cache keys of each image
+        pixmaps: list of bytes
+        """
+        while len(self._pixmap_labels) < len(pixmaps):
+            self._pixmap_labels.append(QtWidgets.QLabel())
+            self._pixmap_widget.layout().addWidget(self._pixmap_labels[-1])
+        for ind, label in enumerate(self._pixmap_labels):
+            label.clear()
+            label.setVisible(ind < len(pixmaps))
+        self._pixmap_keys = list(keys)
+        for key, pixmap in zip(keys, pixmaps):
+            self.pixmap_cache.request(key, pixmap, self.pixmap_height)
+
+    def set_pixmap(self, key, pixmap: QtGui.QPixmap):
+        if key in self._pixmap_keys:
+            self._pixmap_labels[self._pixmap_keys.index(key)].setPixmap(pixmap)
+        if key in self._tree_pixmap_labels:
+            self._tree_pixmap_labels[key].setPixmap(pixmap)
+
+    def set_backend(self, h5utils, lock=None):
+        """Display the file opened in h5utils, the tree is populated lazily when groups are expanded"""
+        self.tree_model.set_backend(h5utils, lock)
+
+    def expand_top_levels(self, depth: int = 1):
+        self.h5file_tree.expand_to_depth(depth)
 
     def add_widget_to_tree(self, pixmap_items):
         for item in pixmap_items:
             widget = QtWidgets.QWidget()
 
             vLayout = QtWidgets.QVBoxLayout()
-            label1D = QtWidgets.QLabel()
-            bytes = QByteArray(item['node'].attrs['pixmap1D'])
-            im1 = QtGui.QImage.fromData(bytes)
-            a = QtGui.QPixmap.fromImage(im1)
-            label1D.setPixmap(a)
-
-            label2D = QtWidgets.QLabel()
-            bytes = QByteArray(item['node'].attrs['pixmap2D'])
-            im2 = QtGui.QImage.fromData(bytes)
-            b = QtGui.QPixmap.fromImage(im2)
-            label2D.setPixmap(b)
-
-            vLayout.addWidget(label1D)
-            vLayout.addwidget(label2D)
+            for attr_name in ('pixmap1D', 'pixmap2D'):
+                key = (item['node'].path, attr_name)
+                self._tree_pixmap_labels[key] = QtWidgets.QLabel()
+                vLayout.addWidget(self._tree_pixmap_labels[key])
+                self.pixmap_cache.request(key, item['node'].attrs[attr_name])
             widget.setLayout(vLayout)
-            self.h5file_tree.tree.setItemWidget(item['item'], 1, widget)
+            self.h5file_tree.tree.setColumnHidden(1, False)
+            self.h5file_tree.tree.setIndexWidget(item['index'], widget)
 
 
 class H5Browser(QObject, ActionManager):
@@ -150,6 +305,9 @@ class H5Browser(QObject, ActionManager):
         if specified load the corresponding file, otherwise open a select file dialog
     backend: str
         either 'tables, 'h5py' or 'h5pyd'
+    persist_search_index: bool
+        if True, the search index of the files is saved in a sidecar file next to them and loaded from
+        it when opening them again (if still up to date), see H5IndexBuilder
 
     See Also
     --------
@@ -159,7 +317,8 @@ class H5Browser(QObject, ActionManager):
     # whatever use from the caller
     status_signal = Signal(str)
 
-    def __init__(self, parent: QtWidgets.QMainWindow, h5file=None, h5file_path=None, backend='tables'):
+    def __init__(self, parent: QtWidgets.QMainWindow, h5file=None, h5file_path=None, backend='tables',
+                 persist_search_index=False):
         QObject.__init__(self)
         # toolbar = QtWidgets.QToolBar()
         ActionManager.__init__(self)  # , toolbar=toolbar)
@@ -183,6 +342,12 @@ class H5Browser(QObject, ActionManager):
         self.view.item_clicked_sig.connect(self.show_h5_attributes)
         self.view.item_double_clicked_sig.connect(self.show_h5_data)
         self.hyper_viewer = ViewerND(self.view.viewer_widget)
+        self.node_loader = H5NodeLoader(parent=self)
+        self.bulk_exporter = H5BulkExporter(lock=self.node_loader.lock, parent=self)
+        self.previewer = H5Previewer()
+        self.index_builder = H5IndexBuilder(lock=self.node_loader.lock, persist=persist_search_index,
+                                            parent=self)
+        self.search_index: H5SearchIndex = None
 
         self.setup_actions()
         self.setup_menu()
@@ -208,6 +373,23 @@ class H5Browser(QObject, ActionManager):
         self.connect_action('plot_node_with_bkg', lambda: self.get_node_and_plot(True))
         self.connect_action('plot_nodes_with_bkg', lambda: self.get_node_and_plot(True, True))
 
+        self.connect_action('abort_load', self.cancel_loading)
+        self.connect_action('abort_export', self.bulk_exporter.cancel)
+        self.bulk_exporter.progress.connect(self.view.show_export_progress)
+        self.bulk_exporter.export_failed.connect(
+            lambda node_path, error: self.status_signal.emit(f'Could not export {node_path}: {error}'))
+        self.bulk_exporter.finished.connect(
+            lambda done: self.status_signal.emit('Export done' if done else 'Export cancelled'))
+        self.connect_action('preview', self.activate_preview)
+        self.view.current_changed_sig.connect(self.show_preview)
+
+        self.node_loader.data_loaded.connect(self.show_loaded_data)
+        self.node_loader.loading_changed.connect(
+            lambda loading: self.view.show_loading(loading, self.current_node_path))
+
+        self.index_builder.index_ready.connect(self.set_search_index)
+        self.view.search_sig.connect(self.search)
+
         self.status_signal.connect(self.add_log)
 
     def get_node_and_plot(self, with_bkg, plot_all=False):
@@ -218,19 +400,25 @@ class H5Browser(QObject, ActionManager):
             if h5file_path is None:
                 h5file_path = select_file(save=False, ext=['h5', 'hdf5'])
             if Path(h5file_path).is_file():
-                if self.h5utils.isopen():
-                    self.h5utils.close_file()
+                self.cancel_loading()
+                with self.node_loader.lock:
+                    if self.h5utils.isopen():
+                        self.h5utils.close_file()
 
-                self.h5utils.open_file(h5file_path, 'r+')
+                    self.h5utils.open_file(h5file_path, 'r+')
             else:
                 return
         else:
+            self.cancel_loading()
             self.h5utils.h5file = h5file
 
-        self.data_loader = data_saving.DataLoader(self.h5utils)
+        self.data_loader = CachedDataLoader(self.h5utils)
+        self.node_loader.data_loader = self.data_loader
         self.check_version()
         self.populate_tree()
-        self.view.h5file_tree.expand_all()
+        self.view.expand_top_levels()
+        self.search_index = None
+        self.index_builder.build(self.h5utils)
 
     def setup_menu(self):
         menubar = self.main_window.menuBar()
@@ -261,10 +449,19 @@ class H5Browser(QObject, ActionManager):
                                                                                    ' the same parent with background'
                                                                                    ' substraction if possible',
                         toolbar=self.toolbar)
+        self.add_action('abort_load', 'Abort loading', 'stop', tip='Abort the loading of the current node',
+                        toolbar=self.toolbar)
+        self.add_action('preview', 'Show Preview', 'Vision', tip='Show a quick preview of the data of the'
+                                                                  ' selected node',
+                        checkable=True, toolbar=self.toolbar)
         self.view.add_actions([self.get_action('export'), self.get_action('comment'),
                                self.get_action('plot_node'), self.get_action('plot_nodes'),
                                self.get_action('plot_node_with_bkg'),
-                               self.get_action('plot_nodes_with_bkg')])
+                               self.get_action('plot_nodes_with_bkg'),
+                               self.get_action('preview')])
+        self.view.set_abort_action(self.get_action('abort_load'))
+        self.add_action('abort_export', 'Abort export', 'stop', tip='Abort the export of the selected nodes')
+        self.view.set_abort_export_action(self.get_action('abort_export'))
 
         self.add_action('load', 'Load File', 'Open', tip='Open a new file')
         self.add_action('save', 'Save File as', 'SaveAs', tip='Save as another file')
@@ -301,20 +498,26 @@ class H5Browser(QObject, ActionManager):
         """
         try:
             self.current_node_path = self.get_tree_node_path()
-            node = self.h5utils.get_node(self.current_node_path)
-            if 'comments' in node.attrs.attrs_name:
-                tmp = node.attrs['comments']
-            else:
-                tmp = ''
+            with self.node_loader.lock:
+                node = self.h5utils.get_node(self.current_node_path)
+                if 'comments' in node.attrs.attrs_name:
+                    tmp = node.attrs['comments']
+                else:
+                    tmp = ''
             if comment == '':
                 text, res = QtWidgets.QInputDialog.getMultiLineText(None, 'Enter comments', 'Enter comments here:', tmp)
                 if res and text != '':
                     comment = text
-                node.attrs['comments'] = comment
             else:
-                node.attrs['comments'] = tmp + comment
-
-            self.h5utils.flush()
+                comment = tmp + comment
+            with self.node_loader.lock:
+                node.attrs['comments'] = comment
+                self.h5utils.flush()
+                if self.search_index is not None:
+                    self.search_index.reindex_node(self.h5utils, self.current_node_path)
+                    if self.index_builder.persist:
+                        self.search_index.save(h5utils=self.h5utils, lock=self.node_loader.lock)
+            self.data_loader.invalidate()
 
         except Exception as e:
             logger.exception(str(e))
@@ -326,20 +529,52 @@ class H5Browser(QObject, ActionManager):
     def export_data(self):
         """Opens a dialog to export data
 
+        The bulk export formats export all the selected nodes and their children in the background,
+        into a directory named after the selected file for the formats writing a file per node.
+
         See Also
         --------
-        H5BrowserUtil.export_data
+        H5BrowserUtil.export_data, bulk_export
         """
         try:
-            file_filter = ExporterFactory.get_file_filters()
+            file_filter = ";;".join([get_export_filters(), ExporterFactory.get_file_filters()])
             file, selected_filter = select_file_filter(save=True, filter=file_filter)
             self.current_node_path = self.get_tree_node_path()
             if file != '':
-                self.h5utils.export_data(self.current_node_path, str(file), selected_filter)
+                fmt = get_format_from_filter(selected_filter)
+                if fmt is not None:
+                    output = Path(file).with_suffix('') if fmt in ('npy', 'csv') else Path(file)
+                    self.bulk_export(self.view.selected_node_paths(), output, fmt)
+                else:
+                    self.h5utils.export_data(self.current_node_path, str(file), selected_filter)
 
         except Exception as e:
             logger.exception(str(e))
 
+    def bulk_export(self, node_paths: List[str], output, fmt: str) -> int:
+        """Export nodes and their children in background threads
+
+        Parameters
+        ----------
+        node_paths: list of str
+            default to the current node if empty
+        output: str or Path
+            the output directory for the 'npy' and 'csv' formats, the output file otherwise
+        fmt: str
+            one of the formats of bulk_export.EXPORT_FORMATS
+
+        Returns
+        -------
+        int: the number of export tasks
+
+        See Also
+        --------
+        H5BulkExporter
+        """
+        if len(node_paths) == 0:
+            node_paths = [self.get_tree_node_path()]
+        return self.bulk_exporter.export(self.h5utils, node_paths, output, fmt)
+
     def save_file(self, filename=None):
 
         if filename is None:
@@ -351,6 +586,12 @@ class H5Browser(QObject, ActionManager):
         """
         """
         try:
+            self.cancel_loading()
+            self.bulk_exporter.cancel()
+            self.index_builder.cancel()
+            self.node_loader.wait()
+            self.bulk_exporter.wait()
+            self.index_builder.wait()
             self.h5utils.close_file()
             if self.main_window is None:
                 self.parent_widget.close()
@@ -384,7 +625,9 @@ class H5Browser(QObject, ActionManager):
         try:
             self.current_node_path = self.get_tree_node_path()
 
-            attr_dict, settings, scan_settings, pixmaps = self.h5utils.get_h5_attributes(self.current_node_path)
+            with self.node_loader.lock:
+                attr_dict, settings, scan_settings, pixmaps = self.h5utils.get_h5_attributes(
+                    self.current_node_path)
 
             for child in self.settings_attributes.settings.children():
                 child.remove()
@@ -415,65 +658,116 @@ class H5Browser(QObject, ActionManager):
             logger.exception(str(e))
 
     def show_pixmaps(self, pixmaps=[]):
-        if self.view.pixmap_widget.layout() is None:
-            self.view.pixmap_widget.setLayout(QtWidgets.QHBoxLayout())
-        while 1:
-            child = self.view.pixmap_widget.layout().takeAt(0)
-            if not child:
-                break
-            child.widget().deleteLater()
-            QtWidgets.QApplication.processEvents()
-        labs = []
-        for pix in pixmaps:
-            labs.append(pngbinary2Qlabel(pix))
-            self.view.pixmap_widget.layout().addWidget(labs[-1])
+        """Display the binary images stored as attributes of the current node
 
-    def show_h5_data(self, item, with_bkg=False, plot_all=False):
+        Decoded pixmaps are cached (per node path), so that they are decoded only once
         """
+        self.view.show_pixmaps([(self.current_node_path, ind) for ind in range(len(pixmaps))], pixmaps)
+
+    def show_h5_data(self, item, with_bkg=False, plot_all=False):
+        """Display the attributes of the current node and request the loading of its data
+
+        The data are read in a background thread and displayed in the hyper viewer once loaded (see
+        show_loaded_data). A new request supersedes the pending one.
 
         Parameters
         ----------
         item
         with_bkg
         plot_all
-
-        Returns
-        -------
-
         """
         try:
             if item is None:
                 self.current_node_path = self.get_tree_node_path()
             self.show_h5_attributes()
-            node = self.h5utils.get_node(self.current_node_path)
             self.data_node_signal.emit(self.current_node_path)
 
-            if 'data_type' in node.attrs and node.attrs['data_type'] == 'strings':
+            with self.node_loader.lock:
+                node = self.h5utils.get_node(self.current_node_path)
+                data_type = node.attrs['data_type'] if 'data_type' in node.attrs.attrs_name else None
+                texts = node.read() if data_type == 'strings' else []
+
+            if data_type == 'strings':
                 self.view.text_list.clear()
-                for txt in node.read():
+                for txt in texts:
                     self.view.text_list.addItem(txt)
-            elif 'data_type' in node.attrs:
-                data_with_axes = self.data_loader.load_data(node, with_bkg=with_bkg, load_all=plot_all)
-                self.hyper_viewer.show_data(data_with_axes, force_update=True)
+            elif data_type is not None:
+                self.node_loader.load(self.current_node_path, with_bkg=with_bkg, load_all=plot_all)
+
+        except Exception as e:
+            logger.exception(str(e))
+
+    def activate_preview(self, activate=True):
+        self.view.set_preview_visible(activate)
+        if activate:
+            self.show_preview()
 
+    def show_preview(self, index: QtCore.QModelIndex = None):
+        """Show a preview of the data of the node at index (default to the current node)
+
+        The preview is computed from a strided read of the first data node found in the node, see
+        H5Previewer
+        """
+        if not self.is_action_checked('preview'):
+            return
+        try:
+            if index is None or not index.isValid():
+                node_path = self.get_tree_node_path()
+            else:
+                node_path = index.sibling(index.row(), 2).data()
+            if node_path is None:
+                return
+            with self.node_loader.lock:
+                preview = self.previewer.get_preview(self.h5utils, node_path)
+            self.view.show_preview(preview, node_path)
         except Exception as e:
             logger.exception(str(e))
 
+    def set_search_index(self, index: H5SearchIndex):
+        self.search_index = index
+        self.search(self.view.search_text())
+
+    def search(self, query: str, limit: int = 1000) -> List[str]:
+        """Search the nodes of the file and display the result
+
+        Parameters
+        ----------
+        query: str
+            space separated terms, either text or attribute=value, see H5SearchIndex.search
+        limit: int
+            maximum number of returned node paths
+
+        Returns
+        -------
+        list of str: the paths of the matching nodes
+        """
+        if self.search_index is None:
+            self.view.show_search_results([], 'Indexing the file...' if query.strip() != '' else '')
+            return []
+        results = self.search_index.search(query, limit)
+        self.view.show_search_results(results, 'No match' if query.strip() != '' else '')
+        return results
+
+    def show_loaded_data(self, node_path: str, data_with_axes: data_saving.DataWithAxes):
+        self.hyper_viewer.show_data(data_with_axes, force_update=True)
+
+    def cancel_loading(self):
+        """Drop the pending loading of node data"""
+        self.node_loader.cancel()
+
     def populate_tree(self):
         """
-            | Init the ui-tree and store data into calling the h5_tree_to_Qtree convertor method
+            | Init the ui-tree with the root node of the file. Children nodes are read from the file
+            | only when their parent group is expanded
 
             See Also
             --------
-            h5tree_to_QTree, update_status
+            H5TreeModel
         """
         try:
             if self.h5utils.h5file is not None:
                 self.view.clear()
-                base_node = self.h5utils.root()
-                base_tree_item, pixmap_items = h5tree_to_QTree(base_node)
-                self.view.add_base_item(base_tree_item)
-                self.view.add_widget_to_tree(pixmap_items)
+                self.view.set_backend(self.h5utils, self.node_loader.lock)
 
         except Exception as e:
             logger.exception(str(e))
@@ -512,7 +806,7 @@ def browse_data(fname=None, ret_all=False, message=None) -> Tuple[data_saving.Da
 
         form = QtWidgets.QMainWindow()
         browser = H5Browser(form, h5file_path=fname)
-        dataloader = data_saving.DataLoader(browser.h5utils)
+        dataloader = CachedDataLoader(browser.h5utils)
         dialog = QtWidgets.QDialog()
         vlayout = QtWidgets.QVBoxLayout()
 
@@ -540,6 +834,8 @@ def browse_data(fname=None, ret_all=False, message=None) -> Tuple[data_saving.Da
             data = None
             node_path = None
 
+        browser.cancel_loading()
+        browser.node_loader.wait()
         browser.h5utils.close_file()
 
         if ret_all:
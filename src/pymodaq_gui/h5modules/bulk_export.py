@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Export of many h5 nodes (and their children) to NumPy, CSV or HDF5 files in background threads
+"""
+import threading
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+from qtpy.QtCore import QObject, Signal, Slot, QThreadPool
+
+from pymodaq_utils.logger import set_logger, get_module_name
+
+from pymodaq_data.h5modules.backends import H5Backend, CARRAY, VLARRAY
+
+from pymodaq_gui.h5modules.node_loader import FunctionRunnable
+
+
+logger = set_logger(get_module_name(__file__))
+
+DEFAULT_CHUNK_BYTES = 16 * 1024 ** 2
+
+EXPORT_FORMATS = {
+    'npy': 'NumPy arrays, a file per node',
+    'npz': 'NumPy archive of all nodes',
+    'csv': 'CSV files of 1D nodes',
+    'h5': 'HDF5 copy of the nodes',
+}
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def get_export_filters() -> str:
+    """File filters of the bulk export formats, as used by file dialogs"""
+    return ";;".join([f"{desc} (*.{fmt})" for fmt, desc in EXPORT_FORMATS.items()])
+
+
+def get_format_from_filter(file_filter: str) -> Union[str, None]:
+    """Bulk export format corresponding to a file filter, None if it is not a bulk export filter"""
+    for fmt, desc in EXPORT_FORMATS.items():
+        if file_filter.startswith(desc):
+            return fmt
+    return None
+
+
+def get_array_nodes(h5utils: H5Backend, node_paths: Iterable[str]) -> List[str]:
+    """Paths of all the numerical arrays hanging from (or being) the given nodes, without duplicates"""
+    array_paths = []
+    for node_path in node_paths:
+        for node in h5utils.walk_nodes(node_path):
+            if isinstance(node, CARRAY) and not isinstance(node, VLARRAY) and node.path not in array_paths:
+                array_paths.append(node.path)
+    return array_paths
+
+
+def iter_chunks(node: CARRAY, lock: threading.RLock, chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                cancel_event: threading.Event = None) -> Iterator[np.ndarray]:
+    """Read an array by blocks of rows of at most chunk_bytes (at least one row), holding lock while reading
+
+    Raises
+    ------
+    ExportCancelled if cancel_event is set
+    """
+    with lock:
+        shape = tuple(node.node.shape)
+        itemsize = np.dtype(node.node.dtype).itemsize
+    if len(shape) == 0:
+        with lock:
+            yield np.asarray(node.node[()])
+        return
+    row_bytes = itemsize * int(np.prod(shape[1:], dtype=np.int64))
+    rows = max(1, chunk_bytes // max(1, row_bytes))
+    for start in range(0, shape[0], rows):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+        with lock:
+            block = np.asarray(node.node[start:start + rows])
+        yield block
+
+
+def write_npy(fp: BinaryIO, node: CARRAY, lock: threading.RLock, chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+              cancel_event: threading.Event = None):
+    """Stream an array node into a file object using the .npy format"""
+    with lock:
+        shape = tuple(node.node.shape)
+        dtype = np.dtype(node.node.dtype)
+    np.lib.format.write_array_header_1_0(fp, dict(descr=np.lib.format.dtype_to_descr(dtype),
+                                                  fortran_order=False, shape=shape))
+    for block in iter_chunks(node, lock, chunk_bytes, cancel_event):
+        fp.write(np.ascontiguousarray(block, dtype=dtype).tobytes())
+
+
+def is_1d(shape: Tuple[int]) -> bool:
+    """True for 1D arrays, possibly stored as a single column"""
+    return len(shape) > 0 and len([size for size in shape[1:] if size != 1]) == 0
+
+
+def write_csv(fp, node: CARRAY, lock: threading.RLock, chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+              cancel_event: threading.Event = None):
+    """Stream a 1D array node (possibly stored as a single column) into a text file object"""
+    with lock:
+        shape = tuple(node.node.shape)
+    if not is_1d(shape):
+        raise ValueError(f'Only 1D arrays can be exported as CSV, {node.path} has a shape {shape}')
+    fp.write(f'# {node.path}\n')
+    for block in iter_chunks(node, lock, chunk_bytes, cancel_event):
+        np.savetxt(fp, block.reshape((-1, 1)), delimiter=',')
+
+
+def get_relative_path(node_path: str) -> Path:
+    return Path(*node_path.strip('/').split('/'))
+
+
+def copy_subtrees(h5utils: H5Backend, node_paths: Iterable[str], file_path: Path, lock: threading.RLock):
+    """Copy nodes (and their children) into another h5 file using the native copy of the backend
+
+    The nodes are copied at the same path in the destination file, which is created if needed. The
+    missing parent groups are created with the attributes of the source ones, as are the
+    attributes of the root group, so that the destination file can be browsed as the source one.
+
+    Returns
+    -------
+    Path: the destination file path
+    """
+    node_paths = list(node_paths)
+    with lock:
+        if '/' in node_paths:
+            node_paths = [f'/{name}' for name in h5utils.root().children_name()]
+        if h5utils.backend == 'tables':
+            dest = h5utils.h5_library.open_file(str(file_path), mode='a')
+            source = h5utils.h5file
+            try:
+                source.root._v_attrs._f_copy(dest.root)
+                for node_path in node_paths:
+                    parent_path = ''
+                    for name in node_path.strip('/').split('/')[:-1]:
+                        parent_path += f'/{name}'
+                        if parent_path not in dest:
+                            group = dest.create_group(parent_path.rpartition('/')[0] or '/', name)
+                            source.get_node(parent_path)._v_attrs._f_copy(group)
+                    h5utils.get_node(node_path).node._f_copy(newparent=dest.get_node(parent_path or '/'),
+                                                              recursive=True)
+            finally:
+                dest.close()
+        else:
+            dest = h5utils.h5_library.File(str(file_path), mode='a')
+            source = h5utils.h5file
+            try:
+                dest.attrs.update(source.attrs)
+                for node_path in node_paths:
+                    parent_path = ''
+                    for name in node_path.strip('/').split('/')[:-1]:
+                        parent_path += f'/{name}'
+                        if parent_path not in dest:
+                            dest.create_group(parent_path).attrs.update(source[parent_path].attrs)
+                    h5utils.h5file.copy(node_path, dest[parent_path] if parent_path != '' else dest)
+            finally:
+                dest.close()
+    return file_path
+
+
+class H5BulkExporter(QObject):
+    """Export many nodes of a h5 file in a pool of background threads
+
+    Arrays are read chunk by chunk (holding lock, the h5 backends not being thread safe) and
+    streamed to the destination files so that nodes larger than the memory can be exported. Formats:
+
+    * 'npy': a .npy file per array in the output directory, mirroring the tree of the nodes
+    * 'npz': a single (uncompressed) .npz archive whose keys are the paths of the arrays
+    * 'csv': a .csv file per 1D array in the output directory, other arrays are skipped
+    * 'h5': a h5 file containing a copy of the selected nodes (and children)
+
+    Parameters
+    ----------
+    lock: threading.RLock
+        lock protecting the access to the h5 file, created if not given
+    max_workers: int
+        number of threads writing the exported files
+    chunk_bytes: int
+        maximum size of the blocks read from the file
+    """
+    progress = Signal(int, int)  # number of done tasks, number of tasks
+    node_exported = Signal(str, str)  # the node path and the exported file path
+    export_failed = Signal(str, str)  # the node path and the error message
+    finished = Signal(bool)  # True if all tasks have been run, False if cancelled
+
+    _task_done = Signal(str, str, str)  # node path, file path, error message
+
+    def __init__(self, lock: threading.RLock = None, max_workers=4, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                 parent: QObject = None):
+        super().__init__(parent)
+        self.lock = lock if lock is not None else threading.RLock()
+        self.chunk_bytes = chunk_bytes
+        self._cancel_event = threading.Event()
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(max_workers)
+        self._n_tasks = 0
+        self._n_done = 0
+        self._running = False
+        self._task_done.connect(self._on_task_done)
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def cancel(self):
+        """Stop the export as soon as possible, the files being written are left incomplete"""
+        if self._running:
+            self._cancel_event.set()
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self._thread_pool.waitForDone(msecs)
+
+    def export(self, h5utils: H5Backend, node_paths: Iterable[str], output: Union[str, Path], fmt: str) -> int:
+        """Start the export of nodes and all their children
+
+        Parameters
+        ----------
+        h5utils: H5Backend
+            the object giving access to the opened file
+        node_paths: iterable of str
+        output: str or Path
+            the output directory for 'npy' and 'csv' formats, the output file otherwise
+        fmt: str
+            one of EXPORT_FORMATS keys
+
+        Returns
+        -------
+        int: the number of export tasks
+        """
+        if self._running:
+            raise RuntimeError('An export is already running')
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f'{fmt} is not a valid export format, should be one of {list(EXPORT_FORMATS)}')
+        output = Path(output)
+        node_paths = list(node_paths)
+        if fmt == 'h5':
+            tasks = [(', '.join(node_paths), copy_subtrees, (h5utils, node_paths, output, self.lock))]
+        else:
+            with self.lock:
+                array_paths = get_array_nodes(h5utils, node_paths)
+                if fmt == 'csv':
+                    array_paths = [path for path in array_paths if is_1d(h5utils.get_node(path).node.shape)]
+            if fmt == 'npz':
+                tasks = [(', '.join(array_paths), self._export_npz, (h5utils, array_paths, output))]
+            else:
+                tasks = [(path, self._export_file, (h5utils, path, output, fmt)) for path in array_paths]
+
+        self._cancel_event.clear()
+        self._n_tasks = len(tasks)
+        self._n_done = 0
+        self._running = len(tasks) > 0
+        self.progress.emit(0, self._n_tasks)
+        if not self._running:
+            self.finished.emit(True)
+        for node_path, function, args in tasks:
+            self._thread_pool.start(FunctionRunnable(self._run_task, node_path, function, args))
+        return len(tasks)
+
+    def _run_task(self, node_path: str, function: Callable, args: Tuple):
+        if self._cancel_event.is_set():
+            self._task_done.emit(node_path, '', 'cancelled')
+            return
+        try:
+            file_path = function(*args)
+            self._task_done.emit(node_path, str(file_path), '')
+        except ExportCancelled:
+            self._task_done.emit(node_path, '', 'cancelled')
+        except Exception as e:
+            logger.exception(f'Could not export {node_path}: {e}')
+            self._task_done.emit(node_path, '', str(e))
+
+    def _export_file(self, h5utils: H5Backend, node_path: str, output: Path, fmt: str) -> Path:
+        file_path = output.joinpath(get_relative_path(node_path)).with_suffix(f'.{fmt}')
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            node = h5utils.get_node(node_path)
+        if fmt == 'npy':
+            with open(file_path, 'wb') as fp:
+                write_npy(fp, node, self.lock, self.chunk_bytes, self._cancel_event)
+        else:
+            with open(file_path, 'w') as fp:
+                write_csv(fp, node, self.lock, self.chunk_bytes, self._cancel_event)
+        return file_path
+
+    def _export_npz(self, h5utils: H5Backend, array_paths: List[str], file_path: Path) -> Path:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(file_path, mode='w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for node_path in array_paths:
+                with self.lock:
+                    node = h5utils.get_node(node_path)
+                with archive.open(f"{node_path.strip('/')}.npy", mode='w', force_zip64=True) as fp:
+                    write_npy(fp, node, self.lock, self.chunk_bytes, self._cancel_event)
+        return file_path
+
+    @Slot(str, str, str)
+    def _on_task_done(self, node_path: str, file_path: str, error: str):
+        self._n_done += 1
+        if error == '':
+            self.node_exported.emit(node_path, file_path)
+        elif error != 'cancelled':
+            self.export_failed.emit(node_path, error)
+        self.progress.emit(self._n_done, self._n_tasks)
+        if self._n_done == self._n_tasks:
+            self._running = False
+            self.finished.emit(not self._cancel_event.is_set())
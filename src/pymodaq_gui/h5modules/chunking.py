@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Chunk layout of the enlargeable arrays and calibration of the compression filters used to save data
+"""
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from pymodaq_utils.logger import set_logger, get_module_name
+
+from pymodaq_data.h5modules.backends import H5Backend, EARRAY, GROUP
+
+
+logger = set_logger(get_module_name(__file__))
+
+DEFAULT_CHUNK_BYTES = 1024 ** 2
+MAX_UNKNOWN_ROWS = 128  # rows per chunk when the number of appended elements is unknown
+DEFAULT_LEVELS = (0, 1, 3, 6, 9)
+
+
+def get_chunk_shape(data_shape: Optional[Sequence[int]], dtype: Union[np.dtype, type],
+                    expected_rows: int = 0, target_bytes: int = DEFAULT_CHUNK_BYTES) -> Tuple[int]:
+    """Chunk shape of an array enlargeable along its first axis, elements having data_shape
+
+    Elements smaller than target_bytes are grouped along the enlargeable axis (but no more than the
+    expected number of rows if known, or than MAX_UNKNOWN_ROWS otherwise so that small arrays do not
+    get oversized chunks), larger ones are split by halving their leading dimensions
+    first so that the chunks keep contiguous the trailing (fastest varying) ones.
+
+    Parameters
+    ----------
+    data_shape: sequence of int or None
+        the shape of a single element (without the enlargeable dimension)
+    dtype: numpy dtype
+    expected_rows: int
+        the expected number of appended elements, 0 if unknown
+    target_bytes: int
+        the targeted size of a chunk
+
+    Returns
+    -------
+    tuple of int: the chunk shape, its length is len(data_shape) + 1
+    """
+    element_shape = [int(size) for size in data_shape] if data_shape is not None else []
+    element_shape = [max(1, size) for size in element_shape]
+    itemsize = np.dtype(dtype).itemsize
+    element_bytes = itemsize * int(np.prod(element_shape, dtype=np.int64))
+    if element_bytes <= target_bytes:
+        rows = max(1, target_bytes // element_bytes)
+        rows = min(rows, expected_rows if expected_rows > 0 else MAX_UNKNOWN_ROWS)
+        return tuple([int(rows)] + element_shape)
+
+    chunk = list(element_shape)
+    for ind in range(len(chunk)):
+        while chunk[ind] > 1 and itemsize * int(np.prod(chunk, dtype=np.int64)) > target_bytes:
+            chunk[ind] = int(np.ceil(chunk[ind] / 2))
+    return tuple([1] + chunk)
+
+
+def get_filters(backend: H5Backend, library: str, level: int):
+    """Filters (pytables) or create_dataset keyword arguments (h5py) for a compression
+
+    Same conventions as H5Backend.define_compression: zlib and gzip are the same deflate filter
+    """
+    if backend.backend == 'tables':
+        if library == 'gzip':
+            library = 'zlib'
+        return backend.h5_library.Filters(complevel=level, complib=library)
+    else:
+        if library == 'zlib':
+            library = 'gzip'
+        if library == 'lzf':
+            return dict(compression='lzf')
+        return dict(compression=library, compression_opts=level) if level > 0 else dict()
+
+
+def create_earray(backend: H5Backend, where: Union[GROUP, str], name: str, dtype,
+                  data_shape: Sequence[int] = None, title='', chunk_shape: Sequence[int] = None,
+                  expected_rows: int = 0, filters=None) -> EARRAY:
+    """Same as H5Backend.create_earray but with a given chunk shape and filters
+
+    filters default to the compression defined on the backend (see H5Backend.define_compression)
+    """
+    if filters is None:
+        filters = backend.compression
+    dtype = np.dtype(dtype)
+    shape = tuple([0] + (list(data_shape) if data_shape is not None else []))
+    chunk_shape = tuple(chunk_shape) if chunk_shape is not None else None
+    if backend.backend == 'tables':
+        if isinstance(where, GROUP):
+            where = where.node
+        kwargs = dict(filters=filters, chunkshape=chunk_shape)
+        if expected_rows > 0:
+            kwargs['expectedrows'] = expected_rows
+        array = EARRAY(backend.h5file.create_earray(where, name, backend.h5_library.Atom.from_dtype(dtype),
+                                                    shape=shape, title=title, **kwargs), backend.backend)
+    else:
+        maxshape = tuple([None] + list(shape[1:]))
+        kwargs = dict(filters) if filters is not None else dict()
+        array = EARRAY(backend.get_node(where).node.create_dataset(
+            name, shape=shape, dtype=dtype, maxshape=maxshape, chunks=chunk_shape if chunk_shape is not None
+            else True, **kwargs), backend.backend)
+        array.array.attrs['TITLE'] = title
+        array.array.attrs['CLASS'] = 'EARRAY'  # to be compatible with pytables automatic class writing
+        array.array.attrs['EXTDIM'] = 0
+    array.attrs['shape'] = shape
+    array.attrs['dtype'] = dtype.name
+    array.attrs['subdtype'] = ''
+    array.attrs['backend'] = backend.backend
+    return array
+
+
+@dataclass
+class CompressionResult:
+    """Result of the writing of sample frames with a given compression
+
+    speed is the write speed in MB/s of raw data, ratio the raw size over the size on disk
+    """
+    library: str
+    level: int
+    speed: float
+    ratio: float
+
+    def __str__(self):
+        return f'{self.library}({self.level}): {self.speed:.1f} MB/s, ratio {self.ratio:.2f}'
+
+
+def get_storage_size(array: EARRAY) -> int:
+    if array.backend == 'tables':
+        return array.array.size_on_disk
+    else:
+        return array.array.id.get_storage_size()
+
+
+def calibrate_compression(frame: np.ndarray, backend='tables', libraries: Iterable[str] = None,
+                          levels: Iterable[int] = DEFAULT_LEVELS, n_frames=32,
+                          target_bytes: int = DEFAULT_CHUNK_BYTES) -> List[CompressionResult]:
+    """Benchmark compression filters and levels by appending a sample frame into an in memory file
+
+    Parameters
+    ----------
+    frame: ndarray
+        a representative detector frame
+    backend: str
+        'tables' or 'h5py'
+    libraries: iterable of str
+        the compression libraries to test, default to the deflate one (zlib for pytables, gzip for
+        h5py) that can be read by both backends
+    levels: iterable of int
+        the compression levels to test, level 0 meaning no compression
+    n_frames: int
+        number of times the frame is appended
+    target_bytes: int
+        the targeted chunk size, see get_chunk_shape
+
+    Returns
+    -------
+    list of CompressionResult
+    """
+    frame = np.ascontiguousarray(frame)
+    if libraries is None:
+        libraries = ['zlib' if backend == 'tables' else 'gzip']
+    chunk_shape = get_chunk_shape(frame.shape, frame.dtype, n_frames, target_bytes)
+    raw_bytes = frame.nbytes * n_frames
+
+    h5backend = H5Backend(backend)
+    file_name = f'calibration_{uuid.uuid4().hex}.h5'
+    if backend == 'tables':
+        h5backend.open_file(file_name, 'w', driver='H5FD_CORE', driver_core_backing_store=0)
+    else:
+        h5backend.open_file(file_name, 'w', driver='core', backing_store=False)
+
+    results = []
+    try:
+        for library in libraries:
+            for level in levels:
+                if library == 'lzf' and level != levels[0]:
+                    continue  # lzf has no level
+                array = create_earray(h5backend, '/', f'{library.replace(":", "_")}_{level}', frame.dtype,
+                                      frame.shape, chunk_shape=chunk_shape, expected_rows=n_frames,
+                                      filters=get_filters(h5backend, library, level))
+                start = time.perf_counter()
+                for _ in range(n_frames):
+                    array.append(frame)
+                h5backend.flush()
+                elapsed = time.perf_counter() - start
+                storage = get_storage_size(array)
+                results.append(CompressionResult(library, level, raw_bytes / 1024 ** 2 / max(elapsed, 1e-9),
+                                                 raw_bytes / storage if storage > 0 else 1.))
+    finally:
+        h5backend.close_file()
+    return results
+
+
+def select_compression(results: List[CompressionResult], size_budget: float = 1.) \
+        -> Optional[CompressionResult]:
+    """Select the fastest compression whose size on disk is at most size_budget times the raw size
+
+    If none meets the budget, the one with the best compression ratio is returned
+    """
+    if len(results) == 0:
+        return None
+    valid = [result for result in results if 1 / result.ratio <= size_budget]
+    if len(valid) > 0:
+        return max(valid, key=lambda result: result.speed)
+    return max(results, key=lambda result: result.ratio)
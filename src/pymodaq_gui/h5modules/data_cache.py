@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Memory cache of the DataWithAxes loaded from h5 files
+"""
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Hashable, Optional, Tuple, Union
+
+from pymodaq_utils.logger import set_logger, get_module_name
+
+from pymodaq_data.data import DataWithAxes
+from pymodaq_data.h5modules.backends import Node
+from pymodaq_data.h5modules.data_saving import DataLoader
+
+
+logger = set_logger(get_module_name(__file__))
+
+DEFAULT_CACHE_SIZE = 256 * 1024 ** 2  # in bytes
+
+
+def get_nbytes(dwa: DataWithAxes) -> int:
+    """Memory used by the arrays of data and axes of a DataWithAxes"""
+    nbytes = sum([array.nbytes for array in dwa])
+    for axis in dwa.axes:
+        if axis.data is not None:
+            nbytes += axis.data.nbytes
+    return nbytes
+
+
+class DataCache:
+    """Least Recently Used cache of DataWithAxes bounded by the memory used by their arrays
+
+    Items are evicted, least recently used first, when the total size exceeds max_bytes. A single
+    item larger than max_bytes is not cached. Access is thread safe.
+
+    Parameters
+    ----------
+    max_bytes: int
+        maximum memory used by the cached data
+    copy: bool
+        if True, get returns a copy of the cached data so that callers can modify it freely
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_SIZE, copy=True):
+        self._max_bytes = max_bytes
+        self.copy = copy
+        self._items: OrderedDict = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key: Hashable):
+        return key in self._items
+
+    @property
+    def nbytes(self) -> int:
+        """Current memory used by the cached data"""
+        return self._nbytes
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int):
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self):
+        while self._nbytes > self._max_bytes and len(self._items) > 0:
+            _, (_, nbytes) = self._items.popitem(last=False)
+            self._nbytes -= nbytes
+
+    def get(self, key: Hashable) -> Optional[DataWithAxes]:
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            dwa = self._items[key][0]
+        return dwa.deepcopy() if self.copy else dwa
+
+    def put(self, key: Hashable, dwa: DataWithAxes):
+        nbytes = get_nbytes(dwa)
+        if nbytes > self._max_bytes:
+            return
+        if self.copy:
+            dwa = dwa.deepcopy()
+        with self._lock:
+            if key in self._items:
+                self._nbytes -= self._items.pop(key)[1]
+            self._items[key] = (dwa, nbytes)
+            self._nbytes += nbytes
+            self._evict()
+
+    def invalidate(self, file_path: Union[str, Path] = None):
+        """Remove the data loaded from a given file, or all data if file_path is None
+
+        The keys are expected to start with the file path, see CachedDataLoader
+        """
+        with self._lock:
+            if file_path is None:
+                self._items.clear()
+                self._nbytes = 0
+                return
+            file_path = str(file_path)
+            for key in [key for key in self._items if key[0] == file_path]:
+                self._nbytes -= self._items.pop(key)[1]
+
+
+data_cache = DataCache()
+
+
+class CachedDataLoader(DataLoader):
+    """DataLoader looking first into a DataCache before reading data from the file
+
+    The cache keys are (file path, node path, with_bkg, load_all, file modification time) so that
+    data are read again if the file has been modified on disk since they were cached.
+
+    Parameters
+    ----------
+    h5saver: H5SaverLowLevel or Path
+    cache: DataCache
+        the cache to use, default to the data_cache instance shared by the whole application
+    """
+
+    def __init__(self, h5saver, cache: DataCache = None):
+        super().__init__(h5saver)
+        self.cache = cache if cache is not None else data_cache
+
+    def get_key(self, where: Union[Node, str], with_bkg=False, load_all=False) -> Optional[Tuple]:
+        try:
+            file_path = str(self.h5saver.filename)
+            node_path = where.path if isinstance(where, Node) else str(where)
+            return file_path, node_path, with_bkg, load_all, os.stat(file_path).st_mtime_ns
+        except (OSError, AttributeError) as e:  # remote file or no file opened, do not cache
+            logger.debug(f'Data from {where} will not be cached: {e}')
+            return None
+
+    def is_cached(self, where: Union[Node, str], with_bkg=False, load_all=False) -> bool:
+        key = self.get_key(where, with_bkg, load_all)
+        return key is not None and key in self.cache
+
+    def load_data(self, where: Union[Node, str], with_bkg=False, load_all=False) -> DataWithAxes:
+        key = self.get_key(where, with_bkg, load_all)
+        if key is not None:
+            dwa = self.cache.get(key)
+            if dwa is not None:
+                return dwa
+        dwa = super().load_data(where, with_bkg=with_bkg, load_all=load_all)
+        if key is not None:
+            self.cache.put(key, dwa)
+        return dwa
+
+    def invalidate(self):
+        """Remove from the cache all data loaded from the current file"""
+        try:
+            self.cache.invalidate(self.h5saver.filename)
+        except AttributeError:
+            pass
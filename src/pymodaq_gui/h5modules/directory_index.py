@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Cached listing of the year/day/dataset folders used to build the paths of the saved h5 files
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Union
+
+# directories modified less than this delay (in s) before being scanned are scanned again, the
+# mtime resolution of some file systems (network shares, FAT) being too coarse to detect changes
+# happening within the same time step
+RACY_DELAY = 2.
+
+
+@dataclass
+class DirectoryEntry:
+    mtime_ns: int
+    racy: bool  # if True, the directory was modified too close to its scan to trust its mtime
+    entries: Dict[str, bool] = field(default_factory=dict)  # name: is_dir
+
+
+class DirectoryIndex:
+    """Cache of directory contents validated by the modification time of the directories
+
+    A directory is scanned (a single os.scandir) the first time it is listed, then only a stat of
+    the directory is done to check that its cached content is still valid. Files and directories
+    created by the application should be registered with add so that the cache stays valid without
+    rescanning. Access is thread safe.
+    """
+
+    def __init__(self, racy_delay: float = RACY_DELAY):
+        self.racy_delay = racy_delay
+        self._dirs: Dict[str, DirectoryEntry] = dict()
+        self._lock = threading.Lock()
+        self.n_scans = 0
+
+    def clear(self):
+        with self._lock:
+            self._dirs.clear()
+
+    def _scan(self, path: str, mtime_ns: int) -> DirectoryEntry:
+        entries = dict()
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                try:
+                    entries[entry.name] = entry.is_dir()
+                except OSError:
+                    entries[entry.name] = False
+        self.n_scans += 1
+        directory = DirectoryEntry(mtime_ns, time.time() - mtime_ns / 1e9 < self.racy_delay, entries)
+        self._dirs[path] = directory
+        return directory
+
+    def _get(self, path: Union[str, Path]) -> Dict[str, bool]:
+        path = str(path)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock:
+                self._dirs.pop(path, None)
+            return dict()
+        with self._lock:
+            directory = self._dirs.get(path, None)
+            if directory is None or directory.racy or directory.mtime_ns != mtime_ns:
+                directory = self._scan(path, mtime_ns)
+            return dict(directory.entries)
+
+    def list(self, path: Union[str, Path]) -> List[str]:
+        """Names of the entries of a directory (empty if it doesn't exist)"""
+        return list(self._get(path).keys())
+
+    def subdirs(self, path: Union[str, Path]) -> List[str]:
+        """Names of the sub directories of a directory"""
+        return [name for name, is_dir in self._get(path).items() if is_dir]
+
+    def files(self, path: Union[str, Path]) -> List[str]:
+        """Names of the files (and other non directory entries) of a directory"""
+        return [name for name, is_dir in self._get(path).items() if not is_dir]
+
+    def add(self, path: Union[str, Path]):
+        """Register a file or directory just created so that its parent cached content stays valid"""
+        path = Path(path)
+        parent = str(path.parent)
+        with self._lock:
+            directory = self._dirs.get(parent, None)
+            if directory is None:
+                return
+            try:
+                mtime_ns = os.stat(parent).st_mtime_ns
+            except FileNotFoundError:
+                self._dirs.pop(parent, None)
+                return
+            directory.entries[path.name] = path.is_dir()
+            directory.mtime_ns = mtime_ns
+
+
+directory_index = DirectoryIndex()
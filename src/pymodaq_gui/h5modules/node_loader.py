@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Background loading of the data hold by h5 nodes
+"""
+import copy
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional
+
+import numpy as np
+from qtpy.QtCore import QObject, Signal, Slot, QRunnable, QThreadPool
+
+from pymodaq_utils.logger import set_logger, get_module_name
+
+from pymodaq_data.h5modules.backends import H5Backend, CARRAY, VLARRAY, Node
+from pymodaq_data.h5modules.data_saving import DataLoader
+
+
+logger = set_logger(get_module_name(__file__))
+
+DEFAULT_READ_CHUNK_BYTES = 4 * 1024 ** 2
+
+
+class FunctionRunnable(QRunnable):
+    """QRunnable calling a function with the given arguments in a thread of a QThreadPool"""
+
+    def __init__(self, function: Callable, *args, **kwargs):
+        super().__init__()
+        self._function = function
+        self._args = args
+        self._kwargs = kwargs
+
+    def run(self):
+        self._function(*self._args, **self._kwargs)
+
+
+def read_in_chunks(node: CARRAY, lock: threading.RLock, chunk_bytes: int = DEFAULT_READ_CHUNK_BYTES,
+                   should_stop: Callable[[], bool] = None) -> Optional[np.ndarray]:
+    """Read an array by blocks of rows of at most chunk_bytes, holding lock only while reading a block
+
+    Other threads can access the file between two blocks. Returns None if should_stop returns True
+    before the array is completely read.
+    """
+    with lock:
+        shape = tuple(node.node.shape)
+        dtype = np.dtype(node.node.dtype)
+        if len(shape) == 0:
+            return np.asarray(node.node[()])
+    array = np.empty(shape, dtype=dtype)
+    row_bytes = dtype.itemsize * int(np.prod(shape[1:], dtype=np.int64))
+    rows = max(1, chunk_bytes // max(1, row_bytes))
+    for start in range(0, shape[0], rows):
+        if should_stop is not None and should_stop():
+            return None
+        with lock:
+            array[start:start + rows] = node.node[start:start + rows]
+        time.sleep(0)  # let the threads waiting for the lock take it
+    return array
+
+
+class PrefetchedBackend:
+    """Proxy of a H5Backend whose array nodes already read (keyed by their path) are read from memory"""
+
+    def __init__(self, h5utils: H5Backend, arrays: Dict[str, np.ndarray]):
+        self._h5utils = h5utils
+        self._arrays = arrays
+
+    def __getattr__(self, name):
+        return getattr(self._h5utils, name)
+
+    def _wrap(self, node: Node) -> Node:
+        if isinstance(node, CARRAY) and node.path in self._arrays:
+            array = self._arrays[node.path]
+            node.read = lambda: array
+        return node
+
+    def get_node(self, where, name=None) -> Node:
+        return self._wrap(self._h5utils.get_node(where, name))
+
+    def walk_nodes(self, where) -> Iterator[Node]:
+        for node in self._h5utils.walk_nodes(where):
+            yield self._wrap(node)
+
+
+class H5NodeLoader(QObject):
+    """Load the data of h5 nodes using a DataLoader in a background thread
+
+    Only the most recent request is meaningful: pending requests that are superseded by a newer one
+    are skipped and the results of a superseded (or cancelled) request are dropped.
+
+    The h5 backends are not all thread safe, so every read is done while holding lock. Any other
+    access to the file from other threads should hold the same lock. The arrays of the group of the
+    loaded node are first read by blocks of chunk_bytes, the lock being released between blocks so
+    that other threads (displaying attributes or children of nodes) are not blocked for the whole
+    read, and a cancelled request stops at the next block. The data are then built from these
+    arrays using the DataLoader.
+
+    Parameters
+    ----------
+    data_loader: DataLoader
+    lock: threading.RLock
+        lock protecting the access to the h5 file, created if not given
+    chunk_bytes: int
+        maximum size of the blocks read while holding the lock
+    """
+    data_loaded = Signal(str, object)  # the node path and the loaded DataWithAxes
+    load_failed = Signal(str, str)  # the node path and the error message
+    loading_changed = Signal(bool)  # True when a request is started, False when done or cancelled
+
+    _loaded = Signal(int, str, object)
+    _failed = Signal(int, str, str)
+
+    def __init__(self, data_loader: DataLoader = None, lock: threading.RLock = None,
+                 chunk_bytes: int = DEFAULT_READ_CHUNK_BYTES, parent: QObject = None):
+        super().__init__(parent)
+        self.data_loader = data_loader
+        self.lock = lock if lock is not None else threading.RLock()
+        self.chunk_bytes = chunk_bytes
+
+        self._request_id = 0
+        self._is_loading = False
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(1)
+
+        self._loaded.connect(self._emit_loaded)
+        self._failed.connect(self._emit_failed)
+
+    @property
+    def is_loading(self) -> bool:
+        return self._is_loading
+
+    def _set_loading(self, loading: bool):
+        if loading != self._is_loading:
+            self._is_loading = loading
+            self.loading_changed.emit(loading)
+
+    def load(self, node_path: str, with_bkg=False, load_all=False) -> int:
+        """Request the loading of a node in the background, superseding any previous request
+
+        Returns
+        -------
+        int: the id of the request
+        """
+        self._request_id += 1
+        self._set_loading(True)
+        self._thread_pool.start(FunctionRunnable(self._load, self._request_id, node_path, with_bkg, load_all))
+        return self._request_id
+
+    def cancel(self):
+        """Drop the current and pending requests"""
+        self._request_id += 1
+        self._set_loading(False)
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Wait for the running request (if any) to finish, returns False on timeout"""
+        return self._thread_pool.waitForDone(msecs)
+
+    def is_current(self, request_id: int) -> bool:
+        return request_id == self._request_id
+
+    def _load(self, request_id: int, node_path: str, with_bkg: bool, load_all: bool):
+        """Executed in a thread of the pool"""
+        if not self.is_current(request_id):
+            return
+        try:
+            data_loader = self.data_loader
+            with self.lock:
+                is_cached = hasattr(data_loader, 'is_cached') and \
+                    data_loader.is_cached(node_path, with_bkg=with_bkg, load_all=load_all)
+                array_nodes = []
+                h5utils = data_loader.h5saver
+                node = h5utils.get_node(node_path)
+                if not is_cached and isinstance(node, CARRAY):  # the data, background, errors and axes arrays
+                    array_nodes = [node for node in h5utils.walk_nodes(node.parent_node.path)
+                                   if isinstance(node, CARRAY) and not isinstance(node, VLARRAY)]
+            if len(array_nodes) > 0:
+                arrays = dict()
+                for node in array_nodes:
+                    array = read_in_chunks(node, self.lock, self.chunk_bytes,
+                                           lambda: not self.is_current(request_id))
+                    if array is None:  # superseded or cancelled
+                        return
+                    arrays[node.path] = array
+                data_loader = copy.copy(data_loader)
+                data_loader.h5saver = PrefetchedBackend(h5utils, arrays)
+            with self.lock:
+                if not self.is_current(request_id):
+                    return
+                dwa = data_loader.load_data(node_path, with_bkg=with_bkg, load_all=load_all)
+        except Exception as e:
+            self._failed.emit(request_id, node_path, str(e))
+        else:
+            self._loaded.emit(request_id, node_path, dwa)
+
+    @Slot(int, str, object)
+    def _emit_loaded(self, request_id: int, node_path: str, dwa):
+        if self.is_current(request_id):
+            self._set_loading(False)
+            self.data_loaded.emit(node_path, dwa)
+
+    @Slot(int, str, str)
+    def _emit_failed(self, request_id: int, node_path: str, message: str):
+        if self.is_current(request_id):
+            self._set_loading(False)
+            logger.warning(f'Could not load the node {node_path}: {message}')
+            self.load_failed.emit(node_path, message)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Cache of the pixmaps decoded from the binary (png) images stored as attributes of h5 nodes
+"""
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Set
+
+from qtpy import QtGui
+from qtpy.QtCore import QObject, Signal, Slot, QByteArray, QThreadPool, Qt
+
+from pymodaq_gui.h5modules.node_loader import FunctionRunnable
+
+
+class PixmapCache(QObject):
+    """Least Recently Used cache of QPixmap decoded from binary images, with their scaled variants
+
+    Images can be decoded synchronously (decode) or in a background thread (request). As QPixmap
+    objects can only be created in the GUI thread, the background threads only decode a QImage which
+    is then converted in the GUI thread before emitting pixmap_ready.
+
+    Parameters
+    ----------
+    max_items: int
+        maximum number of decoded images kept in the cache (with all their scaled variants)
+    """
+    pixmap_ready = Signal(object, object)  # the key and the (scaled if requested) QPixmap
+
+    _image_decoded = Signal(object, object, int)  # key, QImage and generation of the request
+
+    def __init__(self, max_items: int = 256, parent: QObject = None):
+        super().__init__(parent)
+        self.max_items = max_items
+        self._pixmaps: OrderedDict = OrderedDict()  # key: dict of height: QPixmap (0 for the original)
+        self._pending: Dict[Hashable, Set[int]] = dict()
+        self._generation = 0  # bumped by clear so that images decoded for older requests are dropped
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(2)
+        self._image_decoded.connect(self._store_decoded)
+
+    def __len__(self):
+        return len(self._pixmaps)
+
+    def __contains__(self, key: Hashable):
+        return key in self._pixmaps
+
+    def clear(self):
+        self._pixmaps.clear()
+        self._pending.clear()
+        self._generation += 1
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self._thread_pool.waitForDone(msecs)
+
+    @staticmethod
+    def decode_image(data: bytes) -> QtGui.QImage:
+        return QtGui.QImage.fromData(QByteArray(bytes(data)))
+
+    def get(self, key: Hashable, height: int = None) -> Optional[QtGui.QPixmap]:
+        """Get a cached pixmap, scaled to the given height if not None, or None if not decoded yet"""
+        variants = self._pixmaps.get(key, None)
+        if variants is None:
+            return None
+        self._pixmaps.move_to_end(key)
+        height = 0 if height is None else int(height)
+        if height not in variants:
+            variants[height] = variants[0].scaledToHeight(height, Qt.SmoothTransformation)
+        return variants[height]
+
+    def _store(self, key: Hashable, image: QtGui.QImage):
+        self._pixmaps[key] = {0: QtGui.QPixmap.fromImage(image)}
+        self._pixmaps.move_to_end(key)
+        while len(self._pixmaps) > self.max_items:
+            self._pixmaps.popitem(last=False)
+
+    def decode(self, key: Hashable, data: bytes, height: int = None) -> QtGui.QPixmap:
+        """Get the pixmap from the cache, decoding data in the calling (GUI) thread if needed"""
+        if key not in self._pixmaps:
+            self._store(key, self.decode_image(data))
+        return self.get(key, height)
+
+    def request(self, key: Hashable, data: bytes, height: int = None):
+        """Ask for a pixmap, pixmap_ready is emitted when available (immediately if cached)"""
+        height = 0 if height is None else int(height)
+        if key in self._pixmaps:
+            self.pixmap_ready.emit(key, self.get(key, height))
+        elif key in self._pending:
+            self._pending[key].add(height)
+        else:
+            self._pending[key] = {height}
+            self._thread_pool.start(FunctionRunnable(self._decode_in_thread, key, data, self._generation))
+
+    def _decode_in_thread(self, key: Hashable, data: bytes, generation: int):
+        self._image_decoded.emit(key, self.decode_image(data), generation)
+
+    @Slot(object, object, int)
+    def _store_decoded(self, key: Hashable, image: QtGui.QImage, generation: int):
+        if generation != self._generation:  # requested before a clear
+            return
+        self._store(key, image)
+        for height in self._pending.pop(key, set()):
+            self.pixmap_ready.emit(key, self.get(key, height))
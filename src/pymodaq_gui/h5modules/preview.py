@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Quick previews of the data stored in h5 nodes, computed from strided reads of the arrays
+"""
+import os
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pyqtgraph as pg
+
+from qtpy import QtWidgets
+
+from pymodaq_data.data import DataRaw
+from pymodaq_data.h5modules.backends import H5Backend, Node, GROUP, CARRAY
+
+from pymodaq_gui.h5modules.data_cache import DataCache
+
+PREVIEW_DATA_TYPES = ('data', 'data_enlargeable')
+
+
+def get_strided_slices(shape: Tuple[int], max_points: Union[int, Tuple[int]]) -> Tuple[slice]:
+    """Get slices selecting at most max_points evenly spaced points along each dimension"""
+    if isinstance(max_points, int):
+        max_points = [max_points for _ in shape]
+    return tuple([slice(0, size, max(1, int(np.ceil(size / npts)))) for size, npts in zip(shape, max_points)])
+
+
+def get_nav_indexes(node: CARRAY) -> Tuple[int]:
+    """Get the navigation dimensions of the array stored in node
+
+    Enlargeable arrays hold extra leading dimensions (the enlarged ones) that are considered as
+    navigation ones
+    """
+    attrs_name = node.attrs.attrs_name
+    nav_indexes = tuple(node.attrs['nav_indexes']) if 'nav_indexes' in attrs_name else ()
+    array_ndim = len(node.node.shape)
+    data_ndim = len(node.attrs['shape']) if 'shape' in attrs_name else array_ndim
+    n_extra = max(0, array_ndim - data_ndim)
+    return tuple(range(n_extra)) + tuple([ind + n_extra for ind in nav_indexes])
+
+
+def compute_preview(node: CARRAY, max_signal_points=256, max_nav_points=16) -> np.ndarray:
+    """Compute a 0D, 1D or 2D summary of the array stored in a node without reading it all
+
+    A strided hyperslab of the array is read (at most max_nav_points per navigation dimension and
+    max_signal_points per signal dimension) then averaged over its navigation dimensions. If the
+    signal is 0D, the navigation map itself is returned. The result is reduced to at most two
+    dimensions by averaging the leading ones.
+    """
+    shape = node.node.shape
+    if len(shape) == 0:
+        return np.atleast_1d(np.asarray(node.node[()], dtype=float))
+    nav_indexes = get_nav_indexes(node)
+    sig_indexes = tuple([ind for ind in range(len(shape)) if ind not in nav_indexes])
+    if len(sig_indexes) == 0:
+        nav_indexes, sig_indexes = (), nav_indexes
+        max_nav_points = max_signal_points
+
+    max_points = [max_nav_points if ind in nav_indexes else max_signal_points for ind in range(len(shape))]
+    array = np.asarray(node.node[get_strided_slices(shape, max_points)])
+    if np.iscomplexobj(array):
+        array = np.abs(array)
+    array = array.astype(float, copy=False)
+    if len(nav_indexes) > 0:
+        array = np.nanmean(array, axis=nav_indexes)
+    while array.ndim > 2:
+        array = np.nanmean(array, axis=0)
+    return np.atleast_1d(array)
+
+
+class H5Previewer:
+    """Compute and cache previews of the data hold by h5 nodes
+
+    Previews of groups are the ones of the first data node found when walking down the group. The
+    previews are cached (as DataWithAxes without axes) using the file path, the node path and the
+    modification time of the file as key.
+
+    Parameters
+    ----------
+    max_signal_points: int
+        maximum number of points read along signal dimensions
+    max_nav_points: int
+        maximum number of points read along navigation dimensions
+    cache: DataCache
+    """
+
+    def __init__(self, max_signal_points=256, max_nav_points=16, cache: DataCache = None):
+        self.max_signal_points = max_signal_points
+        self.max_nav_points = max_nav_points
+        self.cache = cache if cache is not None else DataCache(max_bytes=32 * 1024 ** 2, copy=False)
+
+    @staticmethod
+    def is_data_node(node: Node) -> bool:
+        return isinstance(node, CARRAY) and 'data_type' in node.attrs.attrs_name and \
+            node.attrs['data_type'] in PREVIEW_DATA_TYPES
+
+    def find_data_node(self, h5utils: H5Backend, node: Node, max_depth=6) -> Optional[CARRAY]:
+        """Walk down a group (first children first) to find a data node"""
+        if self.is_data_node(node):
+            return node
+        if not isinstance(node, GROUP) or max_depth == 0:
+            return None
+        for name in node.children_name():
+            child = h5utils.get_node(f"{node.path.rstrip('/')}/{name}")
+            data_node = self.find_data_node(h5utils, child, max_depth - 1)
+            if data_node is not None:
+                return data_node
+        return None
+
+    def get_preview(self, h5utils: H5Backend, node_path: str) -> Optional[np.ndarray]:
+        """Get the preview array of the node (or of the first data node of the group) at node_path"""
+        try:
+            key = (str(h5utils.filename), node_path, os.stat(h5utils.filename).st_mtime_ns)
+        except (OSError, AttributeError):
+            key = None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached[0]
+        data_node = self.find_data_node(h5utils, h5utils.get_node(node_path))
+        if data_node is None:
+            return None
+        preview = compute_preview(data_node, self.max_signal_points, self.max_nav_points)
+        if key is not None:
+            self.cache.put(key, DataRaw('preview', data=[preview]))
+        return preview
+
+
+class PreviewWidget(QtWidgets.QWidget):
+    """Small widget rendering a preview: a value, a curve or an image"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setLayout(QtWidgets.QVBoxLayout())
+        self.layout().setContentsMargins(0, 0, 0, 0)
+        self._label = QtWidgets.QLabel()
+        self._graph = pg.PlotWidget()
+        self._graph.hideAxis('left')
+        self._graph.hideAxis('bottom')
+        self._graph.setMouseEnabled(False, False)
+        self._graph.hideButtons()
+        self._curve = pg.PlotDataItem()
+        self._image = pg.ImageItem()
+        self._image.setLookupTable(pg.colormap.get('viridis').getLookupTable())
+        self._graph.addItem(self._curve)
+        self._graph.addItem(self._image)
+        self.layout().addWidget(self._label)
+        self.layout().addWidget(self._graph)
+        self.setMaximumHeight(150)
+
+    def show_preview(self, preview: Optional[np.ndarray], title: str = ''):
+        self._label.setText(title)
+        self._curve.setVisible(preview is not None and preview.ndim == 1 and preview.size > 1)
+        self._image.setVisible(preview is not None and preview.ndim == 2)
+        self._graph.setVisible(preview is not None and preview.size > 1)
+        if preview is None:
+            return
+        if preview.size == 1:
+            self._label.setText(f'{title}: {float(preview.ravel()[0]):.6g}')
+        elif preview.ndim == 1:
+            self._curve.setData(preview)
+        else:
+            self._image.setImage(preview, autoLevels=True)
+        self._graph.autoRange()
@@ -7,14 +7,16 @@ Created the 15/11/2022
 import copy
 import datetime
 from dateutil import parser
+from fnmatch import fnmatch
 from numbers import Number
 import os
 from pathlib import Path
-from typing import Union, Iterable
+import threading
+from typing import Callable, List, Union, Iterable
 
 
 import numpy as np
-from qtpy.QtCore import QObject, Signal
+from qtpy.QtCore import QObject, Signal, QTimer
 from qtpy import QtWidgets
 
 from pymodaq_utils.logger import set_logger, get_module_name
@@ -24,7 +26,7 @@ from pymodaq_utils.config import Config
 from pymodaq_data.h5modules.backends import (
     H5Backend, backends_available, SaveType,
     GroupType, InvalidDataDimension, InvalidScanType,
-    GROUP, VLARRAY)
+    GROUP, VLARRAY, EARRAY)
 from pymodaq_data.h5modules.saving import H5SaverLowLevel
 
 from pymodaq_gui.parameter import Parameter, ParameterTree
@@ -32,6 +34,9 @@ from pymodaq_gui.parameter import utils as putils
 from pymodaq_gui.managers.parameter_manager import ParameterManager
 from pymodaq_gui.utils.file_io import select_file
 from pymodaq_gui.h5modules import browsing
+from pymodaq_gui.h5modules.async_writer import H5AsyncWriter, DEFAULT_QUEUE_SIZE, DEFAULT_MAX_COALESCED
+from pymodaq_gui.h5modules import chunking
+from pymodaq_gui.h5modules.directory_index import DirectoryIndex, directory_index
 
 config = Config()
 logger = set_logger(get_module_name(__file__))
@@ -93,6 +98,7 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
 
     """
     settings_name = 'h5saver_settings'
+    path_index: DirectoryIndex = directory_index
     params = [
         {'title': 'Save type:', 'name': 'save_type', 'type': 'list', 'limits': SaveType.names(),
          'readonly': True},
@@ -137,6 +143,36 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
              'value': 'zlib', 'limits': ['zlib', 'gzip']},
             {'title': 'Compression level:', 'name': 'h5comp_level', 'type': 'int',
                 'value': config('data_saving', 'h5file', 'compression_level'), 'min': 0, 'max': 9},
+            {'title': 'Chunk size (kB):', 'name': 'chunk_size', 'type': 'int',
+             'value': 0, 'min': 0,
+             'tooltip': 'Targeted size of the chunks of enlargeable arrays, 0 to use the library default'},
+            {'title': 'Expected scan length:', 'name': 'expected_rows', 'type': 'int', 'value': 0, 'min': 0,
+             'tooltip': 'Expected number of appended data, 0 if unknown'},
+            {'title': 'Size budget:', 'name': 'size_budget', 'type': 'float', 'value': 1., 'min': 0.,
+             'tooltip': 'Maximum size on disk relative to the raw data size when calibrating the compression'},
+            {'title': 'Calibrate', 'name': 'calibrate', 'type': 'action',
+             'tooltip': 'Benchmark the compression levels on the last appended data and select the fastest one'
+                        ' meeting the size budget'},
+            {'title': 'Calibration:', 'name': 'calibration_results', 'type': 'text', 'value': '',
+             'readonly': True},
+        ]},
+        {'title': 'Asynchronous writing:', 'name': 'async_options', 'type': 'group', 'expanded': False,
+         'children': [
+            {'title': 'Write in background:', 'name': 'async_write', 'type': 'bool', 'value': False,
+             'tooltip': 'If True, appended data are queued and written into the file from a dedicated thread'},
+            {'title': 'Queue size:', 'name': 'queue_size', 'type': 'int', 'value': DEFAULT_QUEUE_SIZE,
+             'min': 1, 'tooltip': 'Maximum number of pending writes, producers are blocked when reached'},
+            {'title': 'Max coalesced appends:', 'name': 'max_coalesced', 'type': 'int',
+             'value': DEFAULT_MAX_COALESCED, 'min': 1},
+            {'title': 'Queue depth:', 'name': 'queue_depth', 'type': 'int', 'value': 0, 'readonly': True},
+            {'title': 'Max queue depth:', 'name': 'max_queue_depth', 'type': 'int', 'value': 0,
+             'readonly': True},
+            {'title': 'Writes/requests:', 'name': 'writes_ratio', 'type': 'str', 'value': '0/0',
+             'readonly': True},
+            {'title': 'Throughput (MB/s):', 'name': 'throughput', 'type': 'float', 'value': 0.,
+             'readonly': True},
+            {'title': 'Blocked time (s):', 'name': 'blocked_time', 'type': 'float', 'value': 0.,
+             'readonly': True},
         ]},
     ]
 
@@ -158,11 +194,174 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
         self.current_scan_group = None
         self.current_scan_name = None
 
+        self._closing = False
+        self._last_frame: np.ndarray = None
+        self.writer = H5AsyncWriter(self, self.settings['async_options', 'queue_size'],
+                                    self.settings['async_options', 'max_coalesced'])
+
         self.settings.child('save_type').setValue(self.save_type.name)
+        self.settings.child('compression_options', 'calibrate').sigActivated.connect(
+            lambda: self.calibrate_compression())
 
     def show_settings(self, show=True):
         self.settings_tree.setVisible(show)
 
+    @property
+    def is_async(self) -> bool:
+        """True if the write operations are executed in the background writer thread"""
+        return self.writer.is_running
+
+    def set_async_writing(self, async_write=True):
+        """Start or stop (once all pending operations are written) the background writer thread"""
+        if async_write:
+            self.writer.reset_metrics()
+            self.writer.start()
+        else:
+            self.writer.stop()
+        self.update_write_metrics()
+
+    def update_write_metrics(self):
+        """Update the read only parameters displaying the statistics of the background writer"""
+        metrics = self.writer.metrics()
+        self.settings.child('async_options', 'queue_depth').setValue(metrics['queue_depth'])
+        self.settings.child('async_options', 'max_queue_depth').setValue(metrics['max_queue_depth'])
+        self.settings.child('async_options', 'writes_ratio').setValue(
+            f"{metrics['n_writes']}/{metrics['n_requests']}")
+        self.settings.child('async_options', 'throughput').setValue(metrics['throughput'])
+        self.settings.child('async_options', 'blocked_time').setValue(metrics['blocked_time'])
+
+    def get_chunk_shape(self, data_shape: Iterable[int], dtype) -> Union[tuple, None]:
+        """Chunk shape of an enlargeable array from the chunking parameters, None for the library default
+
+        See Also
+        --------
+        chunking.get_chunk_shape
+        """
+        target_bytes = self.settings['compression_options', 'chunk_size'] * 1024
+        if target_bytes <= 0:
+            return None
+        return chunking.get_chunk_shape(data_shape, dtype, self.settings['compression_options', 'expected_rows'],
+                                        target_bytes)
+
+    def create_earray(self, where, name, dtype, data_shape=None, title=''):
+        """Create an enlargeable array whose chunks follow the chunking parameters"""
+        chunk_shape = self.get_chunk_shape(data_shape, dtype)
+        if chunk_shape is None:
+            return super().create_earray(where, name, dtype, data_shape=data_shape, title=title)
+        return chunking.create_earray(self, where, name, dtype, data_shape, title, chunk_shape=chunk_shape,
+                                      expected_rows=self.settings['compression_options', 'expected_rows'])
+
+    def calibrate_compression(self, frame: np.ndarray = None, apply=True) -> List[chunking.CompressionResult]:
+        """Benchmark the compression levels of the selected library on a sample frame
+
+        The fastest option whose size on disk is below the size budget is selected if apply is True
+
+        Parameters
+        ----------
+        frame: ndarray
+            a representative frame, default to the last one appended
+        apply: bool
+            if True set the compression parameters to the selected option
+
+        Returns
+        -------
+        list of CompressionResult
+        """
+        if frame is None:
+            frame = self._last_frame
+        if frame is None:
+            self.update_status('No data has been appended yet, cannot calibrate the compression')
+            return []
+        target_bytes = self.settings['compression_options', 'chunk_size'] * 1024
+        results = chunking.calibrate_compression(
+            frame, self.backend if self.backend != 'h5pyd' else 'h5py',
+            libraries=[self.settings['compression_options', 'h5comp_library']],
+            target_bytes=target_bytes if target_bytes > 0 else chunking.DEFAULT_CHUNK_BYTES)
+        selected = chunking.select_compression(results, self.settings['compression_options', 'size_budget'])
+        self.settings.child('compression_options', 'calibration_results').setValue(
+            '\n'.join([('* ' if result is selected else '') + str(result) for result in results]))
+        if apply and selected is not None:
+            self.settings.child('compression_options', 'h5comp_level').setValue(selected.level)
+        return results
+
+    def append(self, array: EARRAY, data: np.ndarray, timeout: float = None):
+        """Append data to an enlargeable array, from the writer thread if in asynchronous mode
+
+        In asynchronous mode, the call blocks while the queue is full (or raises queue.Full after
+        timeout) and consecutive appends to the same array are coalesced into a single write.
+        """
+        self._last_frame = data
+        if self.is_async:
+            self.writer.append(array, data, timeout=timeout)
+        else:
+            array.append(data)
+
+    def submit(self, function: Callable, *args, timeout: float = None, **kwargs):
+        """Call function(*args, **kwargs), from the writer thread if in asynchronous mode
+
+        To be used for any other write operation so that it is executed in order with the queued
+        appends, see also add_data
+        """
+        if self.is_async:
+            self.writer.submit(function, *args, timeout=timeout, **kwargs)
+        else:
+            function(*args, **kwargs)
+
+    def add_data(self, data_saver, where: Union[GROUP, str], data, timeout: float = None, **kwargs):
+        """Write data using a DataSaver of pymodaq_data, from the writer thread if in asynchronous mode
+
+        The DataSavers access the file directly: in asynchronous mode they should only be used
+        through this method (or submit) or while holding writer.lock, as the file cannot be
+        accessed from several threads at once. The data are copied before being queued so that the
+        caller can reuse them.
+
+        Parameters
+        ----------
+        data_saver: DataSaverLoader, DataToExportSaver...
+            the object whose add_data method is called
+        where: GROUP or str
+        data: DataWithAxes or DataToExport
+        kwargs: passed to data_saver.add_data
+        """
+        if self.is_async:
+            self.writer.submit(data_saver.add_data, where, data.deepcopy(), timeout=timeout, **kwargs)
+        else:
+            data_saver.add_data(where, data, **kwargs)
+
+    def flush(self, wait=False) -> threading.Event:
+        """Flush the file, in asynchronous mode from the writer thread once all operations queued
+        before are written
+
+        Parameters
+        ----------
+        wait: bool
+            in asynchronous mode, if True block until the flush is done, otherwise return right away
+
+        Returns
+        -------
+        threading.Event: set once the flush is done
+        """
+        if self.is_async and not (self._closing or self.writer.in_writer_thread()):
+            event = self.writer.flush()
+            if wait:
+                event.wait()
+            return event
+        super().flush()
+        event = threading.Event()
+        event.set()
+        return event
+
+    def close_file(self):
+        """Write all pending operations then flush and close the file"""
+        self.writer.wait()
+        with self.writer.lock:
+            self._closing = True
+            try:
+                super().close_file()
+            finally:
+                self._closing = False
+        self._last_frame: np.ndarray = None
+
     def init_file(self, update_h5=False, custom_naming=False, addhoc_file_path=None,
                   metadata=dict([])):
         """Initializes a new h5 file.
@@ -227,6 +426,7 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
         self.settings.child('current_h5_file').setValue(str(fullpathname))
 
         super().init_file(fullpathname, new_file=update_h5, metadata=metadata)
+        self.path_index.add(fullpathname)
 
         self.get_set_logger(self.raw_group)
 
@@ -311,18 +511,16 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
                         found_path = base_dir.parents[ind]
                         break
         else:  # if not check if year is in the subfolders
-            subfolders_year_name = [x.name for x in base_dir.iterdir() if x.is_dir()]
-            subfolders_found_path = [x for x in base_dir.iterdir() if x.is_dir()]
-            if part not in subfolders_year_name:
+            if part not in cls.path_index.subdirs(base_dir):
                 if increment:
                     found_path = base_dir.joinpath(part)
                 else:
                     found_path = base_dir
                 if create:
                     found_path.mkdir()
+                    cls.path_index.add(found_path)
             else:
-                ind_path = subfolders_year_name.index(part)
-                found_path = subfolders_found_path[ind_path]
+                found_path = base_dir.joinpath(part)
         return found_path
 
     @classmethod
@@ -353,22 +551,23 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
         day_path = cls.find_part_in_path_and_subpath(year_path, part=curr_date.strftime('%Y%m%d'),
                                                      create=True)  # create directory of the day if it doen't exist and return it
         dataset_base_name = curr_date.strftime('Dataset_%Y%m%d')
-        dataset_paths = sorted([path for path in day_path.glob(dataset_base_name + "*"+".h5") if path.is_file()])
+        dataset_names = [name for name in cls.path_index.files(day_path)
+                         if fnmatch(name, dataset_base_name + "*" + ".h5")]
 
         if ind_dataset is None:
-            if dataset_paths == []:
+            if dataset_names == []:
 
                 ind_dataset = 0
             else:
+                last_dataset = Path(max(dataset_names))
                 if update_h5:
-                    ind_dataset = int(dataset_paths[-1].stem.partition(dataset_base_name + "_")[2]) + 1
+                    ind_dataset = int(last_dataset.stem.partition(dataset_base_name + "_")[2]) + 1
                 else:
-                    ind_dataset = int(dataset_paths[-1].stem.partition(dataset_base_name + "_")[2])
+                    ind_dataset = int(last_dataset.stem.partition(dataset_base_name + "_")[2])
 
         dataset_path = cls.find_part_in_path_and_subpath(day_path,
                                                          part=dataset_base_name + "_{:03d}".format(ind_dataset),
                                                          create=False, increment=True)
-        scan_paths = sorted([path for path in dataset_path.glob(base_name + '*') if path.is_dir()])
         ind_scan = next_scan_index
         return dataset_path, base_name + '{:03d}'.format(ind_scan), dataset_path
 
@@ -443,11 +642,20 @@ class H5SaverBase(H5SaverLowLevel, ParameterManager):
             except Exception as e:
                 self.update_status(f"The base path couldn't be set, please check your options: {str(e)}")
 
-        elif param.name() in putils.iter_children(self.settings.child('compression_options'), []):
+        elif param.name() in ('h5comp_library', 'h5comp_level'):
             compression = self.settings.child('compression_options', 'h5comp_library').value()
             compression_opts = self.settings.child('compression_options', 'h5comp_level').value()
             self.define_compression(compression, compression_opts)
 
+        elif param.name() == 'async_write':
+            self.set_async_writing(param.value())
+
+        elif param.name() == 'queue_size':
+            self.writer.max_queue_size = param.value()
+
+        elif param.name() == 'max_coalesced':
+            self.writer.max_coalesced = param.value()
+
     def update_status(self, status):
         logger.warning(status)
 
@@ -458,10 +666,13 @@ class H5Saver(H5SaverBase, QObject):
                 emits a signal of type Threadcommand in order to senf log information to a main UI
     new_file_sig: Signal
                   emits a boolean signal to let the program know when the user pressed the new file button on the UI
+    flushed_sig: Signal
+                 emitted (in the main thread) when a flush is done in asynchronous writing mode
     """
 
     status_sig = Signal(utils.ThreadCommand)
     new_file_sig = Signal(bool)
+    flushed_sig = Signal()
 
     def __init__(self, *args, **kwargs):
         """
@@ -476,7 +687,24 @@ class H5Saver(H5SaverBase, QObject):
 
         self.settings.child('new_file').sigActivated.connect(lambda: self.emit_new_file(True))
 
+        self._metrics_timer = QTimer()
+        self._metrics_timer.setInterval(500)
+        self._metrics_timer.timeout.connect(self.update_write_metrics)
+        self.writer.flushed.connect(self._writer_flushed)
+
+    def _writer_flushed(self):
+        self.update_write_metrics()
+        self.flushed_sig.emit()
+
+    def set_async_writing(self, async_write=True):
+        super().set_async_writing(async_write)
+        if async_write:
+            self._metrics_timer.start()
+        else:
+            self._metrics_timer.stop()
+
     def close(self):
+        self.set_async_writing(False)
         self.close_file()
 
     def emit_new_file(self, status):
@@ -500,6 +728,6 @@ class H5Saver(H5SaverBase, QObject):
             else:
                 logger.warning('The h5 file path has not been defined yet')
         else:
-            self.flush()
+            self.flush(wait=True)
             self.analysis_prog = browsing.H5Browser(win, h5file=self.h5file)
         win.show()
\ No newline at end of file
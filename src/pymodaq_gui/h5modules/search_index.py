@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Searchable index of the node paths, attributes and settings values of h5 files
+"""
+import ast
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Union
+from xml.etree import ElementTree as ET
+
+from qtpy.QtCore import QObject, Signal, Slot, QThreadPool
+
+from pymodaq_utils.logger import set_logger, get_module_name
+
+from pymodaq_data.h5modules.backends import H5Backend
+
+from pymodaq_gui.h5modules.node_loader import FunctionRunnable
+
+
+logger = set_logger(get_module_name(__file__))
+
+INDEX_VERSION = 2
+SIDECAR_SUFFIX = '.index.json'
+SETTINGS_ATTRIBUTES = ('settings', 'scan_settings')
+NODE_BATCH = 64
+"""Number of nodes walked through at once while holding the file lock"""
+
+_typed_value = re.compile(r'^(str|int|float|bool)\((.*)\)$', re.DOTALL)
+
+
+class IndexCancelled(Exception):
+    pass
+
+
+def clean_xml_value(text: str) -> str:
+    """Value of a settings as displayed, without the type wrapping used for list values, e.g. str('a')"""
+    match = _typed_value.match(text)
+    if match is not None:
+        try:
+            return str(ast.literal_eval(match.group(2)))
+        except (ValueError, SyntaxError):
+            return match.group(2)
+    return text
+
+
+def flatten_settings(xml_string: Union[str, bytes], prefix='') -> Dict[str, str]:
+    """Values of the parameters of settings saved as XML, keyed by their path
+
+    The XML is parsed without creating the Parameter objects (see ioxml.XML_string_to_parameter)
+    """
+    flat = dict()
+    root = ET.fromstring(xml_string)
+
+    def walk(elt: ET.Element, path: str):
+        for child in elt:
+            child_path = f'{path}/{child.tag}' if path != '' else child.tag
+            if child.get('type', '') != 'group' and child.text is not None:
+                flat[child_path] = clean_xml_value(child.text.strip())
+            walk(child, child_path)
+
+    walk(root, prefix)
+    return flat
+
+
+def get_digest(value: Union[str, bytes]) -> str:
+    if isinstance(value, str):
+        value = value.encode()
+    return hashlib.sha1(value).hexdigest()
+
+
+def walk_in_batches(h5utils: H5Backend, function: Callable, lock: threading.RLock = None,
+                    batch_size: int = None) -> Iterator:
+    """Apply function on all the nodes of the file, the lock being held per batch of nodes only
+
+    The lock is released between batches (of NODE_BATCH nodes by default) so that other threads (the
+    GUI) can access the file
+    """
+    lock = lock if lock is not None else threading.RLock()
+    batch_size = batch_size if batch_size is not None else NODE_BATCH
+    walker = h5utils.walk_nodes('/')
+    while True:
+        with lock:
+            results = [function(node) for node in islice(walker, batch_size)]
+        yield from results
+        if len(results) < batch_size:
+            break
+        time.sleep(0)  # let the threads waiting for the lock get it
+
+
+def _get_node_key(node) -> tuple:
+    attrs_name = node.attrs.attrs_name
+    timestamp = 0.
+    if 'timestamp' in attrs_name:
+        try:
+            timestamp = float(node.attrs['timestamp'])
+        except (TypeError, ValueError):
+            pass
+    return node.path, len(attrs_name), timestamp
+
+
+def get_content_key(h5utils: H5Backend, lock: threading.RLock = None) -> dict:
+    """Signature of the content of a h5 file, stable across opening and closing it in 'r+' mode
+
+    Made of the file size, the number of nodes, a digest of the node paths and of their number of
+    attributes and the latest timestamp attribute of the nodes. The lock (if any) is held per batch
+    of nodes, see walk_in_batches.
+    """
+    n_nodes = 0
+    max_timestamp = 0.
+    paths = hashlib.sha1()
+    for path, n_attrs, timestamp in walk_in_batches(h5utils, _get_node_key, lock):
+        n_nodes += 1
+        paths.update(f'{path}:{n_attrs}\n'.encode())
+        max_timestamp = max(max_timestamp, timestamp)
+    return dict(size=os.stat(h5utils.filename).st_size, n_nodes=n_nodes, paths=paths.hexdigest(),
+                max_timestamp=max_timestamp)
+
+
+def get_sidecar_path(file_path: Union[str, Path]) -> Path:
+    file_path = Path(file_path)
+    return file_path.with_name(file_path.name + SIDECAR_SUFFIX)
+
+
+class H5SearchIndex:
+    """Index of the nodes of a h5 file to be searched by path, attribute or settings value
+
+    Each entry holds the path of a node and its fields: the attributes (but the binary images) and
+    the flattened values of the settings stored as XML in the attributes (keyed as
+    'settings/group/param'). Entries are searched with queries made of space separated terms, all
+    of them should match:
+
+    * key=value: a field whose key contains key and whose value contains value
+    * text: the path, a field key or a field value containing text
+
+    Matching is case insensitive.
+    """
+
+    def __init__(self, file_path: Union[str, Path] = None):
+        self.file_path = Path(file_path) if file_path is not None else None
+        self.mtime_ns = 0
+        self.size = 0
+        self.content_key: dict = None
+        self.entries: Dict[str, dict] = dict()  # node path: dict(fields=..., digests=...)
+        self._haystacks: Dict[str, str] = dict()
+        self._fields_lower: Dict[str, List[tuple]] = dict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, node_path: str):
+        return node_path in self.entries
+
+    def is_valid(self, file_path: Union[str, Path] = None) -> bool:
+        """True if the index has been built from the file as it is on disk"""
+        file_path = Path(file_path) if file_path is not None else self.file_path
+        try:
+            stat = os.stat(file_path)
+        except (OSError, TypeError):
+            return False
+        return file_path == self.file_path and stat.st_mtime_ns == self.mtime_ns and stat.st_size == self.size
+
+    def matches_content(self, h5utils: H5Backend, lock: threading.RLock = None) -> bool:
+        """True if the index has been built from the file opened in h5utils, even if its modification
+        time changed since (opening a file in 'r+' mode updates it), see get_content_key"""
+        return self.content_key is not None and Path(h5utils.filename) == self.file_path and \
+            get_content_key(h5utils, lock) == self.content_key
+
+    def set_entry(self, node_path: str, fields: Dict[str, str], digests: Dict[str, str] = None):
+        self.entries[node_path] = dict(fields=fields, digests=digests if digests is not None else dict())
+        self._fields_lower[node_path] = [(key.lower(), value.lower()) for key, value in fields.items()]
+        self._haystacks[node_path] = '\n'.join([node_path.lower()] +
+                                               [f'{key}={value}' for key, value in self._fields_lower[node_path]])
+
+    def index_node(self, h5utils: H5Backend, node_path: str, previous: 'H5SearchIndex' = None):
+        """Index (or index again) a single node
+
+        The settings whose XML did not change since the previous index are not parsed again
+        """
+        node = h5utils.get_node(node_path)
+        fields = dict()
+        digests = dict()
+        old_entry = previous.entries.get(node_path, None) if previous is not None else None
+        for name in node.attrs.attrs_name:
+            if 'pixmap' in name:
+                continue
+            value = node.attrs[name]
+            if name in SETTINGS_ATTRIBUTES:
+                if value is None or len(value) == 0:
+                    continue
+                digests[name] = get_digest(value)
+                if old_entry is not None and old_entry['digests'].get(name, None) == digests[name]:
+                    fields.update({key: val for key, val in old_entry['fields'].items()
+                                   if key.startswith(f'{name}/')})
+                else:
+                    try:
+                        fields.update(flatten_settings(value, prefix=name))
+                    except ET.ParseError as e:
+                        logger.warning(f'Could not parse the {name} of {node_path}: {e}')
+            else:
+                fields[name] = value.decode(errors='replace') if isinstance(value, bytes) else str(value)
+        self.set_entry(node_path, fields, digests)
+
+    def build(self, h5utils: H5Backend, lock: threading.RLock = None, previous: 'H5SearchIndex' = None,
+              cancel_event: threading.Event = None, content_key=False):
+        """Index all the nodes of the file opened in h5utils
+
+        The lock (if any) is held while walking through a batch of nodes or indexing a node, never
+        during the whole build. The content key (see get_content_key) is only computed if content_key
+        is True, that is if the index is to be saved.
+
+        Raises
+        ------
+        IndexCancelled if cancel_event is set
+        """
+        lock = lock if lock is not None else threading.RLock()
+        with lock:
+            self.file_path = Path(h5utils.filename)
+            stat = os.stat(self.file_path)
+        node_paths = []
+        for node_path in walk_in_batches(h5utils, lambda node: node.path, lock):
+            if cancel_event is not None and cancel_event.is_set():
+                raise IndexCancelled()
+            node_paths.append(node_path)
+        self.content_key = get_content_key(h5utils, lock) if content_key else None
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.entries = dict()
+        for node_path in node_paths:
+            if cancel_event is not None and cancel_event.is_set():
+                raise IndexCancelled()
+            with lock:
+                self.index_node(h5utils, node_path, previous)
+
+    def update_file_stat(self):
+        """To be called once the file is known to match the index, see reindex_node and matches_content"""
+        stat = os.stat(self.file_path)
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+
+    def reindex_node(self, h5utils: H5Backend, node_path: str):
+        """Index again a node modified by the owner of the index, the index staying valid for the file
+
+        The content key is outdated and only computed again when saving the index, see save
+        """
+        self.index_node(h5utils, node_path, previous=self)
+        self.content_key = None
+        self.update_file_stat()
+
+    def search(self, query: str, limit: int = None) -> List[str]:
+        """Paths of the nodes matching all the terms of the query, in the order of the file"""
+        terms = query.lower().split()
+        if len(terms) == 0:
+            return []
+        key_values = [term.partition('=')[::2] for term in terms if '=' in term]
+        texts = [term for term in terms if '=' not in term]
+        results = []
+        for node_path, haystack in self._haystacks.items():
+            if not all([text in haystack for text in texts]):
+                continue
+            if not all([any([key in field_key and value in field_value
+                             for field_key, field_value in self._fields_lower[node_path]])
+                        for key, value in key_values]):
+                continue
+            results.append(node_path)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def to_dict(self) -> dict:
+        return dict(version=INDEX_VERSION, file=self.file_path.name, mtime_ns=self.mtime_ns, size=self.size,
+                    content_key=self.content_key, entries=self.entries)
+
+    def save(self, sidecar_path: Union[str, Path] = None, h5utils: H5Backend = None,
+             lock: threading.RLock = None) -> Optional[Path]:
+        """Save the index in a json file next to the h5 file, return None if not writable
+
+        If outdated (see reindex_node), the content key is computed from h5utils (if given) beforehand
+        """
+        if self.content_key is None and h5utils is not None:
+            self.content_key = get_content_key(h5utils, lock)
+        sidecar_path = Path(sidecar_path) if sidecar_path is not None else get_sidecar_path(self.file_path)
+        try:
+            tmp_path = sidecar_path.with_name(sidecar_path.name + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self.to_dict(), f)
+            os.replace(tmp_path, sidecar_path)
+            return sidecar_path
+        except OSError as e:
+            logger.info(f'The search index could not be saved in {sidecar_path}: {e}')
+            return None
+
+    @classmethod
+    def load(cls, file_path: Union[str, Path], sidecar_path: Union[str, Path] = None) \
+            -> Optional['H5SearchIndex']:
+        """Load the index of a file from its sidecar, None if missing or invalid
+
+        Use is_valid to check if the loaded index is up to date with the file
+        """
+        file_path = Path(file_path)
+        sidecar_path = Path(sidecar_path) if sidecar_path is not None else get_sidecar_path(file_path)
+        try:
+            with open(sidecar_path, 'r') as f:
+                content = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f'No search index loaded from {sidecar_path}: {e}')
+            return None
+        if content.get('version', None) != INDEX_VERSION or content.get('file', None) != file_path.name:
+            return None
+        index = cls(file_path)
+        index.mtime_ns = content['mtime_ns']
+        index.size = content['size']
+        index.content_key = content.get('content_key', None)
+        for node_path, entry in content['entries'].items():
+            index.set_entry(node_path, entry['fields'], entry['digests'])
+        return index
+
+
+class H5IndexBuilder(QObject):
+    """Load or build the search index of h5 files in a background thread
+
+    If persist is True, the index is loaded from the sidecar file if it is up to date with the file,
+    otherwise it is built again (reusing the parsed settings of the outdated index) and saved in the
+    sidecar.
+
+    Parameters
+    ----------
+    lock: threading.RLock
+        lock protecting the access to the h5 file, created if not given
+    persist: bool
+        if True, the index is loaded from and saved into a sidecar file next to the h5 file
+    """
+    index_ready = Signal(object)  # the H5SearchIndex
+    build_failed = Signal(str)
+
+    _built = Signal(int, object)
+    _failed = Signal(int, str)
+
+    def __init__(self, lock: threading.RLock = None, persist=False, parent: QObject = None):
+        super().__init__(parent)
+        self.lock = lock if lock is not None else threading.RLock()
+        self.persist = persist
+        self._request_id = 0
+        self._cancel_event = threading.Event()
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(1)
+        self._built.connect(self._emit_built)
+        self._failed.connect(self._emit_failed)
+
+    def build(self, h5utils: H5Backend) -> int:
+        """Request the index of the file opened in h5utils, superseding any previous request"""
+        self.cancel()
+        self._cancel_event = threading.Event()
+        self._request_id += 1
+        self._thread_pool.start(FunctionRunnable(self._build, self._request_id, h5utils, self._cancel_event))
+        return self._request_id
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self._thread_pool.waitForDone(msecs)
+
+    def _build(self, request_id: int, h5utils: H5Backend, cancel_event: threading.Event):
+        try:
+            with self.lock:
+                file_path = Path(h5utils.filename)
+            index = H5SearchIndex.load(file_path) if self.persist else None
+            if index is not None and not index.is_valid(file_path):
+                if index.matches_content(h5utils, self.lock):  # only the modification time changed
+                    index.update_file_stat()
+                    index.save()
+            if index is None or not index.is_valid(file_path):
+                previous = index
+                index = H5SearchIndex()
+                index.build(h5utils, self.lock, previous, cancel_event, content_key=self.persist)
+                if self.persist:
+                    index.save()
+            self._built.emit(request_id, index)
+        except IndexCancelled:
+            pass
+        except Exception as e:
+            logger.exception(f'Could not build the search index: {e}')
+            self._failed.emit(request_id, str(e))
+
+    @Slot(int, object)
+    def _emit_built(self, request_id: int, index: H5SearchIndex):
+        if request_id == self._request_id:
+            self.index_ready.emit(index)
+
+    @Slot(int, str)
+    def _emit_failed(self, request_id: int, error: str):
+        if request_id == self._request_id:
+            self.build_failed.emit(error)
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Lazy Qt item model over the hierarchy of a h5 file: children of a group are listed and created only
+when the group is expanded in the view
+"""
+import threading
+from typing import List, Optional
+
+from qtpy import QtCore
+from qtpy.QtCore import Qt, Signal
+
+from pymodaq_data.h5modules.backends import H5Backend, Node, GROUP
+
+
+class H5TreeItem:
+    """Item of the H5TreeModel holding a h5 node and its already fetched children
+
+    The name, path and class of the node are read once at creation, the attribute names are read on
+    first use and then cached
+
+    Parameters
+    ----------
+    node: Node
+        the h5 node, None for the invisible root item of the model
+    parent: H5TreeItem
+    row: int
+        the position of this item within its parent children
+    """
+
+    def __init__(self, node: Optional[Node] = None, parent: 'H5TreeItem' = None, row: int = 0):
+        self.node = node
+        self.parent = parent
+        self.row = row
+        self.children: List[H5TreeItem] = []
+        self.pending_names: Optional[List[str]] = None  # None means the children have not been listed yet
+        self._attrs_name: Optional[List[str]] = None
+
+        if node is None:
+            self.name = ''
+            self.path = ''
+            self.is_group = True
+        else:
+            self.name = node.name
+            self.path = node.path
+            self.is_group = isinstance(node, GROUP)
+
+    @property
+    def attrs_name(self) -> List[str]:
+        if self._attrs_name is None:
+            self._attrs_name = [] if self.node is None else list(self.node.attrs.attrs_name)
+        return self._attrs_name
+
+    @property
+    def has_pixmap(self) -> bool:
+        return 'pixmap' in self.attrs_name
+
+    def can_fetch_more(self) -> bool:
+        return self.is_group and (self.pending_names is None or len(self.pending_names) > 0)
+
+    def child_path(self, name: str) -> str:
+        return f"{self.path.rstrip('/')}/{name}"
+
+
+class H5TreeModel(QtCore.QAbstractItemModel):
+    """Item model exposing the nodes of a h5 file, populated on demand
+
+    The columns mimic the ones of the QTreeWidgetItem previously used in the H5Browser: the node name,
+    an empty column where a pixmap widget can be set and the path of the node within the file
+
+    Children of a group are fetched (by batches of fetch_batch_size) only when the view asks for them,
+    that is when the group is expanded. The file is read while holding the lock given in set_backend
+
+    Parameters
+    ----------
+    fetch_batch_size: int
+        maximum number of children created in one call to fetchMore
+    """
+    pixmap_items_fetched = Signal(list)  # list of dict(node=Node, index=QModelIndex) of the pixmap column
+
+    COLUMNS = ['Node', 'Pixmap', 'Path']
+
+    def __init__(self, fetch_batch_size: int = 256, parent: QtCore.QObject = None):
+        super().__init__(parent)
+        self.fetch_batch_size = fetch_batch_size
+        self._h5utils: H5Backend = None
+        self._lock = threading.RLock()
+        self._root_item = H5TreeItem()
+
+    def clear(self):
+        self.beginResetModel()
+        self._h5utils = None
+        self._root_item = H5TreeItem()
+        self.endResetModel()
+
+    def set_backend(self, h5utils: H5Backend, lock: threading.RLock = None):
+        """Reset the model to display the file opened in the given backend, only its root is created
+
+        Parameters
+        ----------
+        h5utils: H5Backend
+        lock: threading.RLock
+            lock protecting the access to the file if it is shared with other threads
+        """
+        self.beginResetModel()
+        self._h5utils = h5utils
+        if lock is not None:
+            self._lock = lock
+        self._root_item = H5TreeItem()
+        self._root_item.pending_names = []
+        with self._lock:
+            self._root_item.children.append(H5TreeItem(h5utils.root(), self._root_item, 0))
+        self.endResetModel()
+
+    def item_from_index(self, index: QtCore.QModelIndex) -> H5TreeItem:
+        if index.isValid():
+            return index.internalPointer()
+        return self._root_item
+
+    def index(self, row: int, column: int, parent=QtCore.QModelIndex()) -> QtCore.QModelIndex:
+        parent_item = self.item_from_index(parent)
+        if 0 <= row < len(parent_item.children) and 0 <= column < len(self.COLUMNS):
+            return self.createIndex(row, column, parent_item.children[row])
+        return QtCore.QModelIndex()
+
+    def parent(self, index: QtCore.QModelIndex) -> QtCore.QModelIndex:
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parent_item = index.internalPointer().parent
+        if parent_item is None or parent_item is self._root_item:
+            return QtCore.QModelIndex()
+        return self.createIndex(parent_item.row, 0, parent_item)
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return len(self.item_from_index(parent).children)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return len(self.COLUMNS)
+
+    def hasChildren(self, parent=QtCore.QModelIndex()) -> bool:
+        if parent.column() > 0:
+            return False
+        item = self.item_from_index(parent)
+        return len(item.children) > 0 or item.can_fetch_more()
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index: QtCore.QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item: H5TreeItem = index.internalPointer()
+        if role == Qt.DisplayRole:
+            if index.column() == 0:
+                return item.name
+            elif index.column() == 2:
+                return item.path
+            return ''
+        elif role == Qt.ToolTipRole and index.column() == 0:
+            return item.path
+        return None
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        if self._h5utils is None or parent.column() > 0:
+            return False
+        return self.item_from_index(parent).can_fetch_more()
+
+    def fetchMore(self, parent: QtCore.QModelIndex):
+        """Create the next batch of children items of the group pointed by parent"""
+        item = self.item_from_index(parent)
+        if self._h5utils is None or not item.can_fetch_more():
+            return
+        with self._lock:
+            if item.pending_names is None:
+                item.pending_names = list(item.node.children_name())
+            names = item.pending_names[:self.fetch_batch_size]
+            del item.pending_names[:self.fetch_batch_size]
+            if len(names) == 0:
+                return
+
+            first_row = len(item.children)
+            children = [H5TreeItem(self._h5utils.get_node(item.child_path(name)), item, first_row + ind)
+                        for ind, name in enumerate(names)]
+            pixmap_children = [child for child in children if child.has_pixmap]
+
+        self.beginInsertRows(parent, first_row, first_row + len(names) - 1)
+        item.children.extend(children)
+        self.endInsertRows()
+
+        pixmap_items = [dict(node=child.node, index=self.index(child.row, 1, parent))
+                        for child in pixmap_children]
+        if len(pixmap_items) > 0:
+            self.pixmap_items_fetched.emit(pixmap_items)
+
+    def fetch_all(self, parent: QtCore.QModelIndex):
+        while self.canFetchMore(parent):
+            self.fetchMore(parent)
+
+    def index_from_path(self, path: str, column: int = 0) -> QtCore.QModelIndex:
+        """Get the index of the node at path, fetching the intermediate groups if needed"""
+        index = self.index(0, 0)
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        for name in [name for name in path.split('/') if name != '']:
+            item = self.item_from_index(index)
+            child_path = item.child_path(name)
+            while True:
+                found = [child for child in item.children if child.path == child_path]
+                if len(found) > 0 or not self.canFetchMore(index):
+                    break
+                self.fetchMore(index)
+            if len(found) == 0:
+                return QtCore.QModelIndex()
+            index = self.index(found[0].row, 0, index)
+        return index.sibling(index.row(), column)
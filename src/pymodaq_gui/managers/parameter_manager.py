@@ -1,10 +1,11 @@
 import numbers
+from contextlib import contextmanager
 from pathlib import Path
 from typing import List, Union, Dict, Optional, Tuple, Any
 
 from qtpy import QtWidgets, QtCore
 from pymodaq_gui.managers.action_manager import ActionManager
-from pymodaq_gui.parameter import Parameter, ParameterTree, ioxml, utils
+from pymodaq_gui.parameter import Parameter, ParameterTree, ioxml, utils, snapshot
 from pymodaq_gui.utils.file_io import select_file
 from pymodaq_utils.config import get_set_config_dir
 
@@ -16,7 +17,7 @@ logger = set_logger(get_module_name(__file__))
 
 class ParameterTreeWidget(ActionManager):
 
-    def __init__(self, action_list: tuple = ('save', 'update', 'load')):
+    def __init__(self, action_list: tuple = ('save', 'update', 'load'), lazy: bool = False):
         super().__init__()
 
         self.widget = QtWidgets.QWidget()
@@ -24,7 +25,7 @@ class ParameterTreeWidget(ActionManager):
 
         toolbar = QtWidgets.QToolBar()
         self.set_toolbar(toolbar)
-        self.tree: ParameterTree = ParameterTree()
+        self.tree: ParameterTree = ParameterTree(lazy=lazy)
 
         self.widget.header = self.tree.header  # for back-compatibility, widget behave a bit like a ParameterTree
         self.widget.listAllItems = self.tree.listAllItems  # for back-compatibility
@@ -80,9 +81,17 @@ class ParameterManager:
         widget Holding a ParameterTree and a toolbar for interacting with the tree
     tree: ParameterTree
         the underlying ParameterTree
+    coalesce_changes: bool
+        if True, the changes of the settings are dispatched at the next iteration of the event loop,
+        the value changes of a given parameter being collapsed into a single call to value_changed
+    lazy_tree: bool
+        if True, the items and widgets of the tree are only created when their parent group is first
+        expanded or scrolled into view (see ParameterTree)
     """
     settings_name = 'custom_settings'
     params = []
+    coalesce_changes = False
+    lazy_tree = False
 
     def __init__(self, settings_name: Optional[str] = None,
                  action_list: tuple = ('save', 'update', 'load'),
@@ -92,8 +101,15 @@ class ParameterManager:
         # create a settings tree to be shown eventually in a dock
         # object containing the settings defined in the preamble
         # create a settings tree to be shown eventually in a dock
-        self._settings_tree = ParameterTreeWidget(action_list)
-        
+        self._settings_tree = ParameterTreeWidget(action_list, lazy=self.lazy_tree)
+
+        self._batch_depth = 0
+        self._pending_changes = []
+        self._dispatch_timer = QtCore.QTimer()
+        self._dispatch_timer.setSingleShot(True)
+        self._dispatch_timer.setInterval(0)
+        self._dispatch_timer.timeout.connect(self.dispatch_pending_changes)
+
         self._settings_tree.get_action(f'save_settings').connect_to(self.save_settings_slot)
         self._settings_tree.get_action(f'update_settings').connect_to(self.update_settings_slot)
         self._settings_tree.get_action(f'load_settings').connect_to(self.load_settings_slot)
@@ -119,9 +135,21 @@ class ParameterManager:
     def settings(self, settings: Union[Parameter, List[Dict[str, str]], Path]):
         settings = self.create_parameter(settings)
         self._settings = settings
+        self._settings_index = utils.ParameterIndex(settings)
+        self._settings_hasher = utils.ParameterHasher(settings)
         self.tree.setParameters(self._settings, showTop=False)  # load the tree with this parameter object
         self._settings.sigTreeStateChanged.connect(self.parameter_tree_changed)
 
+    @property
+    def settings_index(self) -> utils.ParameterIndex:
+        """Index of the settings children by path, name and type, kept up to date with the tree changes"""
+        return self._settings_index
+
+    @property
+    def settings_hasher(self) -> utils.ParameterHasher:
+        """Cached structure and values hashes of the settings, kept up to date with the tree changes"""
+        return self._settings_hasher
+
     @staticmethod
     def create_parameter(settings: Union[Parameter, List[Dict[str, str]], Path]) -> Parameter:
 
@@ -130,9 +158,13 @@ class ParameterManager:
                                          children=settings, showTop=False)
         elif isinstance(settings, Path) or isinstance(settings, str):
             settings = Path(settings)
+            if settings.suffix == f'.{snapshot.SNAPSHOT_EXTENSION}':
+                children = snapshot.snapshot_from_file(settings).to_parameter_dicts()
+            else:
+                children = ioxml.XML_file_to_parameter(str(settings))
             _settings = Parameter.create(title='Settings', name='settings',
                                          type='group', showTop=False,
-                                         children=ioxml.XML_file_to_parameter(str(settings)))
+                                         children=children)
         elif isinstance(settings, Parameter):
             _settings = Parameter.create(title='Settings', name=settings.name(),
                                          type='group', showTop=False)
@@ -141,14 +173,63 @@ class ParameterManager:
             raise TypeError(f'Cannot create Parameter object from {settings}')
         return _settings
 
+    @contextmanager
+    def batch_update(self):
+        """Context manager to change many values of the settings with a single dispatch of the changes
+
+        The changes done within the context are dispatched when leaving it (the outermost one if
+        nested): value_changed is called once per modified parameter, then values_changed once with
+        all the new values. The tree is not repainted meanwhile.
+
+        Examples
+        --------
+        >>> with self.batch_update():
+        >>>     for name, value in preset.items():
+        >>>         self.settings.child(name).setValue(value)
+        """
+        self._batch_depth += 1
+        updates_enabled = self.tree.updatesEnabled()
+        self.tree.setUpdatesEnabled(False)
+        try:
+            with self._settings.treeChangeBlocker():
+                yield self._settings
+        finally:
+            self._batch_depth -= 1
+            self.tree.setUpdatesEnabled(updates_enabled)
+
     def parameter_tree_changed(self, param, changes):
+        self._settings_index.apply_changes(changes)
+        self._settings_hasher.apply_changes(changes)
+        if self._batch_depth > 0:
+            changes = self._pending_changes + changes
+            self._pending_changes = []
+            self._dispatch_changes(changes, coalesce=True)
+        elif self.coalesce_changes:
+            self._pending_changes.extend(changes)
+            if not self._dispatch_timer.isActive():
+                self._dispatch_timer.start()
+        else:
+            self._dispatch_changes(changes, coalesce=False)
+
+    def dispatch_pending_changes(self):
+        """Dispatch now the changes waiting for the next iteration of the event loop (coalesce_changes
+        mode)"""
+        self._dispatch_timer.stop()
+        changes = self._pending_changes
+        self._pending_changes = []
+        self._dispatch_changes(changes, coalesce=True)
+
+    def _dispatch_changes(self, changes: List[Tuple[Parameter, str, Any]], coalesce=False):
+        values = dict()
         for param, change, data in changes:
-            path = self._settings.childPath(param)
             if change == 'childAdded':
                 self.child_added(param, data)
 
             elif change == 'value':
-                self.value_changed(param)
+                if not coalesce:
+                    self.value_changed(param)
+                values.pop(param, None)  # ordered by last change
+                values[param] = data
 
             elif change == 'parent':
                 self.param_deleted(param)
@@ -159,6 +240,12 @@ class ParameterManager:
             elif change == 'limits':
                 self.limits_changed(param, data)
 
+        if coalesce:
+            for param in values:
+                self.value_changed(param)
+        if len(values) > 0:
+            self.values_changed(values)
+
     def value_changed(self, param: Parameter):
         """Non-mandatory method  to be subclassed for actions to perform (methods to call) when one of the param's
         value in self._settings is changed
@@ -179,6 +266,20 @@ class ParameterManager:
         """
         ...
 
+    def values_changed(self, values: Dict[Parameter, Any]):
+        """Non-mandatory method to be subclassed for actions to perform once all the value changes
+        dispatched together have been handled by value_changed
+
+        The changes are dispatched together when emitted together by the settings, when done within
+        a batch_update context or when coalesce_changes is True
+
+        Parameters
+        ----------
+        values: dict
+            the parameters whose value changed and their new value, ordered by last change
+        """
+        pass
+
     def child_added(self, param: Parameter, data: Parameter):
         """Non-mandatory method to be subclassed for actions to perform when a param has been
         added in the attribute settings
@@ -241,7 +342,7 @@ class ParameterManager:
         pass
 
 
-    def save_settings_slot(self, file_path: Path = None):
+    def save_settings_slot(self, file_path: Path = None, with_structure=True):
         """ Method to save the current settings using a xml file extension.
 
         The starting directory is the user config folder with a subfolder called settings folder
@@ -249,18 +350,26 @@ class ParameterManager:
         Parameters
         ----------
         file_path: Path
-            Path like object pointing to a xml file encoding a Parameter object
+            Path like object pointing to a xml file encoding a Parameter object, or to a compact
+            binary snapshot file (see the parameter.snapshot module) if its extension is
+            snapshot.SNAPSHOT_EXTENSION
             If None, opens a file explorer window to save manually a file
+        with_structure: bool
+            for snapshot files only, if False only the values are saved (to be used with
+            update_settings_slot)
         """
         if file_path is None or file_path is False:
             file_path = select_file(get_set_config_dir('settings', user=True), save=True, ext='xml', filter='*.xml',
                                     force_save_extension=True)
         else:
             file_path = Path(file_path)
-            if '.xml' != file_path.suffix:
+            if file_path.suffix not in ('.xml', f'.{snapshot.SNAPSHOT_EXTENSION}'):
                 return
         if file_path:
-            ioxml.parameter_to_xml_file(self.settings, file_path.resolve())
+            if file_path.suffix == f'.{snapshot.SNAPSHOT_EXTENSION}':
+                snapshot.parameter_to_snapshot_file(self.settings, file_path.resolve(), with_structure)
+            else:
+                ioxml.parameter_to_xml_file(self.settings, file_path.resolve())
             logger.info(f'The settings have been successfully saved at {file_path}')
 
     def _get_settings_from_file(self):
@@ -294,15 +403,24 @@ class ParameterManager:
         Parameters
         ----------
         file_path: Path
-            Path like object pointing to a xml file encoding a Parameter object
+            Path like object pointing to a xml file encoding a Parameter object, or to a snapshot
+            file (possibly value-only) whose values are then set in place
             If None, opens a file explorer window to pick manually a file
         """
         if file_path is None or file_path is False:
             file_path = self._get_settings_from_file()
-        if file_path:
+        if file_path and Path(file_path).suffix == f'.{snapshot.SNAPSHOT_EXTENSION}':
+            _snapshot = snapshot.snapshot_from_file(file_path)
+            if _snapshot.matches(self.settings):  # the structure hashes are compared, nothing else is parsed
+                with self.batch_update():
+                    _snapshot.apply(self.settings, check=False)
+                logger.info(f'The settings from {file_path} have been successfully applied')
+            else:
+                logger.info(f'The loaded settings from {file_path} do not match the current settings structure and cannot be applied.')
+        elif file_path:
             _settings = self.create_parameter(file_path.resolve())
             # Checking if both parameters have the same structure
-            sameStruct = utils.compareStructureParameter(self.settings,_settings)
+            sameStruct = self.settings_hasher.structure_hash() == utils.ParameterHasher(_settings).structure_hash()
             if sameStruct:  # Update if true
                 self.settings = _settings
                 logger.info(f'The settings from {file_path} have been successfully applied')                            
@@ -439,6 +439,7 @@ class ROIManager(QObject):
              'header': ["LO", "Value"]},
             ROIScalableGroup(roi_type=self.ROI_type, name="ROIs")]
         self.settings = Parameter.create(title='ROIs Settings', name='rois_settings', type='group', children=params)
+        self.settings_index = putils.ParameterIndex(self.settings)
         self.roitree.setParameters(self.settings, showTop=False)
         self.settings.sigTreeStateChanged.connect(self.roi_tree_changed)
 
@@ -448,12 +449,8 @@ class ROIManager(QObject):
 
     def roi_tree_changed(self, param, changes):
 
+        self.settings_index.apply_changes(changes)
         for param, change, data in changes:
-            path = self.settings.childPath(param)
-            if path is not None:
-                childName = '.'.join(path)
-            else:
-                childName = param.name()
             if change == 'childAdded':  # new roi to create
                 par: Parameter = data[0]
                 newindex = int(par.name()[-2:])
@@ -505,8 +502,9 @@ class ROIManager(QObject):
                 self.roi_changed.emit()
 
             elif change == 'value':
-                if param.name() in putils.iter_children(self.settings.child('ROIs'), []):
-                    parent_name = putils.get_param_path(param)[putils.get_param_path(param).index('ROIs')+1]
+                path = self.settings_index.get_path(param)
+                if path is not None and len(path) > 1 and path[0] == 'ROIs':
+                    parent_name = path[1]
                     self.update_roi(parent_name, param)
                     self.roi_value_changed.emit(parent_name, (param, param.value()))
                 if param.name() == 'Color':
@@ -615,7 +613,7 @@ class ROIManager(QObject):
                 QtWidgets.QApplication.processEvents()
 
                 for param in params:
-                    if 'roi_type' in putils.iter_children(param, []):
+                    if 'roi_type' in putils.iter_params(param, output_type='name'):
                         self.settings.child('ROIs').addNew(param.child('roi_type').value())
                     else:
                         self.settings.child('ROIs').addNew()
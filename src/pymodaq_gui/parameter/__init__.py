@@ -1,13 +1,124 @@
-from qtpy import QtWidgets
+from functools import partial
+from typing import Dict
 
-from pyqtgraph.parametertree import parameterTypes, Parameter, ParameterTree
-from . import pymodaq_ptypes
+from qtpy import QtWidgets, QtCore
+
+from pyqtgraph.parametertree import parameterTypes, Parameter, ParameterTree, ParameterItem
 
 
 class ParameterTree(ParameterTree):
-    def __init__(self, *args, **kwargs):
+    """ParameterTree with an interactive header and an optional lazy creation of the items
+
+    Parameters
+    ----------
+    lazy: bool
+        if True, the items (hence the widgets) of the children of a group are only created when the
+        group is first expanded or, for groups expanded by default, when it is scrolled into view.
+        Only the items of the top level parameters are created by setParameters.
+    """
+    def __init__(self, *args, lazy: bool = False, **kwargs):
         super().__init__(*args, **kwargs)
 
         self.header().setVisible(True)
         self.header().setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
         #self.header().setMinimumSectionSize(150)
+
+        self.lazy = lazy
+        self._pending_items: Dict[ParameterItem, int] = dict()  # item: depth of its children
+
+        self._populate_timer = QtCore.QTimer(self)
+        self._populate_timer.setSingleShot(True)
+        self._populate_timer.setInterval(0)
+        self._populate_timer.timeout.connect(self.populate_visible)
+        self.itemExpanded.connect(self.populate)
+        self.verticalScrollBar().valueChanged.connect(self._schedule_populate)
+
+    def addParameters(self, param, root=None, depth=0, showTop=True):
+        if not self.lazy:
+            return super().addParameters(param, root, depth, showTop)
+        is_top = root is None
+        if is_top:
+            root = self.invisibleRootItem()
+        item = self._add_item(param, root, depth, hidden_top=is_top and not showTop)
+        if is_top:
+            self.populate(item)
+            self._schedule_populate()
+
+    def _add_item(self, param: Parameter, parent_item: QtWidgets.QTreeWidgetItem, depth: int,
+                  pos: int = None, hidden_top=False) -> ParameterItem:
+        """Create the item of param, its children being pending until populate is called"""
+        item = param.makeTreeItem(depth=depth)
+        if hidden_top:
+            item.setText(0, '')
+            item.setSizeHint(0, QtCore.QSize(1, 1))
+            item.setSizeHint(1, QtCore.QSize(1, 1))
+            depth -= 1
+        if len(param.children()) > 0:
+            item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+        if pos is None:
+            parent_item.addChild(item)
+        else:
+            parent_item.insertChild(pos, item)
+        item.treeWidgetChanged()
+        if len(param.children()) > 0:  # after treeWidgetChanged as its expansion should not populate item
+            self._pending_items[item] = depth + 1
+
+        # children added to the parameter are handled by the tree so that their own children are lazy too
+        param.sigChildAdded.disconnect(item.childAdded)
+        param.sigChildAdded.connect(partial(self._child_added, item, depth + 1))
+        return item
+
+    def _child_added(self, item: ParameterItem, depth: int, param: Parameter, child: Parameter, pos: int):
+        if item.treeWidget() is not self:
+            return
+        if item in self._pending_items:  # will be created with its siblings
+            return
+        self._add_item(child, item, depth, pos=pos)
+        self._schedule_populate()
+
+    def is_pending(self, item: ParameterItem) -> bool:
+        """True if the children items of item have not been created yet"""
+        return item in self._pending_items
+
+    def populate(self, item: ParameterItem):
+        """Create the items of the children of a pending item"""
+        if item not in self._pending_items:
+            return
+        depth = self._pending_items.pop(item)
+        if item.treeWidget() is not self:
+            return
+        item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.DontShowIndicatorWhenChildless)
+        for child in item.param:
+            self._add_item(child, item, depth)
+        if item.param.opts.get('expanded', True):
+            item.setExpanded(True)
+
+    def populate_visible(self):
+        """Populate the pending groups expanded by default and lying in the viewport"""
+        viewport = self.viewport().rect()
+        populated = True
+        while populated:
+            populated = False
+            for item in list(self._pending_items):
+                if item.treeWidget() is not self:
+                    del self._pending_items[item]
+                elif item.param.opts.get('expanded', True) and not item.isHidden() and \
+                        self.visualItemRect(item).intersects(viewport):
+                    self.populate(item)
+                    populated = True
+
+    def _schedule_populate(self, *args):
+        if len(self._pending_items) > 0:
+            self._populate_timer.start()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_populate()
+
+    def clear(self):
+        self._pending_items = dict()
+        super().clear()
+
+
+# imported once ParameterTree is defined as the ptypes import (indirectly) the managers using it
+from . import pymodaq_ptypes
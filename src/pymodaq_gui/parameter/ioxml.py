@@ -1,9 +1,11 @@
-from typing import Union
-from pathlib import Path
-
+import ast
+import base64
 import importlib
 import json
+from dataclasses import dataclass
+from io import BytesIO
 from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Union
 from xml.etree import ElementTree as ET
 from collections import OrderedDict
 from qtpy import QtGui
@@ -13,6 +15,342 @@ from pymodaq_gui.parameter import Parameter
 from pyqtgraph.parametertree.Parameter import PARAM_TYPES, PARAM_NAMES
 
 
+SAFE_CALLS = dict(OrderedDict=OrderedDict, dict=dict, list=list, tuple=tuple, set=set, range=range,
+                  str=str, int=int, float=float, bool=bool)
+"""Callables allowed in the values and options written as python expressions in XML files"""
+
+_MISSING = object()
+
+
+def _eval_node(node: ast.AST):
+    if isinstance(node, ast.Call):
+        if isinstance(node.func, ast.Name) and node.func.id in SAFE_CALLS and len(node.keywords) == 0:
+            return SAFE_CALLS[node.func.id](*[_eval_node(arg) for arg in node.args])
+        raise ValueError(f'Unsupported call in expression: {ast.dump(node.func)}')
+    elif isinstance(node, ast.List):
+        return [_eval_node(elt) for elt in node.elts]
+    elif isinstance(node, ast.Tuple):
+        return tuple([_eval_node(elt) for elt in node.elts])
+    elif isinstance(node, ast.Set):
+        return set([_eval_node(elt) for elt in node.elts])
+    elif isinstance(node, ast.Dict):
+        return {_eval_node(key): _eval_node(value) for key, value in zip(node.keys, node.values)}
+    return ast.literal_eval(node)
+
+
+def _reject_constant(constant: str):
+    raise ValueError(f'{constant} is not a python literal')
+
+
+_json_decoder = json.JSONDecoder(parse_constant=_reject_constant)
+_JSON_CASTS = dict(str=str, int=int, float=float)  # the type wrapping of the values of list parameters
+_JSON_STARTS = set('[{\'"-0123456789')
+
+
+def _is_json_compatible(text: str) -> bool:
+    """True if text (the repr of a python value) decodes as JSON to the same value
+
+    JSON constants (true, false, null) are not python literals: texts containing them, alone or
+    within a list or dict, are left to the python literal parser (the slower path is then also used
+    for strings containing these words)
+    """
+    if text[:1] not in _JSON_STARTS:
+        return False
+    return not any([constant in text for constant in ('true', 'false', 'null')])
+
+
+def literal_from_text(text: str):
+    """Get back a value written in a XML file as its python representation, without using eval
+
+    The representation of lists and dicts of strings and numbers is decoded as JSON (much faster),
+    other values are parsed as python literals which may contain calls to the SAFE_CALLS, for
+    instance OrderedDict([('a', 1)]) or str('a')
+
+    Raises
+    ------
+    ValueError if the text is not such a representation
+    """
+    if '"' not in text and '\\' not in text:
+        # repr of strings without quote nor special characters: can be decoded as JSON strings
+        cast = None
+        inner = text
+        if text.endswith(')'):
+            cast_name, _, inner = text[:-1].partition('(')
+            cast = _JSON_CASTS.get(cast_name, None)
+        if (cast is not None or inner is text) and _is_json_compatible(inner):
+            try:
+                value = _json_decoder.decode(inner.replace("'", '"'))
+                return cast(value) if cast is not None else value
+            except ValueError:
+                pass
+    try:
+        return _eval_node(ast.parse(text.strip(), mode='eval').body)
+    except (SyntaxError, TypeError, MemoryError, RecursionError) as e:
+        raise ValueError(f'{text} is not a valid literal: {e}')
+
+
+def encode_flag(value) -> str:
+    return '1' if value else '0'
+
+
+def decode_flag(text: str) -> bool:
+    return bool(int(text))
+
+
+def encode_str(elt: ET.Element, value) -> str:
+    return str(value)
+
+
+def decode_text(elt: ET.Element, text: str):
+    return text
+
+
+def encode_bool(elt: ET.Element, value) -> str:
+    return encode_flag(value)
+
+
+def decode_bool(elt: ET.Element, text: str) -> bool:
+    return decode_flag(text)
+
+
+def encode_int(elt: ET.Element, value) -> str:
+    if value is True:  # known bug is True should be clearly specified here
+        value = 1
+    return str(value)
+
+
+def decode_int(elt: ET.Element, text: str) -> int:
+    return int(float(text))
+
+
+def decode_float(elt: ET.Element, text: str) -> float:
+    return float(text)
+
+
+ITEMSELECT_RANGES = False
+"""If True, large selections of itemselect parameters are written as index ranges. Off by default as
+files written this way cannot be read by pymodaq_gui versions not knowing the selection attribute"""
+
+ITEMSELECT_RANGES_MIN = 64
+"""Minimum number of selected items for the selection of itemselect parameters to be written as index ranges"""
+
+
+def encode_index_ranges(indices: Iterable[int]) -> str:
+    """Write indices as comma separated ranges of consecutive ones, for instance '0-3,7,5-6'"""
+    ranges = []
+    for index in indices:
+        if len(ranges) > 0 and index == ranges[-1][1] + 1:
+            ranges[-1][1] = index
+        else:
+            ranges.append([index, index])
+    return ','.join([f'{start}-{stop}' if stop > start else f'{start}' for start, stop in ranges])
+
+
+def decode_index_ranges(text: str) -> list:
+    indices = []
+    for index_range in text.split(','):
+        start, _, stop = index_range.partition('-')
+        indices.extend(range(int(start), int(stop if stop != '' else start) + 1))
+    return indices
+
+
+def encode_itemselect(elt: ET.Element, value) -> str:
+    """The items are written in the all_items attribute, the selection as the text: the list of the
+    selected items or, for large selections and if ITEMSELECT_RANGES is set, the ranges of their
+    indexes (with a selection='ranges' attribute). Ranges are always decoded."""
+    if value is None:
+        return str(None)
+    elt.set('all_items', str(value['all_items']))
+    selected = value['selected']
+    if ITEMSELECT_RANGES and len(selected) >= ITEMSELECT_RANGES_MIN:
+        rows = {item: row for row, item in enumerate(value['all_items'])}
+        if all([item in rows for item in selected]):
+            elt.set('selection', 'ranges')
+            return encode_index_ranges([rows[item] for item in selected])
+    return str(selected)
+
+
+def decode_itemselect(elt: ET.Element, text: str) -> dict:
+    if text == 'None':
+        return dict(all_items=[], selected=[])
+    all_items = literal_from_text(elt.get('all_items', text))
+    if elt.get('selection', None) == 'ranges':
+        return dict(all_items=all_items, selected=[all_items[index] for index in decode_index_ranges(text)])
+    return dict(all_items=all_items, selected=literal_from_text(text))
+
+
+def encode_color(elt: ET.Element, value: QtGui.QColor) -> str:
+    return str([value.red(), value.green(), value.blue(), value.alpha()])
+
+
+def decode_color(elt: ET.Element, text: str) -> QtGui.QColor:
+    return QtGui.QColor(*literal_from_text(text))
+
+
+def encode_list(elt: ET.Element, value) -> str:
+    if isinstance(value, str):
+        return "str('{}')".format(value)
+    elif isinstance(value, int):
+        return 'int({})'.format(value)
+    elif isinstance(value, float):
+        return 'float({})'.format(value)
+    return str(value)
+
+
+def decode_list(elt: ET.Element, text: str):
+    try:
+        return literal_from_text(text)
+    except ValueError:
+        return text  # for back compatibility
+
+
+def encode_date_time(elt: ET.Element, value: QDateTime) -> str:
+    return str(value.toMSecsSinceEpoch())
+
+
+def decode_date_time(elt: ET.Element, text: str) -> QDateTime:
+    return QDateTime.fromMSecsSinceEpoch(int(text))
+
+
+def encode_date(elt: ET.Element, value) -> str:
+    return str(QDateTime(value, QTime()).toMSecsSinceEpoch())
+
+
+def decode_date(elt: ET.Element, text: str):
+    return QDateTime.fromMSecsSinceEpoch(int(text)).date()
+
+
+def decode_literal(elt: ET.Element, text: str):
+    return literal_from_text(text)
+
+
+def encode_table_view(elt: ET.Element, value) -> str:
+    """Table models are written as JSON, their data as a list of rows or, for models having a
+    to_npy_bytes method (see ArrayTableModel), as base64 encoded npy bytes"""
+    try:
+        data = dict(classname=value.__class__.__name__,
+                    module=value.__class__.__module__)
+        if hasattr(value, 'to_npy_bytes'):
+            data['npy'] = base64.b64encode(value.to_npy_bytes()).decode()
+        else:
+            data['data'] = value.get_data_all()
+        data['header'] = value.header
+        return json.dumps(data)
+    except Exception:
+        return ''
+
+
+def decode_table_view(elt: ET.Element, text: str):
+    data_dict = json.loads(text)
+    mod = importlib.import_module(data_dict['module'])
+    _cls = getattr(mod, data_dict['classname'])
+    if 'npy' in data_dict:
+        return _cls(_cls.array_from_npy_bytes(base64.b64decode(data_dict['npy'])), header=data_dict['header'])
+    return _cls(data_dict['data'], header=data_dict['header'])
+
+
+def decode_action(elt: ET.Element, text: str):
+    if text == 'None':
+        return None
+    return literal_from_text(text)
+
+
+@dataclass(frozen=True)
+class ValueCodec:
+    """Conversion of the values of a parameter type into the text of a XML element and back
+
+    encode is called with the element and the value and returns the text, it may also set some
+    attributes of the element. decode is called with the element and its (not None) text. empty is
+    the value of the elements without text (an empty string is written as such), if any.
+    """
+    encode: Callable[[ET.Element, Any], str] = encode_str
+    decode: Callable[[ET.Element, str], Any] = decode_text
+    empty: Any = _MISSING
+
+
+DEFAULT_CODEC = ValueCodec()
+BOOL_CODEC = ValueCodec(encode_bool, decode_bool)
+
+VALUE_CODECS: Dict[str, ValueCodec] = {
+    'str': ValueCodec(empty=''),
+    'text': ValueCodec(empty=''),
+    'browsepath': ValueCodec(empty=''),
+    'float': ValueCodec(decode=decode_float),
+    'slide': ValueCodec(decode=decode_float),
+    'int': ValueCodec(encode_int, decode_int),
+    'itemselect': ValueCodec(encode_itemselect, decode_itemselect),
+    'color': ValueCodec(encode_color, decode_color),
+    'list': ValueCodec(encode_list, decode_list),
+    'date_time': ValueCodec(encode_date_time, decode_date_time),
+    'date': ValueCodec(encode_date, decode_date),
+    'table': ValueCodec(decode=decode_literal),
+    'table_view': ValueCodec(encode_table_view, decode_table_view),
+    'action': ValueCodec(decode=decode_action),
+}
+
+_resolved_codecs: Dict[str, ValueCodec] = dict()
+
+
+def register_value_codec(param_type: str, encode: Callable[[ET.Element, Any], str] = encode_str,
+                         decode: Callable[[ET.Element, str], Any] = decode_text, empty: Any = _MISSING):
+    """Register how the values of a (custom) parameter type are written in XML files and read back"""
+    VALUE_CODECS[param_type] = ValueCodec(encode, decode, empty)
+    _resolved_codecs.clear()
+
+
+def get_value_codec(param_type: str) -> ValueCodec:
+    """Get the codec of a parameter type, resolved once per type
+
+    Types without a registered codec containing 'bool' or 'led' (bool_push, led_push...) are
+    handled as booleans, the others as strings.
+    """
+    codec = _resolved_codecs.get(param_type, None)
+    if codec is None:
+        codec = VALUE_CODECS.get(param_type, None)
+        if codec is None:
+            codec = BOOL_CODEC if 'bool' in param_type or 'led' in param_type else DEFAULT_CODEC
+        _resolved_codecs[param_type] = codec
+    return codec
+
+
+def decode_limits(text: str):
+    try:
+        return literal_from_text(text)
+    except ValueError:
+        return _MISSING
+
+
+ATTRIBUTE_ENCODERS = (
+    # option name, encoder, default text if the option is missing (None: no attribute)
+    ('visible', encode_flag, '1'),
+    ('removable', encode_flag, '1'),
+    ('readonly', encode_flag, '0'),
+    ('limits', str, None),
+    ('addList', str, None),
+    ('addText', str, None),
+    ('detlist', str, None),
+    ('movelist', str, None),
+    ('label', str, None),
+    ('show_pb', encode_flag, None),
+    ('filetype', encode_flag, None),
+)
+
+ATTRIBUTE_DECODERS = (
+    # attribute name, decoder (returning _MISSING to skip the option), default if the attribute is missing
+    ('visible', decode_flag, True),
+    ('removable', decode_flag, False),
+    ('readonly', decode_flag, False),
+    ('show_pb', decode_flag, False),
+    ('filetype', decode_flag, _MISSING),
+    ('detlist', literal_from_text, _MISSING),
+    ('movelist', literal_from_text, _MISSING),
+    ('addList', literal_from_text, _MISSING),
+    ('addText', str, _MISSING),
+    ('label', str, _MISSING),
+    ('limits', decode_limits, _MISSING),
+)
+
+
 def walk_parameters_to_xml(parent_elt=None, param=None):
     """
         To convert a parameter object (and children) to xml data tree.
@@ -40,14 +378,14 @@ def walk_parameters_to_xml(parent_elt=None, param=None):
 
     if parent_elt is None:
         opts = dict_from_param(param)
-        parent_elt = ET.Element(param.name(), **opts)
+        parent_elt = ET.Element(param.name(), opts)
         if 'value' in param.opts:
             add_text_to_elt(parent_elt, param)
 
     params_list = param.children()
     for param in params_list:
         opts = dict_from_param(param)
-        elt = ET.Element(param.name(), **opts)
+        elt = ET.Element(param.name(), opts)
         if param.hasChildren():
             walk_parameters_to_xml(elt, param)
         if 'value' in param.opts:
@@ -57,10 +395,11 @@ def walk_parameters_to_xml(parent_elt=None, param=None):
 
     return parent_elt
 
-
 def add_text_to_elt(elt, param):
     """Add a text filed in a xml element corresponding to the parameter value
 
+    The conversion is done by the codec registered for the parameter type, see get_value_codec
+
     Parameters
     ----------
     elt: XML elt
@@ -70,52 +409,7 @@ def add_text_to_elt(elt, param):
     --------
     add_text_to_elt, walk_parameters_to_xml, dict_from_param
     """
-    param_type = str(param.type())
-    if 'bool' in param_type or 'led' in param_type:
-        if param.value():
-            text = '1'
-        else:
-            text = '0'
-    elif param_type == 'itemselect':
-        if param.value() is not None:
-            elt.set('all_items',
-                    str(param.value()['all_items']))  # use list(eval(val_str[1:-1])) to get back a list of strings
-            text = str(param.value()['selected'])  # use list(eval(val_str[1:-1])) to get back a list of strings
-        else:
-            text = str(None)
-    elif param_type == 'color':
-        text = str([param.value().red(), param.value().green(), param.value().blue(), param.value().alpha()])
-    elif param_type == 'list':
-        if isinstance(param.value(), str):
-            text = "str('{}')".format(param.value())
-        elif isinstance(param.value(), int):
-            text = 'int({})'.format(param.value())
-        elif isinstance(param.value(), float):
-            text = 'float({})'.format(param.value())
-        else:
-            text = str(param.value())
-    elif param_type == 'int':
-        if param.value() is True:  # known bug is True should be clearly specified here
-            val = 1
-        else:
-            val = param.value()
-        text = str(val)
-    elif param_type == 'date_time':
-        text = str(param.value().toMSecsSinceEpoch())
-    elif param_type == 'date':
-        text = str(QDateTime(param.value(), QTime()).toMSecsSinceEpoch())
-    elif param_type == 'table_view':
-        try:
-            data = dict(classname=param.value().__class__.__name__,
-                        module=param.value().__class__.__module__,
-                        data=param.value().get_data_all(),
-                        header=param.value().header)
-            text = json.dumps(data)
-        except Exception:
-            text = ''
-    else:
-        text = str(param.value())
-    elt.text = text
+    elt.text = get_value_codec(str(param.type())).encode(elt, param.value())
 
 
 def dict_from_param(param):
@@ -133,82 +427,14 @@ def dict_from_param(param):
     --------
     add_text_to_elt, walk_parameters_to_xml, dict_from_param
     """
-    opts = dict([])
-    param_type = str(param.type())
-    opts.update(dict(type=param_type))
-    title = param.opts['title']
-    if title is None:
-        title = param.name()
-    opts.update(dict(title=title))
-
-    visible = '1'
-    if 'visible' in param.opts:
-        if param.opts['visible']:
-            visible = '1'
-        else:
-            visible = '0'
-
-    opts.update(dict(visible=visible))
-
-    removable = '1'
-    if 'removable' in param.opts:
-        if param.opts['removable']:
-            removable = '1'
-        else:
-            removable = '0'
-    opts.update(dict(removable=removable))
-
-    readonly = '0'
-    if 'readonly' in param.opts:
-        if param.opts['readonly']:
-            readonly = '1'
-        else:
-            readonly = '0'
-    opts.update(dict(readonly=readonly))
-
-    # if 'limits' in param.opts:
-    #     values = str(param.opts['limits'])
-    #     opts.update(dict(values=values))
-
-    if 'limits' in param.opts:
-        limits = str(param.opts['limits'])
-        opts.update(dict(limits=limits))
-        # opts.update(dict(values=limits))
-
-    if 'addList' in param.opts:
-        addList = str(param.opts['addList'])
-        opts.update(dict(addList=addList))
-
-    if 'addText' in param.opts:
-        addText = str(param.opts['addText'])
-        opts.update(dict(addText=addText))
-
-    if 'detlist' in param.opts:
-        detlist = str(param.opts['detlist'])
-        opts.update(dict(detlist=detlist))
-
-    if 'movelist' in param.opts:
-        movelist = str(param.opts['movelist'])
-        opts.update(dict(movelist=movelist))
-
-    if 'label' in param.opts:
-        label = str(param.opts['label'])
-        opts.update(dict(label=label))
-
-    if 'show_pb' in param.opts:
-        if param.opts['show_pb']:
-            show_pb = '1'
-        else:
-            show_pb = '0'
-        opts.update(dict(show_pb=show_pb))
-
-    if 'filetype' in param.opts:
-        if param.opts['filetype']:
-            filetype = '1'
-        else:
-            filetype = '0'
-        opts.update(dict(filetype=filetype))
-
+    param_opts = param.opts
+    title = param_opts['title']
+    opts = dict(type=str(param.type()), title=title if title is not None else param.name())
+    for key, encode, default in ATTRIBUTE_ENCODERS:
+        if key in param_opts:
+            opts[key] = encode(param_opts[key])
+        elif default is not None:
+            opts[key] = default
     return opts
 
 
@@ -223,82 +449,14 @@ def elt_to_dict(el):
     -------
 
     """
-    param = dict([])
-
-    # name=el.tag, title=title, type=param_type, value=param_value, values=[param_value],
-    #              visible=visible, removable=removable, readonly=readonly, show_pb=show_pb)
-    param.update(dict(name=el.tag))
-    param_type = el.get('type')
-    param.update(dict(type=param_type))
-
-    title = el.get('title')
-    if title == 'None':
-        title = el.tag
-    param.update(dict(title=title))
-
-    if 'visible' not in el.attrib.keys():
-        visible = True
-    else:
-        visible = bool(int(el.get('visible')))
-    param.update(dict(visible=visible))
-
-    if 'removable' not in el.attrib.keys():
-        removable = False
-    else:
-        removable = bool(int(el.get('removable')))
-    param.update(dict(removable=removable))
-
-    if 'readonly' not in el.attrib.keys():
-        readonly = False
-    else:
-        readonly = bool(int(el.get('readonly')))
-    param.update(dict(readonly=readonly))
-
-    if 'show_pb' in el.attrib.keys():
-        show_pb = bool(int(el.get('show_pb')))
-    else:
-        show_pb = False
-    param.update(dict(show_pb=show_pb))
-
-    if 'filetype' in el.attrib.keys():
-        filetype = bool(int(el.get('filetype')))
-        param.update(dict(filetype=filetype))
-
-    if 'detlist' in el.attrib.keys():
-        detlist = eval(el.get('detlist'))
-        param.update(dict(detlist=detlist))
-
-    if 'movelist' in el.attrib.keys():
-        movelist = eval(el.get('movelist'))
-        param.update(dict(movelist=movelist))
-
-    if 'addList' in el.attrib.keys():
-        addList = eval(el.get('addList'))
-        param.update(dict(addList=addList))
-
-    if 'addText' in el.attrib.keys():
-        addText = str(el.get('addText'))
-        param.update(dict(addText=addText))
-
-    if 'label' in el.attrib.keys():
-        label = str(el.get('label'))
-        param.update(dict(label=label))
-
-    # if 'limits' in el.attrib.keys():
-    #     try:
-    #         values = list(eval(el.get('limits')))  # make sure the evaluated values are returned as list (in case another
-    #     # iterator type has been used
-    #         param.update(dict(values=values))
-    #     except:
-    #         pass
-
-    if 'limits' in el.attrib.keys():
-        try:
-            limits = eval(el.get('limits'))
-            param.update(dict(limits=limits))
-        except:
-            pass
-
+    attrib = el.attrib
+    title = attrib.get('title')
+    param = dict(name=el.tag, type=attrib.get('type'), title=title if title != 'None' else el.tag)
+    for key, decode, default in ATTRIBUTE_DECODERS:
+        text = attrib.get(key, None)
+        value = decode(text) if text is not None else default
+        if value is not _MISSING:
+            param[key] = value
     return param
 
 
@@ -361,7 +519,7 @@ def parameter_to_xml_file(param, filename: Union[str, Path], overwrite=True):
     tree.write(str(fname))
 
 
-def walk_xml_to_parameter(params=[], XML_elt=None):
+def walk_xml_to_parameter(params=None, XML_elt=None):
     """ To convert an XML element (and children) to list of dict enabling creation of parameter object.
 
         =============== ================== =======================================
@@ -390,6 +548,8 @@ def walk_xml_to_parameter(params=[], XML_elt=None):
         --------
         walk_parameters_to_xml
     """
+    if params is None:
+        params = []
     try:
         if type(XML_elt) is not ET.Element:
             raise TypeError('not valid XML element')
@@ -424,7 +584,6 @@ def set_dict_from_el(el):
     param_dict = elt_to_dict(el)
     set_txt_from_elt(el, param_dict)  
     return param_dict          
-
 def set_txt_from_elt(el, param_dict):
     """
     get the value of the parameter from the text value of the xml element
@@ -435,56 +594,81 @@ def set_txt_from_elt(el, param_dict):
 
     """
     val_text = el.text
-    param_type = param_dict['type']
-    # param_type = el.get('type') # Redundancy (param_dict already has this attribute)
+    codec = get_value_codec(param_dict['type'])
     if val_text is not None:
-        if param_type == 'float':
-            param_value = float(val_text)
-        elif param_type == 'int':
-            param_value = int(float(val_text))
-        elif param_type == 'slide':
-            param_value = float(val_text)
-        elif param_type == 'itemselect':
-            if val_text == 'None':
-                param_value = dict(all_items=[], selected=[])
-            else:
-                param_value = dict(all_items=eval(el.get('all_items', val_text)), selected=eval(val_text))
-        elif 'bool' in param_type or 'led' in param_type: # covers 'bool' 'bool_push',  'led' and 'led_push'types
-            param_value = bool(int(val_text))
-        elif param_type == 'date_time':
-            param_value = QDateTime.fromMSecsSinceEpoch(int(val_text))
-        elif param_type == 'date':
-            param_value = QDateTime.fromMSecsSinceEpoch(int(val_text)).date()
-        elif param_type == 'table':
-            param_value = eval(val_text)
-        elif param_type == 'color':
-            param_value = QtGui.QColor(*eval(val_text))
-        elif param_type == 'list':
-            try:
-                param_value = eval(val_text)
-            except Exception:
-                param_value = val_text  # for back compatibility
-        elif param_type == 'table_view':
-            data_dict = json.loads(val_text)
-            mod = importlib.import_module(data_dict['module'])
-            _cls = getattr(mod, data_dict['classname'])
-            param_value = _cls(data_dict['data'], header=data_dict['header'])
-        elif param_type == 'action':
-            if val_text == 'None':
-                param_value = None
-            else:
-                param_value = eval(val_text)
-        else:
-            param_value = val_text
-        param_dict.update(dict(value=param_value))
-    else:
-        if param_type == 'str':
-            param_dict.update(dict(value=''))
+        param_dict['value'] = codec.decode(el, val_text)
+    elif codec.empty is not _MISSING:
+        param_dict['value'] = codec.empty
+
+
+def iterparse_to_parameter(source: BinaryIO, path: Iterable[str] = None) -> list:
+    """Convert a XML stream into a list of dict to init a Parameter, in a single pass
 
+    The elements are parsed incrementally (ElementTree.iterparse) and freed as soon as their dict
+    has been built, so that the memory used does not depend on the size of the whole document.
+    The output is the same as the one of walk_xml_to_parameter applied on the root element (or on
+    the element at path)
 
-def XML_file_to_parameter(file_name: Union[str, Path]) -> list:
+    Parameters
+    ----------
+    source: file object
+        the binary stream of the XML document
+    path: iterable of str
+        the names of the elements leading to the subtree to load, relative to the root (as used by
+        Parameter.child(*path)). The whole document is loaded if None. The parsing stops at the
+        end of the subtree.
+
+    Returns
+    -------
+    params: a parameter list of dict to init a parameter
+
+    Raises
+    ------
+    KeyError if there is no element at path
+    """
+    target = list(path) if path is not None else []
+    target_level = len(target)
+    level = -1
+    tags = []
+    inside = []  # for each opened element, True if it is (or is under) the target element
+    children = []  # the dicts of the children of the opened elements of the target subtree
+    for event, el in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            level += 1
+            if level > 0:
+                tags.append(el.tag)
+            is_inside = level >= target_level and (level == 0 or inside[-1] or tags == target)
+            inside.append(is_inside)
+            if is_inside:
+                children.append([])
+        else:
+            if inside.pop():
+                el_children = children.pop()
+                if level > target_level:
+                    param_dict = set_dict_from_el(el)
+                    if param_dict['type'] not in PARAM_TYPES:
+                        param_dict['type'] = 'group'  # in case the custom group has been defined
+                        # somewhere but not registered again in this session
+                    param_dict['children'] = el_children
+                    children[-1].append(param_dict)
+                else:
+                    return el_children if len(el) > 0 else [set_dict_from_el(el)]
+            el.clear()
+            level -= 1
+            if level >= 0:
+                tags.pop()
+    raise KeyError(f'No element at path {target}')
+
+
+def XML_file_to_parameter(file_name: Union[str, Path], path: Iterable[str] = None) -> list:
     """ Convert a xml file into pyqtgraph parameter object.
 
+    Parameters
+    ----------
+    file_name: str or Path
+    path: iterable of str
+        the path of the subtree to load (relative to the root), the whole file if None
+
     Returns
     -------
     params : list of dictionary
@@ -492,19 +676,16 @@ def XML_file_to_parameter(file_name: Union[str, Path]) -> list:
 
     See Also
     --------
-    walk_parameters_to_xml
+    walk_parameters_to_xml, iterparse_to_parameter
 
     Examples
     --------
     """
-    tree = ET.parse(str(file_name))
-
-    root = tree.getroot()
-    params = walk_xml_to_parameter(params=[], XML_elt=root)
-    return params
+    with open(str(file_name), 'rb') as f:
+        return iterparse_to_parameter(f, path)
 
 
-def XML_string_to_parameter(xml_string):
+def XML_string_to_parameter(xml_string, path: Iterable[str] = None):
     """
         Convert a xml string into a list of dict for initialize pyqtgraph parameter object.
 
@@ -512,6 +693,8 @@ def XML_string_to_parameter(xml_string):
         **Parameters**   **Type**    **Description**
 
         xml_string       string      the xml string to be converted
+        path             iterable    the path of the subtree to load (relative to the root),
+                                     the whole tree if None
         =============== =========== ================================
 
         Returns
@@ -520,18 +703,14 @@ def XML_string_to_parameter(xml_string):
 
         See Also
         --------
-        walk_parameters_to_xml
+        walk_parameters_to_xml, iterparse_to_parameter
 
         Examples
         --------
     """
-    root = ET.fromstring(xml_string)
-    tree = ET.ElementTree(root)
-
-    # tree.write('test.xml')
-    params = walk_xml_to_parameter(params=[], XML_elt=root)
-
-    return params
+    if isinstance(xml_string, str):
+        xml_string = xml_string.encode()
+    return iterparse_to_parameter(BytesIO(xml_string), path)
 
 
 def XML_string_to_pobject(xml_string) -> Parameter:
@@ -7,15 +7,23 @@ from pyqtgraph.parametertree import Parameter
 
 
 class ItemSelect_pb(QtWidgets.QWidget):
-    def __init__(self,checkbox=False,):
+    def __init__(self, checkbox=False, lazy=False):
 
         super(ItemSelect_pb, self).__init__()
-        self.initUI(checkbox,)
+        self.initUI(checkbox, lazy)
 
-    def initUI(self, checkbox=False,):        
+    def initUI(self, checkbox=False, lazy=False):
         #### Widgets ###        
-        # ListWidget
-        self.itemselect = ItemSelect(checkbox)
+        # ListWidget (or model/view based list with a filter for thousands of items)
+        self.filter_edit = None
+        if lazy:
+            self.itemselect = ItemSelectView(checkbox)
+            self.filter_edit = QtWidgets.QLineEdit()
+            self.filter_edit.setPlaceholderText('Filter...')
+            self.filter_edit.setClearButtonEnabled(True)
+            self.filter_edit.textChanged.connect(self.itemselect.set_filter)
+        else:
+            self.itemselect = ItemSelect(checkbox)
         # Pushbutton Add
         self.add_pb = QtWidgets.QPushButton()
         self.add_pb.setText("")
@@ -35,7 +43,14 @@ class ItemSelect_pb(QtWidgets.QWidget):
         self.ver_layout.setSpacing(0)
                 
         self.hor_layout = QtWidgets.QHBoxLayout()        
-        self.hor_layout.addWidget(self.itemselect)
+        if self.filter_edit is not None:
+            list_layout = QtWidgets.QVBoxLayout()
+            list_layout.addWidget(self.filter_edit)
+            list_layout.addWidget(self.itemselect)
+            list_layout.setSpacing(0)
+            self.hor_layout.addLayout(list_layout)
+        else:
+            self.hor_layout.addWidget(self.itemselect)
         self.hor_layout.addLayout(self.ver_layout)
         
         self.hor_layout.setSpacing(0)
@@ -85,6 +100,10 @@ class ItemSelect(QtWidgets.QListWidget):
             
         return dict(all_items=allitems, selected=selitems)
 
+    def selected_texts(self) -> list:
+        """The texts of the highlighted items (not the checked ones)"""
+        return [item.text() for item in self.selectedItems()]
+
     def all_items(self) -> list:
         """
             Get the all_items list from the self QtWidget attribute.
@@ -151,6 +170,209 @@ class ItemSelect(QtWidgets.QListWidget):
         return QtCore.QSize(super().sizeHint().width(), 25 * self.count())
 
 
+class ItemSelectModel(QtCore.QAbstractListModel):
+    """Model of a list of (string) items among which some are selected
+
+    The selection is stored as an insertion ordered dict (keeping the selection order) so that
+    membership tests are O(1), the rows of the items are indexed by text.
+
+    Parameters
+    ----------
+    checkable: bool
+        if True, the selection is shown (and can be changed) as check boxes
+    """
+    selection_changed = QtCore.Signal()
+
+    def __init__(self, checkable=False, parent=None):
+        super().__init__(parent)
+        self.checkable = checkable
+        self._items: list = []
+        self._rows: dict = dict()
+        self._selected: dict = dict()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if index.isValid():
+            if role == QtCore.Qt.DisplayRole:
+                return self._items[index.row()]
+            elif role == QtCore.Qt.CheckStateRole and self.checkable:
+                return QtCore.Qt.Checked if self._items[index.row()] in self._selected else QtCore.Qt.Unchecked
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if self.checkable:
+            flags |= QtCore.Qt.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if index.isValid() and role == QtCore.Qt.CheckStateRole and self.checkable:
+            self.select([self._items[index.row()]], value == QtCore.Qt.Checked or value == 2)
+            return True
+        return False
+
+    @property
+    def items(self) -> list:
+        return self._items
+
+    def row(self, item: str) -> int:
+        """Row of an item, -1 if not in the list"""
+        return self._rows.get(item, -1)
+
+    def is_selected(self, item: str) -> bool:
+        return item in self._selected
+
+    def selected(self) -> list:
+        """The selected items, in the selection order"""
+        return list(self._selected)
+
+    def selected_rows(self) -> list:
+        return [self._rows[item] for item in self._selected]
+
+    def get_value(self) -> dict:
+        return dict(all_items=list(self._items), selected=list(self._selected))
+
+    def set_value(self, values: dict):
+        """Set the items and the selection (selected items not in all_items are ignored)"""
+        all_items = list(values['all_items'])
+        if all_items != self._items:
+            self.beginResetModel()
+            self._items = all_items
+            self._rows = {item: row for row, item in enumerate(all_items)}
+            self._selected = dict()
+            self.endResetModel()
+        self.set_selected(values['selected'])
+
+    def set_selected(self, items):
+        """Replace the selection, keeping the order of items"""
+        selected = dict.fromkeys([item for item in items if item in self._rows])
+        if list(selected) == list(self._selected):
+            return
+        changed = [self._rows[item] for item in selected.keys() ^ self._selected.keys()]
+        self._selected = selected
+        self._emit_changed(changed)
+
+    def select(self, items, do_select=True):
+        """Add items at the end of the selection (or remove them from the selection)"""
+        changed = []
+        for item in items:
+            if item in self._rows and (item in self._selected) != do_select:
+                if do_select:
+                    self._selected[item] = None
+                else:
+                    del self._selected[item]
+                changed.append(self._rows[item])
+        self._emit_changed(changed)
+
+    def _emit_changed(self, rows):
+        if len(rows) == 0:
+            return
+        if self.checkable:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)), [QtCore.Qt.CheckStateRole])
+        self.selection_changed.emit()
+
+    def search(self, text: str, case_sensitive=False) -> list:
+        """The items containing text"""
+        if case_sensitive:
+            return [item for item in self._items if text in item]
+        text = text.lower()
+        return [item for item in self._items if text in item.lower()]
+
+
+class ItemSelectView(QtWidgets.QListView):
+    """Model/view version of ItemSelect for lists of thousands of items
+
+    Only the visible rows are rendered (uniform item sizes) and no widget item is created per entry.
+    The items can be filtered (see set_filter) without modifying the selection. The value is the same
+    dict(all_items=..., selected=...) as ItemSelect.
+
+    Parameters
+    ----------
+    hasCheckbox: bool
+        if True items are selected by checking them, otherwise by selecting them in the view
+    """
+
+    def __init__(self, hasCheckbox=True):
+        super().__init__()
+        self.hasCheckbox = hasCheckbox
+        self.item_model = ItemSelectModel(checkable=hasCheckbox, parent=self)
+        self.proxy_model = QtCore.QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.item_model)
+        self.proxy_model.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self.setModel(self.proxy_model)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QtWidgets.QListView.Batched)
+        self.sigChanged = self.item_model.selection_changed
+        self._syncing = False
+        self.selectionModel().selectionChanged.connect(self._view_selection_changed)
+        self.doubleClicked.connect(self.doubleClickSelection)
+
+    def doubleClickSelection(self, index: QtCore.QModelIndex):
+        if self.hasCheckbox:
+            item = self.item_model.items[self.proxy_model.mapToSource(index).row()]
+            self.item_model.select([item], not self.item_model.is_selected(item))
+
+    def set_filter(self, text: str):
+        """Only show the items containing text (case insensitive), the selection being unchanged"""
+        self._syncing = True  # the hidden rows are removed from the view selection, not from the model one
+        try:
+            self.proxy_model.setFilterFixedString(text)
+        finally:
+            self._syncing = False
+        self._update_view_selection()
+
+    def search(self, text: str) -> list:
+        return self.item_model.search(text)
+
+    def get_value(self) -> dict:
+        return self.item_model.get_value()
+
+    def set_value(self, values: dict):
+        self.item_model.set_value(values)
+        self._update_view_selection()
+
+    def all_items(self) -> list:
+        return self.item_model.items
+
+    def select_item(self, item: str, doSelect: bool = False):
+        self.item_model.select([item], doSelect)
+        self._update_view_selection()
+
+    def selected_texts(self) -> list:
+        """The texts of the highlighted items (not the checked ones)"""
+        return [self.item_model.items[self.proxy_model.mapToSource(index).row()]
+                for index in self.selectionModel().selectedRows()]
+
+    def _view_selection_changed(self, selected: QtCore.QItemSelection, deselected: QtCore.QItemSelection):
+        if self.hasCheckbox or self._syncing:
+            return
+        items = self.item_model.items
+        self.item_model.select([items[index.row()] for index in
+                                self.proxy_model.mapSelectionToSource(deselected).indexes()], False)
+        self.item_model.select([items[index.row()] for index in
+                                self.proxy_model.mapSelectionToSource(selected).indexes()], True)
+
+    def _update_view_selection(self):
+        """Highlight the selected items (when there is no check box)"""
+        if self.hasCheckbox:
+            return
+        selection = QtCore.QItemSelection()
+        rows = sorted(self.item_model.selected_rows())
+        start = 0
+        for ind in range(1, len(rows) + 1):
+            if ind == len(rows) or rows[ind] != rows[ind - 1] + 1:
+                selection.select(self.item_model.index(rows[start]), self.item_model.index(rows[ind - 1]))
+                start = ind
+        self._syncing = True
+        try:
+            self.selectionModel().select(self.proxy_model.mapSelectionFromSource(selection),
+                                         QtCore.QItemSelectionModel.ClearAndSelect)
+        finally:
+            self._syncing = False
+
+
 class ItemSelectParameterItem(WidgetParameterItem):
     
     def makeWidget(self):
@@ -163,7 +385,10 @@ class ItemSelectParameterItem(WidgetParameterItem):
         self.hideWidget = False
         opts = self.param.opts
         
-        if 'checkbox' in opts and opts['checkbox']:
+        if opts.get('lazy', False):
+            w = ItemSelect_pb(checkbox=opts.get('checkbox', False), lazy=True)
+            w.sigChanged = w.itemselect.sigChanged
+        elif 'checkbox' in opts and opts['checkbox']:
             w = ItemSelect_pb(checkbox=opts['checkbox'])
             w.sigChanged = w.itemselect.itemChanged
         else:
@@ -171,7 +396,7 @@ class ItemSelectParameterItem(WidgetParameterItem):
             w.sigChanged = w.itemselect.itemSelectionChanged
 
             
-        if 'dragdrop' in opts and opts['dragdrop']:        
+        if 'dragdrop' in opts and opts['dragdrop'] and not opts.get('lazy', False):
             w.itemselect.setDragDropMode(QtWidgets.QAbstractItemView.InternalMove)
 
         w.itemselect.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
@@ -214,15 +439,10 @@ class ItemSelectParameterItem(WidgetParameterItem):
         """
            Remove the selected Qwidget items by removing the entries in the parameter attribute.
         """                       
-        items_to_be_removed = self.widget.itemselect.selectedItems()
+        items_to_be_removed = set(self.widget.itemselect.selected_texts())
         if len(items_to_be_removed) > 0:
-            all = self.param.value()['all_items']
-            sel = self.param.value()['selected'] 
-            for item in items_to_be_removed:
-                if item.text() in all:
-                    all.remove(item.text())
-                    if item.text() in sel:
-                        sel.remove(item.text())
+            all = [item for item in self.param.value()['all_items'] if item not in items_to_be_removed]
+            sel = [item for item in self.param.value()['selected'] if item not in items_to_be_removed]
             val = dict(all_items=all, selected=sel)
             self.param.setValue(val)
             self.param.sigValueChanged.emit(self.param, val)            
@@ -249,7 +469,13 @@ class ItemSelectParameterItem(WidgetParameterItem):
 
 class ItemSelectParameter(Parameter):
     """
-        Editable string; displayed as large text box in the tree.
+        Selection among a list of items; its value is a dict with all_items and selected keys.
+
+        By default the items are shown in a QListWidget (ItemSelect) and the selection is handled
+        through lists: membership tests and selection updates are O(n) in the number of items. Only
+        with the lazy option (True) are the items shown in a model/view list with a filter
+        (ItemSelectView) whose selection is backed by a dict, giving O(1) membership tests: use it
+        for thousands of items. Options: checkbox, dragdrop (not with lazy), lazy.
 
         =============== ======================================
         **Attributes**    **Type**
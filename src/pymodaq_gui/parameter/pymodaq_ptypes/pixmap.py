@@ -71,12 +71,12 @@ class PixmapCheckWidget(QtWidgets.QWidget):
         self.layout().addWidget(ver_widget)
 
     def setValue(self, data: PixmapCheckData):
+        """Set the value, the pixmap is only converted again if the image data changed"""
+        if self._data is None or not np.array_equal(self._data.data, data.data):
+            im = QtGui.QImage(data.data, *data.data.shape, QtGui.QImage.Format_Indexed8)
+            a = QtGui.QPixmap.fromImage(im)
 
-
-        im = QtGui.QImage(data.data, *data.data.shape, QtGui.QImage.Format_Indexed8)
-        a = QtGui.QPixmap.fromImage(im)
-
-        self.label.setPixmap(a)
+            self.label.setPixmap(a)
         self.checkbox.setChecked(data.checked)
         self.info_label.setText(data.info)
         self._data = data
@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Compact binary snapshots of Parameter trees, an alternative to the XML files of ioxml
+
+A snapshot holds the typed values of all the parameters of a tree (depth first, parents before
+their children) and a hash of its structure (names, types and depths of the parameters). It may also
+hold the structure itself (the XML attributes of the parameters), in which case it can be converted
+back into a Parameter or into the XML written by ioxml. Snapshots without structure (value-only) are
+applied to a tree of the same structure without parsing anything else than the values.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+from pyqtgraph.parametertree.Parameter import PARAM_TYPES
+from pymodaq_utils.serialize.factory import SerializableFactory, SerializableBase
+
+from pymodaq_gui.parameter import Parameter, ioxml
+from pymodaq_gui.parameter.utils import ser_factory
+
+
+SNAPSHOT_EXTENSION = 'psnap'
+MAGIC = b'PMQS'
+VERSION = 1
+FLAG_STRUCTURE = 0x01
+
+_header = struct.Struct('<4sBB20s')
+_count = struct.Struct('<I')
+_entry = struct.Struct('<HBIB')  # depth, has_value, name index, number of attributes
+_attribute = struct.Struct('<II')  # key index, value index
+_tag = struct.Struct('<B')
+_int = struct.Struct('<q')
+_float = struct.Struct('<d')
+
+# value tags
+TAG_NONE, TAG_FALSE, TAG_TRUE, TAG_INT, TAG_FLOAT, TAG_STR, TAG_CODEC = range(7)
+
+INT_MIN = -2 ** 63
+INT_MAX = 2 ** 63 - 1
+
+
+@dataclass
+class StructureEntry:
+    """A parameter of the structure of a snapshot
+
+    attributes are the XML attributes of the parameter (see ioxml.dict_from_param), has_value tells
+    if the XML element has a text (the value)
+    """
+    depth: int
+    name: str
+    attributes: dict
+    has_value: bool
+
+    @property
+    def param_type(self) -> str:
+        return self.attributes.get('type', 'None')
+
+
+def iter_with_depth(param: Parameter, depth: int = 0) -> Iterator[Tuple[int, Parameter]]:
+    """Iterate over a parameter and all its children (depth first) together with their depth"""
+    yield depth, param
+    for child in param.children():
+        yield from iter_with_depth(child, depth + 1)
+
+
+def iter_elements_with_depth(elt: ioxml.ET.Element, depth: int = 0) -> Iterator[Tuple[int, ioxml.ET.Element]]:
+    """Iterate over a XML element and all its children (depth first) together with their depth"""
+    yield depth, elt
+    for child in elt:
+        yield from iter_elements_with_depth(child, depth + 1)
+
+
+def structure_hash(items: Iterator[Tuple[int, str, str]]) -> bytes:
+    """Digest of a structure given as (depth, name, type) items, depth first
+
+    The name of the root (depth 0) is not part of the structure, as the settings are often renamed
+    when loaded
+    """
+    digest = hashlib.sha1()
+    for depth, name, param_type in items:
+        digest.update(f'{depth}\x00{name if depth > 0 else ""}\x00{param_type}\n'.encode())
+    return digest.digest()
+
+
+def get_structure_hash(param: Parameter) -> bytes:
+    """Digest of the names, types and depths of a parameter and of its children"""
+    return structure_hash((depth, child.name(), str(child.type()))
+                          for depth, child in iter_with_depth(param))
+
+
+def _pack_str(string: str) -> bytes:
+    encoded = string.encode()
+    return _count.pack(len(encoded)) + encoded
+
+
+def _unpack_str(buffer: bytes, offset: int) -> Tuple[str, int]:
+    length, = _count.unpack_from(buffer, offset)
+    offset += _count.size
+    return bytes(buffer[offset:offset + length]).decode(), offset + length
+
+
+def pack_value(value: Any, param_type: str) -> bytes:
+    """Typed binary encoding of a value
+
+    None, booleans, 64 bits integers, floats and strings are encoded as such, other values (colors,
+    dates, dicts...) as the XML text and attributes written by the ioxml codec of the parameter type
+    """
+    if value is None:
+        return _tag.pack(TAG_NONE)
+    elif isinstance(value, bool):
+        return _tag.pack(TAG_TRUE if value else TAG_FALSE)
+    elif isinstance(value, int) and INT_MIN <= value <= INT_MAX:
+        return _tag.pack(TAG_INT) + _int.pack(value)
+    elif isinstance(value, float):
+        return _tag.pack(TAG_FLOAT) + _float.pack(value)
+    elif isinstance(value, str):
+        return _tag.pack(TAG_STR) + _pack_str(value)
+    elt = ioxml.ET.Element('value')
+    text = ioxml.get_value_codec(param_type).encode(elt, value)
+    return (_tag.pack(TAG_CODEC) + _pack_str(param_type) + _pack_str(text) +
+            _pack_str(json.dumps(elt.attrib)))
+
+
+def unpack_value(buffer: bytes, offset: int) -> Tuple[Any, str, int]:
+    """Decode a value encoded with pack_value
+
+    Returns
+    -------
+    object: the value
+    str: the parameter type used to encode the value if not handled natively, an empty string otherwise
+    int: the offset of the next value in buffer
+    """
+    tag, = _tag.unpack_from(buffer, offset)
+    offset += _tag.size
+    if tag == TAG_NONE:
+        return None, '', offset
+    elif tag in (TAG_FALSE, TAG_TRUE):
+        return tag == TAG_TRUE, '', offset
+    elif tag == TAG_INT:
+        return _int.unpack_from(buffer, offset)[0], '', offset + _int.size
+    elif tag == TAG_FLOAT:
+        return _float.unpack_from(buffer, offset)[0], '', offset + _float.size
+    elif tag == TAG_STR:
+        value, offset = _unpack_str(buffer, offset)
+        return value, '', offset
+    elif tag == TAG_CODEC:
+        param_type, offset = _unpack_str(buffer, offset)
+        text, offset = _unpack_str(buffer, offset)
+        attributes, offset = _unpack_str(buffer, offset)
+        elt = ioxml.ET.Element('value', json.loads(attributes))
+        return ioxml.get_value_codec(param_type).decode(elt, text), param_type, offset
+    raise ValueError(f'Invalid value tag in snapshot: {tag}')
+
+
+@SerializableFactory.register_decorator()
+class ParameterSnapshot(SerializableBase):
+    """ The values (and optionally the structure) of a Parameter tree
+
+    Parameters
+    ----------
+    digest: bytes
+        the structure hash of the tree, see get_structure_hash
+    values: list
+        the values of all the parameters of the tree, depth first (None for those without value)
+    structure: List[StructureEntry]
+        the parameters of the tree, depth first, if None the snapshot is value-only
+    param_types: List[str]
+        the types of the parameters, used to encode the values not handled natively (taken from the
+        structure if any)
+    """
+    def __init__(self, digest: bytes, values: List[Any], structure: List[StructureEntry] = None,
+                 param_types: List[str] = None):
+        super().__init__()
+        self._digest = bytes(digest)
+        self._values = list(values)
+        self._structure = list(structure) if structure is not None else None
+        if self._structure is not None:
+            param_types = [entry.param_type for entry in self._structure]
+        self._param_types = list(param_types) if param_types is not None else [''] * len(self._values)
+
+    @property
+    def digest(self) -> bytes:
+        return self._digest
+
+    @property
+    def values(self) -> List[Any]:
+        return self._values
+
+    @property
+    def structure(self) -> Optional[List[StructureEntry]]:
+        return self._structure
+
+    @property
+    def param_types(self) -> List[str]:
+        return self._param_types
+
+    @classmethod
+    def from_parameter(cls, param: Parameter, with_structure=True) -> ParameterSnapshot:
+        values = []
+        param_types = []
+        structure = [] if with_structure else None
+        for depth, child in iter_with_depth(param):
+            has_value = 'value' in child.opts
+            values.append(child.value() if has_value else None)
+            param_types.append(str(child.type()))
+            if with_structure:
+                structure.append(StructureEntry(depth, child.name(), ioxml.dict_from_param(child), has_value))
+        return cls(get_structure_hash(param), values, structure, param_types)
+
+    @classmethod
+    def from_xml(cls, xml_string: Union[str, bytes]) -> ParameterSnapshot:
+        """Create a snapshot (with its structure) from the XML of a Parameter (see
+        ioxml.parameter_to_xml_string)"""
+        values = []
+        structure = []
+        for depth, elt in iter_elements_with_depth(ioxml.ET.fromstring(xml_string)):
+            codec = ioxml.get_value_codec(elt.get('type', 'None'))
+            if elt.text is not None:
+                value = codec.decode(elt, elt.text)
+            else:
+                value = codec.empty if codec.empty is not ioxml._MISSING else None
+            has_value = elt.text is not None or codec.empty is not ioxml._MISSING
+            values.append(value)
+            structure.append(StructureEntry(depth, elt.tag, dict(elt.attrib), has_value))
+        return cls(structure_hash((entry.depth, entry.name, entry.param_type) for entry in structure),
+                   values, structure)
+
+    @property
+    def has_structure(self) -> bool:
+        return self.structure is not None
+
+    def value_only(self) -> ParameterSnapshot:
+        return ParameterSnapshot(self.digest, self.values, param_types=self.param_types)
+
+    def matches(self, param: Parameter) -> bool:
+        """True if the snapshot has been taken from a tree of the same structure as param"""
+        return get_structure_hash(param) == self.digest
+
+    def apply(self, param: Parameter, check=True) -> Parameter:
+        """Set the values of the snapshot to param (and its children), the change signals being
+        emitted once all values are set
+
+        Raises
+        ------
+        ValueError if the structure of param is not the one of the snapshot
+        """
+        if check and not self.matches(param):
+            raise ValueError(f'The snapshot does not match the structure of {param.name()}')
+        with param.treeChangeBlocker():
+            for (_, child), value in zip(iter_with_depth(param), self.values):
+                if 'value' in child.opts and child.type() != 'group':
+                    child.setValue(value)
+        return param
+
+    def _check_structure(self):
+        if not self.has_structure:
+            raise ValueError('The snapshot is value-only and has no structure')
+
+    def to_parameter_dicts(self) -> list:
+        """Convert the snapshot into a list of dict (the children of the root), as
+        ioxml.XML_string_to_parameter"""
+        self._check_structure()
+        stack = []  # the children lists of the parents of the current entry
+        root_dict = None
+        for entry, value in zip(self.structure, self.values):
+            param_dict = ioxml.elt_to_dict(ioxml.ET.Element(entry.name, entry.attributes))
+            if entry.has_value:
+                param_dict['value'] = value
+            if entry.depth == 0:
+                root_dict = param_dict
+            else:
+                if param_dict['type'] not in PARAM_TYPES:
+                    param_dict['type'] = 'group'
+                del stack[entry.depth:]
+                stack[-1].append(param_dict)
+            param_dict['children'] = []
+            stack.append(param_dict['children'])
+        if root_dict is None:
+            return []
+        elif len(root_dict['children']) == 0:
+            root_dict.pop('children')
+            return [root_dict]
+        return root_dict['children']
+
+    def to_parameter(self) -> Parameter:
+        """Create a Parameter from the snapshot, as ioxml.XML_string_to_pobject"""
+        return Parameter.create(name='settings', type='group', children=self.to_parameter_dicts())
+
+    def to_element(self) -> ioxml.ET.Element:
+        """Convert the snapshot into a XML element, as ioxml.walk_parameters_to_xml"""
+        self._check_structure()
+        stack = []
+        for entry, value in zip(self.structure, self.values):
+            elt = ioxml.ET.Element(entry.name, entry.attributes)
+            if entry.has_value:
+                elt.text = ioxml.get_value_codec(entry.param_type).encode(elt, value)
+            del stack[entry.depth:]
+            if len(stack) > 0:
+                stack[-1].append(elt)
+            stack.append(elt)
+        return stack[0]
+
+    def to_xml(self) -> bytes:
+        """Convert the snapshot into the XML string written by ioxml.parameter_to_xml_string"""
+        return ioxml.ET.tostring(self.to_element())
+
+    def to_bytes(self) -> bytes:
+        """Binary representation of the snapshot, see from_bytes"""
+        chunks = [_header.pack(MAGIC, VERSION, FLAG_STRUCTURE if self.has_structure else 0,
+                                            self.digest)]
+        if self.has_structure:
+            # names and attributes are mostly repeated strings: stored once in a table, then as indexes
+            strings = dict()
+            entries = []
+            for entry in self.structure:
+                entries.append(_entry.pack(entry.depth, entry.has_value, strings.setdefault(entry.name, len(strings)),
+                                           len(entry.attributes)))
+                for key, value in entry.attributes.items():
+                    entries.append(_attribute.pack(strings.setdefault(key, len(strings)),
+                                                   strings.setdefault(value, len(strings))))
+            chunks.append(_count.pack(len(strings)))
+            chunks.extend([_pack_str(string) for string in strings])
+            chunks.append(_count.pack(len(self.structure)))
+            chunks.extend(entries)
+        chunks.append(_count.pack(len(self.values)))
+        chunks.extend([pack_value(value, param_type) for value, param_type in zip(self.values, self.param_types)])
+        return b''.join(chunks)
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes, offset: int = 0) -> Tuple[ParameterSnapshot, int]:
+        """Decode a snapshot encoded with to_bytes, return it with the offset of the end of the
+        snapshot in buffer
+
+        Raises
+        ------
+        ValueError if buffer is not a snapshot
+        """
+        buffer = memoryview(buffer)
+        try:
+            magic, version, flags, digest = _header.unpack_from(buffer, offset)
+        except struct.error:
+            raise ValueError('Too short to be a snapshot')
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Not a snapshot or unsupported snapshot version')
+        offset += _header.size
+        structure = None
+        if flags & FLAG_STRUCTURE:
+            strings = []
+            count, = _count.unpack_from(buffer, offset)
+            offset += _count.size
+            for _ in range(count):
+                string, offset = _unpack_str(buffer, offset)
+                strings.append(string)
+            structure = []
+            count, = _count.unpack_from(buffer, offset)
+            offset += _count.size
+            for _ in range(count):
+                depth, has_value, name_index, n_attributes = _entry.unpack_from(buffer, offset)
+                offset += _entry.size
+                attributes = dict()
+                for key_index, value_index in _attribute.iter_unpack(
+                        buffer[offset:offset + n_attributes * _attribute.size]):
+                    attributes[strings[key_index]] = strings[value_index]
+                offset += n_attributes * _attribute.size
+                structure.append(StructureEntry(depth, strings[name_index], attributes, bool(has_value)))
+        count, = _count.unpack_from(buffer, offset)
+        offset += _count.size
+        values = []
+        param_types = []
+        for _ in range(count):
+            value, param_type, offset = unpack_value(buffer, offset)
+            values.append(value)
+            param_types.append(param_type)
+        return cls(digest, values, structure, param_types), offset
+
+    @staticmethod
+    def serialize(snapshot: 'ParameterSnapshot') -> bytes:
+        return ser_factory.get_apply_serializer(snapshot.to_bytes())
+
+    @classmethod
+    def deserialize(cls, bytes_str: bytes) -> Tuple[ParameterSnapshot, bytes]:
+        """Convert bytes into a ParameterSnapshot object
+
+        Returns
+        -------
+        ParameterSnapshot: the decoded object
+        bytes: the remaining bytes string if any
+        """
+        snapshot_bytes, remaining_bytes = ser_factory.get_apply_deserializer(bytes_str, False)
+        return cls.from_bytes(snapshot_bytes)[0], remaining_bytes
+
+
+def parameter_to_snapshot_file(param: Parameter, file_name: Union[str, Path], with_structure=True):
+    """Save a snapshot of param in a file, the extension being forced to SNAPSHOT_EXTENSION"""
+    file_name = Path(file_name).with_suffix(f'.{SNAPSHOT_EXTENSION}')
+    file_name.write_bytes(ParameterSnapshot.from_parameter(param, with_structure).to_bytes())
+    return file_name
+
+
+def snapshot_from_file(file_name: Union[str, Path]) -> ParameterSnapshot:
+    return ParameterSnapshot.from_bytes(Path(file_name).read_bytes())[0]
+
+
+def snapshot_file_to_xml_file(file_name: Union[str, Path], xml_file_name: Union[str, Path] = None) -> Path:
+    """Convert a snapshot file (with structure) into a XML file, next to it if xml_file_name is None"""
+    xml_file_name = Path(xml_file_name if xml_file_name is not None else file_name).with_suffix('.xml')
+    ioxml.ET.ElementTree(snapshot_from_file(file_name).to_element()).write(str(xml_file_name))
+    return xml_file_name
+
+
+def xml_file_to_snapshot_file(xml_file_name: Union[str, Path], file_name: Union[str, Path] = None) -> Path:
+    """Convert a XML file (see ioxml.parameter_to_xml_file) into a snapshot file, next to it if
+    file_name is None"""
+    file_name = Path(file_name if file_name is not None else xml_file_name).with_suffix(f'.{SNAPSHOT_EXTENSION}')
+    file_name.write_bytes(ParameterSnapshot.from_xml(Path(xml_file_name).read_bytes()).to_bytes())
+    return file_name
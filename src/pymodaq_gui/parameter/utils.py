@@ -1,6 +1,7 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, List, Tuple, Any, Union
+from typing import TYPE_CHECKING, List, Tuple, Any, Union, Dict, Iterable, Iterator, Optional
 from dataclasses import Field, fields
+import hashlib
 import numpy as np
 from collections import OrderedDict
 from dataclasses import dataclass
@@ -70,6 +71,235 @@ class ParameterWithPath(SerializableBase):
         return ParameterWithPath(param_obj, path), remaining_bytes
 
 
+def serialize_value(value: Any, param_type: str) -> bytes:
+    """Binary encoding of the value of a parameter of a given type
+
+    Values handled by the ser_factory serializers are encoded as such, the others (colors, dates,
+    OrderedDict...) are encoded as the XML text (and attributes) written by ioxml for this type
+    """
+    try:
+        return ser_factory.get_apply_serializer('raw') + ser_factory.get_apply_serializer(value)
+    except NotImplementedError:
+        elt = ioxml.ET.Element('value')
+        text = ioxml.get_value_codec(param_type).encode(elt, value)
+        return (ser_factory.get_apply_serializer('xml') + ser_factory.get_apply_serializer(text) +
+                ser_factory.get_apply_serializer(dict(elt.attrib)))
+
+
+def deserialize_value(bytes_str: bytes, param_type: str) -> Tuple[Any, bytes]:
+    """Decode a value encoded with serialize_value, return it with the remaining bytes"""
+    encoding, remaining_bytes = ser_factory.get_apply_deserializer(bytes_str, False)
+    if encoding == 'raw':
+        return ser_factory.get_apply_deserializer(remaining_bytes, False)
+    text, remaining_bytes = ser_factory.get_apply_deserializer(remaining_bytes, False)
+    attributes, remaining_bytes = ser_factory.get_apply_deserializer(remaining_bytes, False)
+    elt = ioxml.ET.Element('value', attributes)
+    return ioxml.get_value_codec(param_type).decode(elt, text), remaining_bytes
+
+
+def get_param_from_path(settings: Parameter, path: List[str]) -> Parameter:
+    """Get the child of settings from a path starting with the name of settings (see get_param_path)"""
+    return settings.child(*path[1:]) if len(path) > 1 else settings
+
+
+def parameter_dict_from_xml(xml_string: Union[str, bytes]) -> dict:
+    """Dict to create a Parameter (and its children) from its XML (see ioxml.parameter_to_xml_string)"""
+    elt = ioxml.ET.fromstring(xml_string)
+    param_dict = ioxml.set_dict_from_el(elt)
+    if param_dict['type'] not in ioxml.PARAM_TYPES:
+        param_dict['type'] = 'group'
+    param_dict['children'] = ioxml.walk_xml_to_parameter([], elt) if len(elt) > 0 else []
+    return param_dict
+
+
+@SerializableFactory.register_decorator()
+class ParameterValueUpdate(SerializableBase):
+    """ The new value of a Parameter, identified by its full path
+
+    To be used to send the changes of the values of a Parameter tree whose structure is already
+    known by the receiving side, much more compact than a ParameterWithPath
+
+    Parameters
+    ----------
+    path: List[str]
+        full path of the parameter, see get_param_path
+    value: object
+        the new value
+    param_type: str
+        the type of the parameter, used to encode the values not handled by the ser_factory
+    """
+    def __init__(self, path: List[str], value: Any, param_type: str = ''):
+        super().__init__()
+        self._path = list(path)
+        self._value = value
+        self._param_type = param_type
+
+    @classmethod
+    def from_parameter(cls, parameter: Parameter, path: List[str] = None) -> ParameterValueUpdate:
+        if path is None:
+            path = get_param_path(parameter)
+        return cls(path, parameter.value(), str(parameter.type()))
+
+    @property
+    def path(self) -> List[str]:
+        return self._path
+
+    @property
+    def value(self) -> Any:
+        return self._value
+
+    @property
+    def param_type(self) -> str:
+        return self._param_type
+
+    def apply(self, settings: Parameter) -> Parameter:
+        """Set the value of the corresponding child of settings (the root of the path)"""
+        param = get_param_from_path(settings, self.path)
+        param.setValue(self.value)
+        return param
+
+    @staticmethod
+    def serialize(update: 'ParameterValueUpdate') -> bytes:
+        bytes_string = b''
+        bytes_string += ser_factory.get_apply_serializer(update.path)
+        bytes_string += ser_factory.get_apply_serializer(update.param_type)
+        bytes_string += serialize_value(update.value, update.param_type)
+        return bytes_string
+
+    @classmethod
+    def deserialize(cls, bytes_str: bytes) -> Tuple[ParameterValueUpdate, bytes]:
+        """Convert bytes into a ParameterValueUpdate object
+
+        Returns
+        -------
+        ParameterValueUpdate: the decoded object
+        bytes: the remaining bytes string if any
+        """
+        path, remaining_bytes = ser_factory.get_apply_deserializer(bytes_str, False)
+        param_type, remaining_bytes = ser_factory.get_apply_deserializer(remaining_bytes, False)
+        value, remaining_bytes = deserialize_value(remaining_bytes, param_type)
+        return cls(path, value, param_type), remaining_bytes
+
+
+@SerializableFactory.register_decorator()
+class ParameterStructureDiff(SerializableBase):
+    """ The children added to and removed from a Parameter, identified by its full path
+
+    Added children are described by their XML (including their own children) and the position
+    where they have been inserted. Removed children are described by their name.
+
+    Parameters
+    ----------
+    path: List[str]
+        full path of the parent parameter, see get_param_path
+    added: List[Tuple[int, bytes]]
+        the position and the XML of the added children
+    removed: List[str]
+        the names of the removed children
+    """
+    def __init__(self, path: List[str], added: List[Tuple[int, bytes]] = None, removed: List[str] = None):
+        super().__init__()
+        self._path = list(path)
+        self._added = list(added) if added is not None else []
+        self._removed = list(removed) if removed is not None else []
+
+    @classmethod
+    def from_parameter(cls, parent: Parameter, added: List[Tuple[Parameter, int]] = (),
+                       removed: List[str] = (), path: List[str] = None) -> ParameterStructureDiff:
+        """Create the diff from the parent, its added children (and their positions) and the names
+        of the removed ones"""
+        if path is None:
+            path = get_param_path(parent)
+        return cls(path, [(pos, ioxml.parameter_to_xml_string(child)) for child, pos in added], removed)
+
+    @property
+    def path(self) -> List[str]:
+        return self._path
+
+    @property
+    def added(self) -> List[Tuple[int, bytes]]:
+        return self._added
+
+    @property
+    def removed(self) -> List[str]:
+        return self._removed
+
+    def apply(self, settings: Parameter) -> Parameter:
+        """Remove then insert the children of the corresponding child of settings (the root of the
+        path)"""
+        parent = get_param_from_path(settings, self.path)
+        for name in self.removed:
+            if name in parent.names:
+                parent.removeChild(parent.child(name))
+        for pos, xml_string in self.added:
+            parent.insertChild(min(pos, len(parent.children())), parameter_dict_from_xml(xml_string))
+        return parent
+
+    @staticmethod
+    def serialize(diff: 'ParameterStructureDiff') -> bytes:
+        bytes_string = b''
+        bytes_string += ser_factory.get_apply_serializer(diff.path)
+        bytes_string += ser_factory.get_apply_serializer([pos for pos, _ in diff.added])
+        bytes_string += ser_factory.get_apply_serializer([xml_string for _, xml_string in diff.added])
+        bytes_string += ser_factory.get_apply_serializer(diff.removed)
+        return bytes_string
+
+    @classmethod
+    def deserialize(cls, bytes_str: bytes) -> Tuple[ParameterStructureDiff, bytes]:
+        """Convert bytes into a ParameterStructureDiff object
+
+        Returns
+        -------
+        ParameterStructureDiff: the decoded object
+        bytes: the remaining bytes string if any
+        """
+        path, remaining_bytes = ser_factory.get_apply_deserializer(bytes_str, False)
+        positions, remaining_bytes = ser_factory.get_apply_deserializer(remaining_bytes, False)
+        xml_strings, remaining_bytes = ser_factory.get_apply_deserializer(remaining_bytes, False)
+        removed, remaining_bytes = ser_factory.get_apply_deserializer(remaining_bytes, False)
+        return cls(path, list(zip(positions, xml_strings)), removed), remaining_bytes
+
+
+ParameterUpdate = Union[ParameterValueUpdate, ParameterStructureDiff]
+
+
+def get_updates_from_changes(changes: List[Tuple[Parameter, str, Any]]) -> List[ParameterUpdate]:
+    """Convert the changes emitted by the sigTreeStateChanged signal of a Parameter into update messages
+
+    Value changes are converted into ParameterValueUpdate (only the last one of each parameter is
+    kept), consecutive childRemoved then childAdded changes of a parent into a ParameterStructureDiff.
+    Other changes (options, limits...) are ignored.
+    """
+    updates = []
+    value_updates = dict()
+    for param, change, data in changes:
+        if change == 'value':
+            update = ParameterValueUpdate.from_parameter(param)
+            key = tuple(update.path)
+            if key in value_updates:
+                updates.remove(value_updates[key])
+            value_updates[key] = update
+            updates.append(update)
+        elif change in ('childAdded', 'childRemoved'):
+            path = get_param_path(param)
+            # a diff applies its removals before its additions: only merge changes keeping this order
+            if len(updates) == 0 or not isinstance(updates[-1], ParameterStructureDiff) or \
+                    updates[-1].path != path or (change == 'childRemoved' and len(updates[-1].added) > 0):
+                updates.append(ParameterStructureDiff(path))
+            if change == 'childAdded':
+                child, pos = data
+                updates[-1].added.append((pos, ioxml.parameter_to_xml_string(child)))
+            else:
+                updates[-1].removed.append(data.name())
+    return updates
+
+
+def apply_updates(settings: Parameter, updates: List[ParameterUpdate]):
+    """Apply in place update messages (see get_updates_from_changes) to settings"""
+    for update in updates:
+        update.apply(settings)
+
+
 def get_widget_from_tree(parameter_tree, widget_instance):
     widgets = []
     for item in parameter_tree.listAllItems():
@@ -179,7 +409,7 @@ def compareValuesParameter(param1:Parameter,param2:Parameter,)-> bool:
     """    
     return getValues(param1) == getValues(param2)    
 
-def iter_children(param, childlist=[], filter_type=(), filter_name=(), select_filter=False)-> list:
+def iter_children(param, childlist=None, filter_type=(), filter_name=(), select_filter=False)-> list:
 
     """
     Get a list of parameters' name under a given Parameter (see iter_children_params)
@@ -189,10 +419,41 @@ def iter_children(param, childlist=[], filter_type=(), filter_name=(), select_fi
     list
         The list of the children name from the given node.       
     """
-    return iter_children_params(param, childlist=childlist, output_type='name', filter_type=(), filter_name=(), select_filter=False)
+    return iter_children_params(param, childlist=childlist, output_type='name', filter_type=filter_type,
+                                filter_name=filter_name, select_filter=select_filter)
+
+
+def iter_params(param: Parameter, output_type: str = None, filter_type=(), filter_name=(),
+                select_filter=False) -> Iterator:
+    """Iterate over the parameters under a given Parameter (depth first, parents before their children)
 
+    Same as iter_children_params but without building any intermediate list
 
-def iter_children_params(param, childlist=[], output_type=None, filter_type=(), filter_name=(), select_filter=False)-> list:
+    Parameters
+    ----------
+    param : Parameter (pyqtgraph)
+        the root node to be coursed
+    output_type: str
+        the method of parameter whose result will be yielded instead of the parameter (for
+        instance 'name')
+    filter_type: list
+        filter children sharing those types
+    filter_name: list
+        filter children sharing those names
+    select_filter: bool
+        if True, yield filtered parameters.
+        if False (default), yield non-filtered parameters.
+    """
+    for child in param.children():
+        is_filtered = child.type() in filter_type or child.name() in filter_name
+        if is_filtered == select_filter:
+            yield getattr(child, output_type)() if output_type is not None else child
+        if child.hasChildren():
+            yield from iter_params(child, output_type, filter_type, filter_name, select_filter)
+
+
+def iter_children_params(param, childlist=None, output_type=None, filter_type=(), filter_name=(),
+                         select_filter=False)-> list:
     """
     Get a list of parameters under a given Parameter.
 
@@ -201,7 +462,7 @@ def iter_children_params(param, childlist=[], output_type=None, filter_type=(),
     param : Parameter (pyqtgraph)
         the root node to be coursed
     childlist: list
-        the child/output list
+        the child/output list, a new list if None
     output_type: str
         the attribute of parameter that will be added to the output list
     filter_type: list
@@ -216,27 +477,255 @@ def iter_children_params(param, childlist=[], output_type=None, filter_type=(),
     -------
     list
         The list of the children from the given node.    
-    """
 
-    for child in param.children():
-        # XNOR Gate        
-        is_filtered = child.type() in filter_type or child.name() in filter_name
-        add_selected_child = select_filter and is_filtered
-        add_notselected_child = not select_filter and not is_filtered
-        if add_selected_child or add_notselected_child:            
-            if output_type is not None:            
-                try:
-                    output = getattr(child,output_type)()
-                except Exception as e:
-                    print(str(e))
-            else:                    
-                output = child
-            childlist.append(output)
-        if child.hasChildren():
-             childlist.extend(iter_children_params(child, [], output_type, filter_type, filter_name, select_filter))
+    See Also
+    --------
+    iter_params
+    """
+    if childlist is None:
+        childlist = []
+    childlist.extend(iter_params(param, output_type, filter_type, filter_name, select_filter))
     return childlist
 
 
+class ParameterIndex:
+    """Index of the descendants of a Parameter by path, name and type
+
+    The index is kept up to date by feeding it the changes emitted by the sigTreeStateChanged
+    signal of the root (see apply_changes): added children are indexed with their own children
+    (childAdded), removed ones are forgotten (parent changed to None) and renamed ones indexed
+    again (name).
+
+    Paths are tuples of names relative to the root, as used by Parameter.child(*path)
+
+    Parameters
+    ----------
+    root: Parameter
+        the parameter whose descendants are indexed
+    """
+
+    def __init__(self, root: Parameter):
+        self._root = root
+        self._by_path: Dict[Tuple[str, ...], Parameter] = dict()
+        self._paths: Dict[Parameter, Tuple[str, ...]] = dict()
+        self._by_name: Dict[str, List[Parameter]] = dict()
+        self._by_type: Dict[str, List[Parameter]] = dict()
+        self.rebuild()
+
+    @property
+    def root(self) -> Parameter:
+        return self._root
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, param: Parameter):
+        return param in self._paths
+
+    def rebuild(self):
+        """Index again all the descendants of the root"""
+        self._by_path.clear()
+        self._paths.clear()
+        self._by_name.clear()
+        self._by_type.clear()
+        for child in self._root.children():
+            self._add(child, (child.name(),))
+
+    def _add(self, param: Parameter, path: Tuple[str, ...]):
+        if param in self._paths:
+            self._remove(param)
+        self._by_path[path] = param
+        self._paths[param] = path
+        self._by_name.setdefault(path[-1], []).append(param)
+        self._by_type.setdefault(str(param.type()), []).append(param)
+        for child in param.children():
+            self._add(child, path + (child.name(),))
+
+    def _remove(self, param: Parameter):
+        path = self._paths.pop(param, None)
+        if path is None:
+            return
+        if self._by_path.get(path, None) is param:
+            del self._by_path[path]
+        for params, key in ((self._by_name, path[-1]), (self._by_type, str(param.type()))):
+            params[key].remove(param)
+            if len(params[key]) == 0:
+                del params[key]
+        for child in param.children():
+            self._remove(child)
+
+    def apply_changes(self, changes: List[Tuple[Parameter, str, Any]]):
+        """Update the index from the changes emitted by the sigTreeStateChanged signal of the root"""
+        for param, change, data in changes:
+            if change == 'childAdded':
+                parent_path = () if param is self._root else self._paths.get(param, None)
+                if parent_path is not None:
+                    child = data[0]
+                    self._add(child, parent_path + (child.name(),))
+            elif change == 'parent':
+                if data is None:
+                    self._remove(param)
+            elif change == 'name':
+                parent = param.parent()
+                parent_path = () if parent is self._root else self._paths.get(parent, None)
+                self._remove(param)
+                if parent_path is not None:
+                    self._add(param, parent_path + (param.name(),))
+
+    def get(self, path: Iterable[str]) -> Optional[Parameter]:
+        """The parameter at the given path (relative to the root), None if not existing"""
+        return self._by_path.get(tuple(path), None)
+
+    def get_path(self, param: Parameter) -> Optional[Tuple[str, ...]]:
+        """The path of a parameter relative to the root, None if not indexed"""
+        return self._paths.get(param, None)
+
+    def get_by_name(self, name: str) -> Optional[Parameter]:
+        """The first parameter (depth first, as get_param_from_name) with the given name, None if
+        not existing"""
+        params = self._by_name.get(name, [])
+        if len(params) <= 1:
+            return params[0] if len(params) == 1 else None
+        return next(param for param in iter_params(self._root) if param.name() == name)
+
+    def get_all_by_name(self, name: str) -> List[Parameter]:
+        return list(self._by_name.get(name, []))
+
+    def get_by_type(self, param_type: str) -> List[Parameter]:
+        return list(self._by_type.get(param_type, []))
+
+
+def get_value_digest(param: Parameter) -> bytes:
+    """Digest of the value of a parameter, computed from its XML text (see ioxml.get_value_codec)"""
+    elt = ioxml.ET.Element('value')
+    try:
+        text = ioxml.get_value_codec(str(param.type())).encode(elt, param.value())
+    except Exception:
+        text = repr(param.value())
+    digest = hashlib.sha1(text.encode())
+    for key, value in sorted(elt.attrib.items()):
+        digest.update(f'\x00{key}\x00{value}'.encode())
+    return digest.digest()
+
+
+class ParameterHasher:
+    """Merkle-style hashes of the structure and of the values of a Parameter tree
+
+    The hash of a parameter is computed from the names and hashes of its children (and from the
+    digest of its own value for the values hash), not from its own name, so that two trees can be
+    compared whatever the names of their roots, as compareStructureParameter and
+    compareValuesParameter do. Values are compared through their XML text (see get_value_digest).
+
+    Hashes are cached and kept up to date by feeding the hasher the changes emitted by the
+    sigTreeStateChanged signal of the root (see apply_changes): a change only invalidates the
+    hashes of the parameter and of its ancestors, which are computed again when queried.
+
+    Parameters
+    ----------
+    root: Parameter
+        the parameter whose tree is hashed
+    """
+
+    def __init__(self, root: Parameter):
+        self._root = root
+        self._hashes: Dict[Parameter, Tuple[bytes, bytes]] = dict()  # structure, values
+        self._dirty = set()
+
+    @property
+    def root(self) -> Parameter:
+        return self._root
+
+    def rebuild(self):
+        """Forget all the cached hashes"""
+        self._hashes.clear()
+        self._dirty.clear()
+
+    def invalidate(self, param: Parameter):
+        """Mark the hashes of a parameter and of its ancestors as to be computed again"""
+        while param is not None and param not in self._dirty:
+            self._dirty.add(param)
+            if param is self._root:
+                break
+            param = param.parent()
+
+    def _forget(self, param: Parameter):
+        self._hashes.pop(param, None)
+        self._dirty.discard(param)
+        for child in param.children():
+            self._forget(child)
+
+    def apply_changes(self, changes: List[Tuple[Parameter, str, Any]]):
+        """Update the hashes from the changes emitted by the sigTreeStateChanged signal of the root"""
+        for param, change, data in changes:
+            if change in ('value', 'childAdded'):
+                self.invalidate(param)
+            elif change == 'childRemoved':
+                self._forget(data)
+                self.invalidate(param)
+            elif change == 'name':
+                self.invalidate(param.parent() if param is not self._root else param)
+
+    def _get_hashes(self, param: Parameter) -> Tuple[bytes, bytes]:
+        hashes = self._hashes.get(param, None)
+        if hashes is None or param in self._dirty:
+            structure = hashlib.sha1()
+            values = hashlib.sha1(get_value_digest(param))
+            for child in param.children():
+                child_structure, child_values = self._get_hashes(child)
+                name = f'\x00{child.name()}\x00'.encode()
+                structure.update(name + child_structure)
+                values.update(name + child_values)
+            hashes = structure.digest(), values.digest()
+            self._hashes[param] = hashes
+            self._dirty.discard(param)
+        return hashes
+
+    def structure_hash(self, param: Parameter = None) -> bytes:
+        """Hash of the names of the children (and their children) of param (the root if None)"""
+        return self._get_hashes(param if param is not None else self._root)[0]
+
+    def values_hash(self, param: Parameter = None) -> bytes:
+        """Hash of the structure and of the values of param (the root if None) and its children"""
+        return self._get_hashes(param if param is not None else self._root)[1]
+
+    def diff(self, other: 'ParameterHasher', structure_only=False) -> List[Tuple[str, ...]]:
+        """Paths (relative to the roots) of the parameters differing between two trees
+
+        Only the subtrees whose hashes differ are visited. A parameter existing in a single tree is
+        reported without its children, a parameter whose own value differs is reported (unless
+        structure_only is True), as well as a parameter whose children are in a different order.
+        """
+        paths = []
+        self._diff(self._root, other, other.root, (), structure_only, paths)
+        return paths
+
+    def _diff(self, param: Parameter, other: 'ParameterHasher', other_param: Parameter, path: Tuple[str, ...],
+              structure_only: bool, paths: List[Tuple[str, ...]]):
+        index = 0 if structure_only else 1
+        if self._get_hashes(param)[index] == other._get_hashes(other_param)[index]:
+            return
+        if not structure_only and get_value_digest(param) != get_value_digest(other_param):
+            paths.append(path)
+        names = [child.name() for child in param.children()]
+        other_names = [child.name() for child in other_param.children()]
+        if [name for name in names if name in other_names] != [name for name in other_names if name in names]:
+            if len(paths) == 0 or paths[-1] != path:
+                paths.append(path)
+        other_children = {child.name(): child for child in other_param.children()}
+        for child in param.children():
+            other_child = other_children.pop(child.name(), None)
+            if other_child is None:
+                paths.append(path + (child.name(),))
+            else:
+                self._diff(child, other, other_child, path + (child.name(),), structure_only, paths)
+        paths.extend([path + (name,) for name in other_children])
+
+
+def diff_parameters(param1: Parameter, param2: Parameter, structure_only=False) -> List[Tuple[str, ...]]:
+    """Paths of the parameters differing between two trees, see ParameterHasher.diff"""
+    return ParameterHasher(param1).diff(ParameterHasher(param2), structure_only)
+
+
 def get_param_from_name(parent, name) -> Parameter:
     """Get Parameter under parent whose name is name
 
@@ -9,6 +9,7 @@ from qtpy.QtCore import QObject, Signal, QRectF
 from pymodaq_data.data import DataToExport, DataWithAxes, DataDim, DataDistribution
 
 from pymodaq_gui.plotting.utils.plot_utils import RoiInfo
+from pymodaq_gui.plotting.utils.accumulator import Accumulator, AccumulationMode
 
 if TYPE_CHECKING:
     from pymodaq_gui.plotting.data_viewers.viewer0D import Viewer0D
@@ -169,6 +170,7 @@ class ViewerBase(QObject):
         self._raw_data = None
         self.data_to_export: DataToExport = DataToExport(name=self.title)
         self.view: Union[Viewer0D, Viewer1D, Viewer2D, ViewerND] = None
+        self.accumulator: Accumulator = None
 
         if parent is None:
             parent = QtWidgets.QWidget()
@@ -235,6 +237,11 @@ class ViewerBase(QObject):
             raise ViewerError(f'Ndarray of dim: {len(data.shape)} cannot be plotted using a {self.viewer_type}')
 
         self.data_to_export = DataToExport(name=self.title)
+        if self.accumulator is not None and self.accumulator.is_active and not self._display_temporary:
+            data = self.accumulator.accumulate(data)
+            accumulated = data.deepcopy_with_new_data(data.data)  # sharing the arrays, only the name differs
+            accumulated.name = f'Accumulated_{data.name}'
+            self.data_to_export.append(accumulated)
         self._raw_data = data
 
         self._display_temporary = False
@@ -257,6 +264,34 @@ class ViewerBase(QObject):
         """Specific viewers should implement it"""
         raise NotImplementedError
 
+    def setup_accumulator(self):
+        """Create an Accumulator processing data before their display
+
+        The view should define the *accumulate*, *accumulation_mode*, *accumulation_length* and
+        *reset_accumulation* actions
+        """
+        self.accumulator = Accumulator()
+        self.view.get_action('accumulation_mode').addItems(AccumulationMode.values())
+        self.view.get_action('accumulation_length').setValue(self.accumulator.length)
+
+        self.view.connect_action('accumulate', self.activate_accumulation)
+        self.view.connect_action('accumulation_mode',
+                                 lambda mode: setattr(self.accumulator, 'mode', mode),
+                                 signal_name='currentTextChanged')
+        self.view.connect_action('accumulation_length',
+                                 lambda length: setattr(self.accumulator, 'length', length),
+                                 signal_name='valueChanged')
+        self.view.connect_action('reset_accumulation', self.accumulator.reset)
+
+    def activate_accumulation(self, activate=True):
+        """Activate the accumulation (averaging, min/max hold...) of the data before display"""
+        if self.accumulator is not None:
+            if activate != self.is_action_checked('accumulate'):
+                self.set_action_checked('accumulate', activate)
+            self.accumulator.set_active(activate)
+            self.set_action_visible(['accumulation_mode', 'accumulation_length', 'reset_accumulation'],
+                                    activate)
+
     def add_attributes_from_view(self):
         """Convenience function to add attributes from the view to self"""
         for attribute in self.convenience_attributes:
@@ -19,12 +19,15 @@ from pymodaq_gui.plotting.data_viewers.viewer import ViewerBase
 from pymodaq_gui.plotting.utils.plot_utils import make_dashed_pens, RoiInfo
 from pymodaq_gui.managers.roi_manager import ROIManager
 from pymodaq_gui.plotting.utils.filter import Filter1DFromCrosshair, Filter1DFromRois
+from pymodaq_gui.plotting.utils.persistence import PersistenceHistogram
 from pymodaq_gui.plotting.widgets import PlotWidget
 from pymodaq_gui.plotting.data_viewers.viewer0D import Viewer0D
 
 logger = set_logger(get_module_name(__file__))
 
 PLOT_COLORS = utils.plot_colors
+XY_DENSITY_THRESHOLD = 100_000
+XY_DENSITY_BINS = 256
 
 
 class DataDisplayer(QObject):
@@ -52,6 +55,15 @@ class DataDisplayer(QObject):
         self._data: DataWithAxes = None
         self._plot_colors = plot_colors
 
+        self._xy_config: tuple = None
+        self._xy_density = False
+        self._xy_current_item: pg.GraphicsObject = None
+        self._xy_scatter_item = pg.ScatterPlotItem(pxMode=True, size=3, pen=None, antialias=False)
+        self._xy_density_item = pg.ImageItem()
+        self._xy_density_item.setLookupTable(pg.colormap.get('viridis').getLookupTable(nPts=256))
+        self.xy_density_threshold = XY_DENSITY_THRESHOLD
+        self.xy_density_bins = XY_DENSITY_BINS
+
     @property
     def Ndata(self):
         return len(self._data) if self._data is not None else 0
@@ -141,40 +153,106 @@ class DataDisplayer(QObject):
     def update_xyplot(self, do_xy=True, dwa: DataWithAxes=None):
         if dwa is None:
             dwa = self._data
+        self.configure_xy(do_xy, dwa)
+        if do_xy:
+            self._update_xy_items(dwa)
+        else:
+            self._update_curve_items(dwa)
+
+    def configure_xy(self, do_xy: bool, dwa: DataWithAxes):
+        """Set the labels, legend and items visibility for the normal or XY representation
+
+        This is done only when the configuration changes (mode, labels, axis) and not on each frame
+        """
+        _axis = dwa.get_axis_from_index(0)[0]
+        config = (do_xy, tuple(dwa.labels), len(self._plot_items),
+                  _axis.label if _axis is not None else '', _axis.units if _axis is not None else '')
+        if config == self._xy_config:
+            return
+        self._xy_config = config
+        if do_xy:
+            for plot_item in self._plot_items[max(1, len(dwa) - 1):]:
+                plot_item.setData(np.array([]), np.array([]))
+            self._plotitem.getAxis('bottom').setLabel(text=dwa.labels[0], units='')
+            self._plotitem.getAxis('left').setLabel(text=' / '.join(dwa.labels[1:]), units='')
+            self.legend.setVisible(False)
+        else:
+            self._plotitem.getAxis('bottom').setLabel(text=_axis.label, units=_axis.units)
+            self._plotitem.getAxis('left').setLabel(text='', units='')
+            self.legend.setVisible(True)
+            self._show_xy_item(None)
+
+    def _update_curve_items(self, dwa: DataWithAxes):
         _axis = dwa.get_axis_from_index(0)[0]
         _axis_array = _axis.get_data()
         for ind_data, dat in enumerate(dwa.data):
             if dwa.size > 0:
-                if not do_xy:
-                    if self._flip_axes:
-                        self._plot_items[ind_data].setData(dat, _axis_array)
-                    else:
-                        self._plot_items[ind_data].setData(_axis_array, dat)
-                        if self._show_errors:
-                            self._boundary_items[ind_data][0].setData(
-                                _axis_array,
-                                dat + dwa.get_error(ind_data))
-                            self._boundary_items[ind_data][1].setData(
-                                _axis_array,
-                                dat - dwa.get_error(ind_data))
+                if self._flip_axes:
+                    self._plot_items[ind_data].setData(dat, _axis_array)
                 else:
-                    self._plot_items[ind_data].setData(np.array([]), np.array([]))
-
-        if do_xy:
-            for ind, data_array in enumerate(dwa[1:]):
-                self._plot_items[ind].setData(dwa.data[0], data_array)
-                axis = self._plotitem.getAxis('bottom')
-                axis.setLabel(text=dwa.labels[0], units='')
-                axis = self._plotitem.getAxis('left')
-                axis.setLabel(text=' / '.join(dwa.labels[1:]), units='')
-                self.legend.setVisible(False)
-
+                    self._plot_items[ind_data].setData(_axis_array, dat)
+                    if self._show_errors:
+                        self._boundary_items[ind_data][0].setData(
+                            _axis_array,
+                            dat + dwa.get_error(ind_data))
+                        self._boundary_items[ind_data][1].setData(
+                            _axis_array,
+                            dat - dwa.get_error(ind_data))
+
+    def _update_xy_items(self, dwa: DataWithAxes):
+        """Display the first channel as x and each of the other ones as y
+
+        With two channels only, large point clouds can be displayed as a 2D density map and scatter
+        plots use a dedicated ScatterPlotItem instead of the symbols of the PlotDataItem
+        """
+        if len(dwa) < 2 or dwa.size == 0:
+            return
+        x_array = dwa.data[0]
+        if len(dwa) == 2 and self._xy_density and x_array.size > self.xy_density_threshold:
+            self._show_xy_item(self._xy_density_item)
+            self._update_xy_density(x_array, dwa.data[1])
+        elif len(dwa) == 2 and self._do_scatter:
+            self._show_xy_item(self._xy_scatter_item)
+            self._xy_scatter_item.setData(x=x_array, y=dwa.data[1], brush=self._plot_colors[0])
         else:
-            axis = self._plotitem.getAxis('bottom')
-            axis.setLabel(text=_axis.label, units=_axis.units)
-            axis = self._plotitem.getAxis('left')
-            axis.setLabel(text='', units='')
-            self.legend.setVisible(True)
+            self._show_xy_item(self._plot_items[0])
+            for ind, y_array in enumerate(dwa.data[1:]):
+                self._plot_items[ind].setData(x_array, y_array)
+
+    def _show_xy_item(self, item: Union[pg.GraphicsObject, None]):
+        """Make sure only one item is used to display XY data, None to go back to normal display"""
+        if item is not self._xy_current_item:
+            if self._xy_current_item is not None and self._xy_current_item not in self._plot_items:
+                self._plotitem.removeItem(self._xy_current_item)
+            elif self._xy_current_item is not None:
+                self._xy_current_item.setData(np.array([]), np.array([]))
+            if item is not None and item not in self._plot_items:
+                self._plotitem.addItem(item)
+            self._xy_current_item = item
+
+    def _update_xy_density(self, x_array: np.ndarray, y_array: np.ndarray):
+        is_finite = np.logical_and(np.isfinite(x_array), np.isfinite(y_array))
+        if not np.all(is_finite):
+            x_array = x_array[is_finite]
+            y_array = y_array[is_finite]
+        if x_array.size == 0:
+            return
+        x_range = (np.min(x_array), np.max(x_array))
+        y_range = (np.min(y_array), np.max(y_array))
+        if x_range[0] == x_range[1]:
+            x_range = (x_range[0] - 0.5, x_range[1] + 0.5)
+        if y_range[0] == y_range[1]:
+            y_range = (y_range[0] - 0.5, y_range[1] + 0.5)
+        density, _, _ = np.histogram2d(x_array, y_array, bins=self.xy_density_bins,
+                                       range=(x_range, y_range))
+        self._xy_density_item.setImage(density, autoLevels=True)
+        self._xy_density_item.setRect(QRectF(x_range[0], y_range[0],
+                                             x_range[1] - x_range[0], y_range[1] - y_range[0]))
+
+    def update_xy_density(self, do_density=False):
+        """Display large XY point clouds as a 2D histogram (see xy_density_threshold)"""
+        self._xy_density = do_density
+        self.update_plot(self._doxy, sort_data=self._do_sort, scatter=self._do_scatter)
 
     def plot_with_scatter(self, with_scatter=True, symbol_size=5, symbol='o', color=None):
 
@@ -197,6 +275,8 @@ class DataDisplayer(QObject):
             plot_item.setSymbolSize(symbol_size)
 
     def update_display_items(self, data: DataWithAxes = None, show_errors=False):
+        self._show_xy_item(None)
+        self._xy_config = None
         while len(self._plot_items) > 0:
             self._plotitem.removeItem(self._plot_items.pop(0))
             if len(self._boundary_items) > 0:
@@ -253,6 +333,67 @@ class DataDisplayer(QObject):
 
 
 
+class PersistenceDisplayer(QObject):
+    """
+    This Object displays, on a plotitem, the persistence (2D histogram) of all 1D traces it received
+    """
+
+    def __init__(self, plotitem: pg.PlotItem, flip_axes=False):
+        super().__init__()
+        self._plotitem = plotitem
+        self._flip_axes = flip_axes
+        self._is_active = False
+        self.persistence = PersistenceHistogram()
+        self._image_item = pg.ImageItem()
+        self._image_item.setZValue(-100)
+        self._image_item.setLookupTable(pg.colormap.get('inferno').getLookupTable(nPts=256))
+
+    @property
+    def is_active(self) -> bool:
+        return self._is_active
+
+    def get_image_item(self) -> pg.ImageItem:
+        return self._image_item
+
+    def set_active(self, activate=True):
+        if activate != self._is_active:
+            self._is_active = activate
+            if activate:
+                self._plotitem.addItem(self._image_item)
+            else:
+                self._plotitem.removeItem(self._image_item)
+        self.reset()
+
+    def set_decay(self, decay: float):
+        self.persistence.decay = decay
+
+    def reset(self):
+        self.persistence.reset(keep_range=False)
+        self._image_item.clear()
+
+    def update_data(self, dwa: DataWithAxes):
+        if not self._is_active or dwa is None or dwa.size == 0:
+            return
+        self.persistence.add_traces(np.stack(dwa.data))
+        histogram = self.persistence.histogram
+        if histogram is None:  # no finite data received yet
+            return
+        axis = dwa.get_axis_from_index(0)[0]
+        if axis is not None:
+            time_range = (axis.min(), axis.max())
+        else:
+            time_range = (0, dwa.size - 1)
+        amp_range = self.persistence.amplitude_range
+        if self._flip_axes:
+            self._image_item.setImage(histogram.T, autoLevels=True)
+            self._image_item.setRect(QRectF(amp_range[0], time_range[0],
+                                            amp_range[1] - amp_range[0], time_range[1] - time_range[0]))
+        else:
+            self._image_item.setImage(histogram, autoLevels=True)
+            self._image_item.setRect(QRectF(time_range[0], amp_range[0],
+                                            time_range[1] - time_range[0], amp_range[1] - amp_range[0]))
+
+
 class View1D(ActionManager, QObject):
     def __init__(self, parent_widget: QtWidgets.QWidget = None, show_toolbar=True,
                  no_margins=False, flip_axes=False):
@@ -281,6 +422,7 @@ class View1D(ActionManager, QObject):
         self.plot_widget = PlotWidget()
         self.roi_manager = ROIManager('1D')
         self.data_displayer = DataDisplayer(self.plotitem, flip_axes=self.flip_axes)
+        self.persistence_displayer = PersistenceDisplayer(self.plotitem, flip_axes=self.flip_axes)
         self.other_data_displayers: Dict[str, DataDisplayer] = {}
         self.setup_widgets()
 
@@ -357,6 +499,7 @@ class View1D(ActionManager, QObject):
                                                 self.is_action_checked('sort'),
                                                 do_scatter=self.is_action_checked('scatter'),
                                                 show_errors=self.is_action_checked('errors'))
+                self.persistence_displayer.update_data(data)
             elif isinstance(data, DataToExport):
                 self.set_action_visible('xyplot', len(data[0]) == 2)
                 self.data_displayer.update_data(data.pop(0), self.is_action_checked('xyplot'),
@@ -424,9 +567,14 @@ class View1D(ActionManager, QObject):
         self.connect_action('scatter', self.data_displayer.update_scatter)
         self.connect_action('xyplot', self.data_displayer.update_xy)
         self.connect_action('xyplot', self.process_xyplot)
+        self.connect_action('xy_density', self.data_displayer.update_xy_density)
         self.connect_action('sort', self.data_displayer.update_sort)
         self.connect_action('crosshair', self.show_hide_crosshair)
         self.connect_action('overlay', self.data_displayer.show_overlay)
+        self.connect_action('persistence', self.show_persistence)
+        self.connect_action('persistence_decay', self.persistence_displayer.set_decay,
+                            signal_name='valueChanged')
+        self.connect_action('reset_persistence', self.persistence_displayer.reset)
         self.connect_action('errors', self.data_displayer.update_errors)
         self.connect_action('ROIselect', self.show_ROI_select)
 
@@ -440,6 +588,7 @@ class View1D(ActionManager, QObject):
 
     def process_xyplot(self):
         """ Uncheck things if xyplot is active"""
+        self.set_action_visible('xy_density', self.is_action_checked('xyplot'))
         if self.is_action_checked('xyplot') and self.is_action_checked('errors'):
             self.get_action('errors').trigger()
         if self.is_action_checked('xyplot') and self.is_action_checked('overlay'):
@@ -452,6 +601,10 @@ class View1D(ActionManager, QObject):
     def show_ROI_select(self):
         self.ROIselect.setVisible(self.is_action_checked('ROIselect'))
 
+    def show_persistence(self, show=True):
+        self.persistence_displayer.set_active(show)
+        self.set_action_visible(['persistence_decay', 'reset_persistence'], show)
+
     def setup_actions(self):
         self.add_action('do_math', 'Math', 'Calculator', 'Do Math using ROI', checkable=True)
         self.add_action('crosshair', 'Crosshair', 'reset', 'Show data cursor', checkable=True)
@@ -463,8 +616,20 @@ class View1D(ActionManager, QObject):
                         'Switch between normal or XY representation (valid for 2 channels)',
                         checkable=True,
                         visible=False)
+        self.add_action('xy_density', 'XY Density', 'Histogram',
+                        'In XY representation, display large point clouds as a 2D density map',
+                        checkable=True,
+                        visible=False)
         self.add_action('overlay', 'Overlay', 'overlay', 'Plot overlays of current data',
                         checkable=True)
+        self.add_action('persistence', 'Persistence', 'waterfallPlot',
+                        'Display the density of all received traces (oscilloscope-like persistence)',
+                        checkable=True)
+        self.add_widget('persistence_decay', pg.SpinBox, value=1., bounds=(0., 1.), step=0.01,
+                        tip='Decay factor applied to the persistence on each new trace (1: infinite)',
+                        visible=False, setters=dict(setMaximumWidth=60))
+        self.add_action('reset_persistence', 'Reset persistence', 'clear2',
+                        tip='Reset the persistence', visible=False)
         self.add_action('errors', 'Errors', 'Statistics2', 'Plot boundaries (~error bars) of '
                                                            'the data',
                         checkable=True)
@@ -473,6 +638,15 @@ class View1D(ActionManager, QObject):
                         checkable=True)
         self.add_action('ROIselect', 'ROI Select', 'Select_24',
                         tip='Show/Hide ROI selection area', checkable=True)
+        self.add_action('accumulate', 'Accumulate', 'sum',
+                        tip='Accumulate successive data before display (averaging, min/max hold)',
+                        checkable=True)
+        self.add_widget('accumulation_mode', QtWidgets.QComboBox, tip='Accumulation mode', visible=False)
+        self.add_widget('accumulation_length', pg.SpinBox, value=10, int=True, min=1, step=1,
+                        tip='Number of frames used for the running mean and the exponential average',
+                        visible=False, setters=dict(setMaximumWidth=60))
+        self.add_action('reset_accumulation', 'Reset accumulation', 'clear2',
+                        tip='Reset the accumulated data', visible=False)
         self.add_action('x_label', 'x:')
         self.add_action('y_label', 'y:')
 
@@ -532,6 +706,7 @@ class Viewer1D(ViewerBase):
         self.filter_from_crosshair.register_activation_signal(self.view.get_action('crosshair').triggered)
         self.filter_from_crosshair.register_target_slot(self.process_crosshair_lineouts)
 
+        self.setup_accumulator()
         self.prepare_connect_ui()
 
         self._labels = []
@@ -469,6 +469,15 @@ class View2D(ActionManager, QtCore.QObject):
                         tip='Take the opposite of the image', checkable=True)
         self.add_action('legend', 'Legend', 'RGB',
                         tip='Show the legend', checkable=True)
+        self.add_action('accumulate', 'Accumulate', 'sum',
+                        tip='Accumulate successive data before display (averaging, min/max hold)',
+                        checkable=True)
+        self.add_widget('accumulation_mode', QtWidgets.QComboBox, tip='Accumulation mode', visible=False)
+        self.add_widget('accumulation_length', pg.SpinBox, value=10, int=True, min=1, step=1,
+                        tip='Number of frames used for the running mean and the exponential average',
+                        visible=False, setters=dict(setMaximumWidth=60))
+        self.add_action('reset_accumulation', 'Reset accumulation', 'clear2',
+                        tip='Reset the accumulated data', visible=False)
 
     def update_colors(self, colors: list):
         for ind, roi_name in enumerate(self.roi_manager.ROIs):
@@ -740,6 +749,7 @@ class Viewer2D(ViewerBase):
         self.filter_from_crosshair.register_activation_signal(self.view.get_action('crosshair').triggered)
         self.filter_from_crosshair.register_target_slot(self.process_crosshair_lineouts)
 
+        self.setup_accumulator()
         self.prepare_connect_ui()
 
     @property
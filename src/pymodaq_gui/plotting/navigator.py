@@ -11,7 +11,6 @@ from pymodaq_utils.config import get_set_local_dir, Config
 from pymodaq_utils.logger import set_logger, get_module_name
 
 from pymodaq_data.data import DataToExport, DataWithAxes
-from pymodaq_data.h5modules.data_saving import DataLoader
 
 from pymodaq_gui.utils.file_io import select_file
 from pymodaq_gui.managers.parameter_manager import ParameterManager
@@ -20,6 +19,7 @@ from pymodaq_gui.plotting.data_viewers.viewer2D_basic import Viewer2DBasic
 from pymodaq_gui.plotting.items.image import UniformImageItem, SpreadImageItem
 from pymodaq_gui.h5modules.browsing import browse_data
 from pymodaq_gui.h5modules.saving import H5Saver
+from pymodaq_gui.h5modules.data_cache import CachedDataLoader
 from pymodaq_gui.parameter.pymodaq_ptypes.pixmap import PixmapCheckData
 
 
@@ -65,7 +65,7 @@ class Navigator(ParameterManager, ActionManager, QObject):
         self.status_time = 1000
 
         self._h5saver = H5Saver()
-        self.dataloader = DataLoader(self._h5saver)
+        self.dataloader = CachedDataLoader(self._h5saver)
 
         self.h5file_path = h5file_path
         self.h5saver_image = H5Saver()
@@ -100,7 +100,7 @@ class Navigator(ParameterManager, ActionManager, QObject):
     @h5saver.setter
     def h5saver(self, h5saver: H5Saver):
         self._h5saver = h5saver
-        self.dataloader = DataLoader(h5saver)
+        self.dataloader = CachedDataLoader(h5saver)
 
     def setup_actions(self):
 
@@ -276,7 +276,7 @@ class Navigator(ParameterManager, ActionManager, QObject):
         elif param.name() == 'image':
             data: PixmapCheckData = param.value()
             if data.checked:
-                dataloader = DataLoader(self.h5saver_image)
+                dataloader = CachedDataLoader(self.h5saver_image)
                 dwa = dataloader.load_data(data.path)
                 ims = self.add_image_data(dwa)
                 self.overlays.append(dict(name='{:s}_{:03d}'.format(param.name(), 0), images=ims))
@@ -321,7 +321,7 @@ class Navigator(ParameterManager, ActionManager, QObject):
     def update_h5file(self, h5file):
         if self.h5saver is not None:
             self.h5saver.h5file = h5file
-            self.dataloader = DataLoader(self.h5saver)
+            self.dataloader = CachedDataLoader(self.h5saver)
         self.list_2D_scans()
 
     def update_status(self, txt, status_time=0, log_type=None):
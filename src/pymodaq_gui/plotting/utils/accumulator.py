@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Accumulation of streamed data (running averages, min/max hold) before their display in a viewer
+"""
+from typing import List, Union
+
+import numpy as np
+
+from pymodaq_utils.enums import BaseEnum, enum_checker
+
+from pymodaq_data.data import DataWithAxes
+
+
+class AccumulationMode(BaseEnum):
+    """Enum listing the possible accumulation of successive data
+
+    RunningMean: boxcar average over the last N frames
+    CumulativeMean: average of all frames since last reset
+    EMA: exponential moving average with a weight of 1/N for the new frame
+    MaxHold: maximum of all frames since last reset
+    MinHold: minimum of all frames since last reset
+    """
+    RunningMean = 'Running mean'
+    CumulativeMean = 'Cumulative mean'
+    EMA = 'Exp. moving average'
+    MaxHold = 'Max hold'
+    MinHold = 'Min hold'
+
+
+class Accumulator:
+    """Accumulate successive DataWithAxes using preallocated arrays and in-place numpy ufuncs
+
+    The accumulators are (re)allocated on the first frame and each time the structure of the incoming
+    data changes (number of channels, shape) or the accumulation settings are modified.
+
+    Parameters
+    ----------
+    mode: AccumulationMode or str
+    length: int
+        Number of frames used by the RunningMean (boxcar length) and the EMA (weight 1/length)
+    """
+
+    def __init__(self, mode: Union[AccumulationMode, str] = AccumulationMode.RunningMean, length: int = 10):
+        self._is_active = False
+        self._mode: AccumulationMode = None
+        self._length = 1
+        self._signature = None
+        self._accumulators: List[np.ndarray] = []
+        self._buffers: List[np.ndarray] = []
+        self._scratch: List[np.ndarray] = []
+        self._n_frames = 0
+        self._ring_index = 0
+
+        self.mode = mode
+        self.length = length
+
+    @property
+    def is_active(self) -> bool:
+        return self._is_active
+
+    def set_active(self, activate=True):
+        self._is_active = activate
+        self.reset()
+
+    @property
+    def mode(self) -> AccumulationMode:
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode: Union[AccumulationMode, str]):
+        if isinstance(mode, str) and mode in AccumulationMode.values():
+            mode = AccumulationMode(mode)
+        mode = enum_checker(AccumulationMode, mode)
+        if mode != self._mode:
+            self._mode = mode
+            self.reset()
+
+    @property
+    def length(self) -> int:
+        return self._length
+
+    @length.setter
+    def length(self, length: int):
+        length = max(1, int(length))
+        if length != self._length:
+            self._length = length
+            self.reset()
+
+    @property
+    def n_frames(self) -> int:
+        """Number of frames accumulated since the last reset"""
+        return self._n_frames
+
+    def reset(self):
+        """Discard the accumulated data, accumulators will be reallocated on next frame"""
+        self._signature = None
+        self._accumulators = []
+        self._buffers = []
+        self._scratch = []
+        self._n_frames = 0
+        self._ring_index = 0
+
+    @staticmethod
+    def _get_signature(dwa: DataWithAxes) -> tuple:
+        return len(dwa), dwa.shape, tuple([array.dtype for array in dwa])
+
+    def _allocate(self, dwa: DataWithAxes):
+        self._signature = self._get_signature(dwa)
+        self._n_frames = 0
+        self._ring_index = 0
+        self._accumulators = []
+        self._buffers = []
+        self._scratch = []
+        for array in dwa:
+            dtype = np.result_type(array.dtype, np.float64)
+            self._accumulators.append(np.zeros(array.shape, dtype=dtype))
+            if self._mode == AccumulationMode.RunningMean:
+                self._buffers.append(np.zeros((self._length,) + array.shape, dtype=dtype))
+            if self._mode == AccumulationMode.EMA:
+                self._scratch.append(np.zeros(array.shape, dtype=dtype))
+
+    def accumulate(self, dwa: DataWithAxes) -> DataWithAxes:
+        """Add a new frame to the accumulators
+
+        Parameters
+        ----------
+        dwa: DataWithAxes
+
+        Returns
+        -------
+        DataWithAxes: a new object with the same axes as dwa holding a copy of the accumulated data
+        """
+        if self._signature != self._get_signature(dwa):
+            self._allocate(dwa)
+
+        if self._mode == AccumulationMode.RunningMean:
+            arrays = self._accumulate_running_mean(dwa)
+        elif self._mode == AccumulationMode.CumulativeMean:
+            for acc, array in zip(self._accumulators, dwa):
+                np.add(acc, array, out=acc)
+            self._n_frames += 1
+            arrays = [acc / self._n_frames for acc in self._accumulators]
+        elif self._mode == AccumulationMode.EMA:
+            arrays = self._accumulate_ema(dwa)
+        else:
+            ufunc = np.maximum if self._mode == AccumulationMode.MaxHold else np.minimum
+            for acc, array in zip(self._accumulators, dwa):
+                if self._n_frames == 0:
+                    acc[...] = array
+                else:
+                    ufunc(acc, array, out=acc)
+            self._n_frames += 1
+            arrays = [acc.copy() for acc in self._accumulators]
+
+        return dwa.deepcopy_with_new_data(arrays)
+
+    def _accumulate_running_mean(self, dwa: DataWithAxes) -> List[np.ndarray]:
+        index = self._ring_index
+        for acc, buffer, array in zip(self._accumulators, self._buffers, dwa):
+            np.subtract(acc, buffer[index], out=acc)
+            buffer[index] = array
+            np.add(acc, buffer[index], out=acc)
+        self._ring_index = (index + 1) % self._length
+        self._n_frames = min(self._n_frames + 1, self._length)
+        if self._ring_index == 0:
+            # periodically recompute the sum from the buffer to avoid the drift of the running sum
+            for acc, buffer in zip(self._accumulators, self._buffers):
+                np.sum(buffer, axis=0, out=acc)
+        return [acc / self._n_frames for acc in self._accumulators]
+
+    def _accumulate_ema(self, dwa: DataWithAxes) -> List[np.ndarray]:
+        alpha = 1 / self._length
+        for acc, scratch, array in zip(self._accumulators, self._scratch, dwa):
+            if self._n_frames == 0:
+                acc[...] = array
+            else:
+                np.multiply(acc, 1 - alpha, out=acc)
+                np.multiply(array, alpha, out=scratch)
+                np.add(acc, scratch, out=acc)
+        self._n_frames += 1
+        return [acc.copy() for acc in self._accumulators]
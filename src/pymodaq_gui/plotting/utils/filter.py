@@ -2,7 +2,7 @@ import numpy as np
 from pyqtgraph.parametertree import Parameter
 from qtpy import QtCore, QtWidgets, QtGui
 from qtpy.QtCore import QPointF, Slot, Signal, QObject
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from pyqtgraph import LinearRegionItem
 
@@ -218,6 +218,61 @@ class Filter2DFromCrosshair(Filter):
         return point.x(), point.y()
 
 
+class ROIBandReducer:
+    """Compute sums and means of data over several index bands at once
+
+    Bands are given as slices along one axis. Their bounds are stored as arrays so that, for each
+    frame, all band sums are obtained from a single cumulative sum of the data followed by a
+    vectorized difference at the band boundaries.
+    """
+    def __init__(self):
+        self._starts = np.array([], dtype=int)
+        self._stops = np.array([], dtype=int)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def set_bounds(self, slices: List[slice]):
+        """Store the start/stop indexes of each band (slices with a None start or stop are not supported)"""
+        self._starts = np.array([sl.start for sl in slices], dtype=int)
+        self._stops = np.array([max(sl.start, sl.stop) for sl in slices], dtype=int)
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self._stops - self._starts
+
+    def reduce(self, array: np.ndarray, axis: int = -1) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the sum and the mean of the array along axis for each band
+
+        Parameters
+        ----------
+        array: ndarray
+        axis: int
+            the axis along which bands are defined
+
+        Returns
+        -------
+        tuple of ndarray: the sums and the means. The band dimension replaces the reduced axis and is
+            moved last. Bands of zero length have a sum of 0 and a nan mean.
+        """
+        array = np.moveaxis(array, axis, -1)
+        if np.issubdtype(array.dtype, np.integer) or np.issubdtype(array.dtype, np.bool_):
+            acc_dtype = np.int64
+        elif np.issubdtype(array.dtype, np.complexfloating):
+            acc_dtype = np.complex128
+        else:
+            acc_dtype = np.float64
+        cumsum = np.zeros(array.shape[:-1] + (array.shape[-1] + 1,), dtype=acc_dtype)
+        np.cumsum(array, axis=-1, dtype=acc_dtype, out=cumsum[..., 1:])
+        sums = cumsum[..., self._stops] - cumsum[..., self._starts]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / self.counts
+        if acc_dtype is not np.int64:
+            sums = sums.astype(array.dtype, copy=False)
+            means = means.astype(array.dtype, copy=False)
+        return sums, means
+
+
 class Filter1DFromRois(Filter):
     """
 
@@ -225,64 +280,166 @@ class Filter1DFromRois(Filter):
     ----------
     roi_manager:ROIManager
     graph_item: PlotItems
+
+    Notes
+    -----
+    The index bounds of all ROIs are computed once when the ROIs geometry (or the data axis) changes. The
+    'sum' and 'mean' math functions are then computed for all ROIs in a single pass using a
+    ROIBandReducer, other math functions use the data processors.
     """
+    batched_functions = ('sum', 'mean')
+
     def __init__(self, roi_manager: ROIManager):
 
         super().__init__()
         self._roi_settings = roi_manager.settings
         self._ROIs = roi_manager.ROIs
         self._axis: data_mod.Axis = None
+        self._reducer = ROIBandReducer()
+        self._slices: dict = None
+        self._axis_signature = None
+        self._channel_indexes: dict = {}
+
+        roi_manager.roi_changed.connect(self.invalidate_bounds)
+        roi_manager.roi_value_changed.connect(lambda *args: self.invalidate_bounds())
+        roi_manager.new_ROI_signal.connect(lambda *args: self.invalidate_bounds())
+        roi_manager.remove_ROI_signal.connect(lambda *args: self.invalidate_bounds())
 
     def update_axis(self, axis: data_mod.Axis):
         self._axis = axis
 
+    def invalidate_bounds(self):
+        """Force the ROIs index bounds to be recomputed on next filtering"""
+        self._slices = None
+
+    @staticmethod
+    def _get_axis_signature(axis: data_mod.Axis):
+        if axis.data is None:
+            return axis.size, axis.offset, axis.scaling
+        else:
+            return axis.data
+
+    def _check_axis_signature(self, axis: data_mod.Axis) -> bool:
+        """Check if the axis is the same as the one used to compute the bounds, store it otherwise"""
+        signature = self._get_axis_signature(axis)
+        if isinstance(signature, np.ndarray):
+            same = (isinstance(self._axis_signature, np.ndarray) and
+                    np.array_equal(signature, self._axis_signature))
+            if not same:
+                self._axis_signature = signature.copy()
+        else:
+            same = signature == self._axis_signature
+            self._axis_signature = signature
+        return same
+
+    def update_bounds(self, data: data_mod.DataWithAxes):
+        """Compute the index bounds of all ROIs along the signal axis of data"""
+        self._slices = {roi_key: self.get_slice_from_roi(roi, data) for roi_key, roi in self._ROIs.items()}
+        self._reducer.set_bounds(list(self._slices.values()))
+
+    def get_channel_indexes(self, use_channel: str, labels: List[str]) -> List[int]:
+        """Get the indexes of the data channels to be used with a ROI, cached for given labels"""
+        key = (use_channel, tuple(labels))
+        if key not in self._channel_indexes:
+            if len(self._channel_indexes) > 64:
+                self._channel_indexes = {}
+            if use_channel == 'All':
+                self._channel_indexes[key] = list(range(len(labels)))
+            else:
+                try:
+                    self._channel_indexes[key] = [labels.index(use_channel)]
+                except ValueError:
+                    self._channel_indexes[key] = [0]
+        return self._channel_indexes[key]
+
     def _filter_data(self, data: data_mod.DataRaw) -> DataToExport:
-        dte = DataToExport('roi1D')
+        dwas = []
         try:
             axis = data.get_axis_from_index(0, create=False)[0]
             if axis is not None:
                 self.update_axis(axis)
             if data is not None:
-                for roi_key, roi in self._ROIs.items():
-                    if self._roi_settings['ROIs', roi_key, 'use_channel'] == 'All':
-                        data_index = list(range(len(data.labels)))
-                    else:
-                        try:
-                            data_index = [data.labels.index(self._roi_settings['ROIs', roi_key,
-                                          'use_channel'])]
-                        except ValueError:
-                            data_index = [0]
-                    dte_tmp = self.get_data_from_roi(roi, self._roi_settings.child('ROIs', roi_key),
-                                                     data)
-                    if self._roi_settings['ROIs', roi_key, 'use_channel'] == 'All':
-                        dte.append(dte_tmp.data)
+                if not self._check_axis_signature(data.get_axis_from_index(data.sig_indexes[0])[0]) \
+                        or self._slices is None or self._slices.keys() != self._ROIs.keys():
+                    self.update_bounds(data)
+                reduced = self.reduce_bands(data)
+
+                for roi_ind, (roi_key, roi) in enumerate(self._ROIs.items()):
+                    roi_param = self._roi_settings.child('ROIs', roi_key)
+                    use_channel = roi_param['use_channel']
+                    data_index = self.get_channel_indexes(use_channel, data.labels)
+
+                    dwas_tmp = self._get_dwas_from_roi(roi, roi_param, data, _slice=self._slices[roi_key],
+                                                       reduced=reduced, roi_index=roi_ind)
+                    if use_channel == 'All':
+                        dwas.extend(dwas_tmp)
                     else:
                         for index in data_index:
-                            for dwa in dte_tmp.data:
-                                dte.append(dwa.pop(index))
+                            for dwa in dwas_tmp:
+                                dwas.append(dwa.pop(index))
 
         except Exception as e:
             pass
         finally:
-            return dte
+            # the DataWithAxes objects are all new ones (one HorData and one IntData per ROI), no need
+            # for the deepcopy done by DataToExport.append
+            return DataToExport('roi1D', data=dwas)
 
-    def get_data_from_roi(self, roi: LinearROI,  roi_param: Parameter, data: data_mod.DataWithAxes) -> DataToExport:
+    def reduce_bands(self, data: data_mod.DataWithAxes) -> Optional[dict]:
+        """Compute the sums and means of all ROIs for each channel of data
+
+        Returns
+        -------
+        dict or None: with keys 'sum' and 'mean' and as values the list (one per channel) of reduced
+            arrays, the last dimension being the ROI index. None if no ROI is using a batched math
+            function or if data contains nans (their propagation in the cumulative sum would not match
+            the per ROI processing).
+        """
+        if len(self._reducer) == 0:
+            return None
+        if not any([self._roi_settings['ROIs', roi_key, 'math_function'] in self.batched_functions
+                    for roi_key in self._ROIs]):
+            return None
+        reduced = dict(sum=[], mean=[])
+        for array in data:
+            if np.issubdtype(array.dtype, np.inexact) and np.isnan(np.sum(array)):
+                return None
+            sums, means = self._reducer.reduce(array, axis=data.sig_indexes[0])
+            reduced['sum'].append(sums)
+            reduced['mean'].append(means)
+        return reduced
+
+    def get_data_from_roi(self, roi: LinearROI,  roi_param: Parameter, data: data_mod.DataWithAxes,
+                          _slice: slice = None, reduced: dict = None, roi_index: int = None) -> DataToExport:
         if data is not None:
-            dte = DataToExport('ROI1D')
+            return DataToExport('ROI1D', data=self._get_dwas_from_roi(roi, roi_param, data, _slice=_slice,
+                                                                      reduced=reduced, roi_index=roi_index))
+
+    def _get_dwas_from_roi(self, roi: LinearROI,  roi_param: Parameter, data: data_mod.DataWithAxes,
+                           _slice: slice = None, reduced: dict = None,
+                           roi_index: int = None) -> List[DataWithAxes]:
+        dwas = []
+        if _slice is None:
             _slice = self.get_slice_from_roi(roi, data)
-            sub_data: DataFromRoi = data.isig[_slice]
-            sub_data.name = 'HorData'
-            sub_data.origin = roi_param.name()
-            sub_data.labels = [f'{roi_param.name()}/{label}' for label in sub_data.labels]
-            dte.append(sub_data)
-            if sub_data.size != 0:
-                processed_data = data_processors.get(roi_param['math_function']).process(sub_data)
+        sub_data: DataFromRoi = data.isig[_slice]
+        sub_data.name = 'HorData'
+        sub_data.origin = roi_param.name()
+        sub_data.labels = [f'{roi_param.name()}/{label}' for label in sub_data.labels]
+        dwas.append(sub_data)
+        if sub_data.size != 0:
+            math_function = roi_param['math_function']
+            if reduced is not None and roi_index is not None and math_function in reduced:
+                processed_data = sub_data.deepcopy_with_new_data(
+                    [np.atleast_1d(array[..., roi_index]) for array in reduced[math_function]],
+                    sub_data.sig_indexes)
             else:
-                processed_data = None
-            if processed_data is not None:
-                processed_data.name = 'IntData'
-                dte.append(processed_data)
-            return dte
+                processed_data = data_processors.get(math_function).process(sub_data)
+        else:
+            processed_data = None
+        if processed_data is not None:
+            processed_data.name = 'IntData'
+            dwas.append(processed_data)
+        return dwas
 
     def get_slice_from_roi(self, roi: RectROI, data: data_mod.DataWithAxes) -> slice:
         ind_x_min, ind_x_max = data.get_axis_from_index(data.sig_indexes[0])[0].find_indexes(roi.getRegion())
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+
+Oscilloscope-like persistence: accumulation of 1D traces into a 2D (time x amplitude) histogram
+"""
+from typing import Tuple
+import warnings
+
+import numpy as np
+
+
+class PersistenceHistogram:
+    """Accumulate 1D traces into a 2D histogram of shape (n_time_bins, n_amplitude_bins)
+
+    Each sample of a trace falls into the time bin related to its index and into the amplitude bin
+    related to its value. All traces are binned at once using np.bincount on flattened indexes.
+
+    Parameters
+    ----------
+    amplitude_bins: int
+        number of bins along the amplitude dimension
+    max_time_bins: int
+        maximum number of bins along the time dimension. Traces longer than this are binned
+        (several samples into one time bin)
+    decay: float
+        factor (between 0 and 1) applied to the histogram before adding new traces. 1 means infinite
+        persistence
+
+    Unless set with amplitude_range, the amplitude range is computed from the first traces and
+    widened (the accumulated histogram being rebinned) when new traces fall outside of it.
+    """
+
+    def __init__(self, amplitude_bins: int = 256, max_time_bins: int = 2048, decay: float = 1.):
+        self.amplitude_bins = amplitude_bins
+        self.max_time_bins = max_time_bins
+        self._decay = 1.
+        self.decay = decay
+
+        self._histogram: np.ndarray = None
+        self._trace_length: int = None
+        self._time_indexes: np.ndarray = None
+        self._amplitude_range: Tuple[float, float] = None
+        self._auto_range = True
+        self._n_traces = 0
+
+    @property
+    def decay(self) -> float:
+        return self._decay
+
+    @decay.setter
+    def decay(self, decay: float):
+        if not 0. <= decay <= 1.:
+            raise ValueError(f'The decay factor should be between 0 and 1, not {decay}')
+        self._decay = float(decay)
+
+    @property
+    def histogram(self) -> np.ndarray:
+        """The 2D histogram with time as the first dimension"""
+        return self._histogram
+
+    @property
+    def amplitude_range(self) -> Tuple[float, float]:
+        return self._amplitude_range
+
+    @amplitude_range.setter
+    def amplitude_range(self, amplitude_range: Tuple[float, float]):
+        """Set a fixed amplitude range (None for an automatic one), this resets the histogram"""
+        self.reset()
+        if amplitude_range is not None:
+            amplitude_range = (float(min(amplitude_range)), float(max(amplitude_range)))
+            if amplitude_range[0] == amplitude_range[1]:
+                amplitude_range = (amplitude_range[0] - 0.5, amplitude_range[1] + 0.5)
+        self._amplitude_range = amplitude_range
+        self._auto_range = amplitude_range is None
+
+    @property
+    def n_traces(self) -> int:
+        """Number of traces accumulated since last reset"""
+        return self._n_traces
+
+    @property
+    def n_time_bins(self) -> int:
+        return 0 if self._histogram is None else self._histogram.shape[0]
+
+    def reset(self, keep_range=True):
+        """Clear the histogram, the amplitude range will be computed again from next traces if not
+        keep_range"""
+        self._histogram = None
+        self._trace_length = None
+        self._n_traces = 0
+        if not keep_range:
+            self._amplitude_range = None
+            self._auto_range = True
+
+    def _allocate(self, trace_length: int):
+        self._trace_length = trace_length
+        n_time_bins = min(trace_length, self.max_time_bins)
+        self._time_indexes = (np.arange(trace_length) * n_time_bins // trace_length) * self.amplitude_bins
+        self._histogram = np.zeros((n_time_bins, self.amplitude_bins), dtype=np.float64)
+        self._n_traces = 0
+
+    @staticmethod
+    def _get_finite_range(traces: np.ndarray) -> Tuple[float, float]:
+        """Min and max of the finite values of traces, None if there is none"""
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # all-nan traces
+            amp_min, amp_max = np.nanmin(traces), np.nanmax(traces)
+        if not (np.isfinite(amp_min) and np.isfinite(amp_max)):
+            finite = traces[np.isfinite(traces)]
+            if finite.size == 0:
+                return None
+            amp_min, amp_max = np.min(finite), np.max(finite)
+        return float(amp_min), float(amp_max)
+
+    def _update_range(self, traces: np.ndarray):
+        """Compute the automatic amplitude range or widen it if traces fall outside of it"""
+        finite_range = self._get_finite_range(traces)
+        if finite_range is None:
+            return
+        amp_min, amp_max = finite_range
+        if self._amplitude_range is not None:
+            old_min, old_max = self._amplitude_range
+            if old_min <= amp_min and amp_max < old_max:
+                return
+            amp_min, amp_max = min(amp_min, old_min), max(amp_max, old_max)
+        # some margin for the next traces, only on the sides being extended
+        margin = 0.1 * (amp_max - amp_min)
+        if margin == 0.:
+            margin = 0.5
+        if self._amplitude_range is None:
+            amplitude_range = (amp_min - margin, amp_max + margin)
+        else:
+            amplitude_range = (amp_min - margin if amp_min < old_min else old_min,
+                               amp_max + margin if amp_max >= old_max else old_max)
+            if self._histogram is not None:
+                self._rebin(amplitude_range)
+        self._amplitude_range = amplitude_range
+
+    def _rebin(self, amplitude_range: Tuple[float, float]):
+        """Move the counts of the histogram into the amplitude bins of a wider range"""
+        old_min, old_max = self._amplitude_range
+        new_min, new_max = amplitude_range
+        centers = old_min + (np.arange(self.amplitude_bins) + 0.5) * ((old_max - old_min) / self.amplitude_bins)
+        indexes = np.floor((centers - new_min) * (self.amplitude_bins / (new_max - new_min))).astype(np.intp)
+        np.clip(indexes, 0, self.amplitude_bins - 1, out=indexes)
+        histogram = np.zeros_like(self._histogram)
+        np.add.at(histogram, (slice(None), indexes), self._histogram)
+        self._histogram = histogram
+
+    def add_traces(self, traces: np.ndarray):
+        """Add one trace (1D array) or a stack of traces (2D array, one trace per row)"""
+        traces = np.atleast_2d(traces)
+        if self._auto_range:
+            self._update_range(traces)
+            if self._amplitude_range is None:  # no finite value received yet
+                return
+        if self._trace_length != traces.shape[-1]:
+            self._allocate(traces.shape[-1])
+
+        amp_min, amp_max = self._amplitude_range
+        amplitude_indexes = np.floor((traces - amp_min) *
+                                     (self.amplitude_bins / (amp_max - amp_min)))
+        valid = np.logical_and(amplitude_indexes >= 0, amplitude_indexes < self.amplitude_bins)
+        amplitude_indexes[np.logical_not(valid)] = 0  # nans and out of range values
+        indexes = (amplitude_indexes.astype(np.intp) + self._time_indexes)[valid]
+
+        counts = np.bincount(indexes, minlength=self._histogram.size)
+        if self._decay < 1.:
+            self._histogram *= self._decay
+        self._histogram += counts.reshape(self._histogram.shape)
+        self._n_traces += traces.shape[0]
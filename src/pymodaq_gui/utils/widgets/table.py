@@ -1,4 +1,5 @@
 import copy
+from io import BytesIO
 
 import numpy as np
 from qtpy.QtCore import QLocale, Qt, QModelIndex
@@ -198,6 +199,211 @@ class TableModel(QtCore.QAbstractTableModel):
         return True
 
 
+
+class ArrayTableModel(TableModel):
+    """TableModel storing its data in a NumPy structured array, a field per column
+
+    To be used for large tables (calibrations, lists of positions...): cells are read from the
+    array, rows are validated and inserted or removed in bulk (see insert_rows, remove_rows and
+    validate_rows) and the data is serialized as npy bytes (see to_npy_bytes).
+
+    Parameters
+    ----------
+    data: list of list, 2D ndarray or structured ndarray
+        the rows of the table (a structured array is used as is)
+    header: list of str
+        the titles of the columns
+    dtypes: list of dtype
+        the dtypes of the columns, float if None (or the ones of the fields of a structured data).
+        Strings should be given a maximum length, for instance 'U32'
+    editable: bool or list of bool
+    show_checkbox: bool
+    """
+
+    max_remove_batches = 64
+
+    def __init__(self, data, header, dtypes=None, editable=True, parent=None, show_checkbox=False):
+        data = self.make_array(data, header, dtypes)
+        super().__init__([], header, editable=editable, parent=parent, show_checkbox=show_checkbox)
+        self._data = data
+        self._checked = np.zeros((len(data),), dtype=bool)
+
+    @staticmethod
+    def make_array(data, header, dtypes=None) -> np.ndarray:
+        """Convert rows (or an already structured array) into a structured array, a field per column"""
+        if isinstance(data, np.ndarray) and data.dtype.names is not None:
+            return data.copy()
+        if dtypes is None:
+            dtypes = [float for _ in header]
+        dtype = np.dtype([(f'f{ind}', dtype) for ind, dtype in enumerate(dtypes)])
+        array = np.zeros((len(data),), dtype=dtype)
+        if isinstance(data, np.ndarray):
+            for ind, name in enumerate(dtype.names):
+                array[name] = data[:, ind]
+        else:
+            for ind, name in enumerate(dtype.names):
+                array[name] = [row[ind] for row in data]
+        return array
+
+    def __eq__(self, other):
+        if isinstance(other, ArrayTableModel):
+            return self._data.dtype == other._data.dtype and np.array_equal(self._data, other._data)
+        else:
+            return False
+
+    @property
+    def array(self) -> np.ndarray:
+        """The structured array of the data (not a copy)"""
+        return self._data
+
+    @property
+    def dtypes(self):
+        return [self._data.dtype[ind] for ind in range(len(self._data.dtype))]
+
+    @property
+    def raw_data(self):
+        return self._data.copy()
+
+    def is_checked(self, row: int):
+        return bool(self._checked[row])
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self._data)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self._data.dtype)
+
+    def get_data(self, row, col):
+        return self._data[self._data.dtype.names[col]][row].item()
+
+    def get_data_all(self):
+        return self._data.tolist()
+
+    def clear(self):
+        self.beginResetModel()
+        self._data = self._data[:0].copy()
+        self._checked = self._checked[:0].copy()
+        self.endResetModel()
+
+    def set_data_all(self, data):
+        data = self.make_array(data, self.header, self.dtypes)
+        self.beginResetModel()
+        self._data = data.astype(self._data.dtype)
+        self._checked = np.zeros((len(data),), dtype=bool)
+        self.endResetModel()
+
+    def data(self, index, role):
+        if index.isValid():
+            if role == Qt.DisplayRole or role == Qt.EditRole:
+                return self.get_data(index.row(), index.column())
+            elif role == Qt.CheckStateRole and index.column() == 0 and self._show_checkbox:
+                if self._checked[index.row()]:
+                    return Qt.CheckState.Checked
+                else:
+                    return Qt.CheckState.Unchecked
+        return QVariant()
+
+    def validate_rows(self, rows: np.ndarray) -> np.ndarray:
+        """
+        to be subclassed in order to validate ranges of values for many rows at once
+        Parameters
+        ----------
+        rows: (ndarray) structured array with the dtype of the table
+
+        Returns
+        -------
+        ndarray: boolean array, True for the valid rows
+        """
+        return np.ones((len(rows),), dtype=bool)
+
+    def validate_data(self, row, col, value):
+        """Validate a single cell using validate_rows on the row modified with value
+
+        Strings longer than the width of a string column are rejected rather than truncated
+        """
+        field_dtype = self._data.dtype[col]
+        if field_dtype.kind in 'US' and isinstance(value, (str, bytes)) and \
+                len(value) > field_dtype.itemsize // (4 if field_dtype.kind == 'U' else 1):
+            return False
+        candidate = self._data[row:row + 1].copy()
+        try:
+            candidate[self._data.dtype.names[col]] = value
+        except (ValueError, TypeError):
+            return False
+        return bool(self.validate_rows(candidate)[0])
+
+    def setData(self, index, value, role):
+        if index.isValid() and role == Qt.EditRole:
+            if self.validate_data(index.row(), index.column(), value):
+                self._data[self._data.dtype.names[index.column()]][index.row()] = value
+                self.dataChanged.emit(index, index, [role])
+                return True
+            else:
+                return False
+        return super().setData(index, value, role)
+
+    def insert_rows(self, row: int, data) -> int:
+        """Insert many rows at once (in a single beginInsertRows batch), the invalid rows (see
+        validate_rows) being skipped
+
+        Returns
+        -------
+        int: the number of inserted rows
+        """
+        rows = self.make_array(data, self.header, self.dtypes).astype(self._data.dtype)
+        rows = rows[self.validate_rows(rows)]
+        if len(rows) == 0:
+            return 0
+        self.beginInsertRows(QtCore.QModelIndex(), row, row + len(rows) - 1)
+        self._data = np.insert(self._data, row, rows)
+        self._checked = np.insert(self._checked, row, np.zeros((len(rows),), dtype=bool))
+        self.endInsertRows()
+        return len(rows)
+
+    def insertRows(self, row, count, parent):
+        if self.data_tmp is None:  # not from a drop: default rows
+            rows = np.zeros((count,), dtype=self._data.dtype)
+        else:
+            rows = [self.data_tmp for _ in range(count)]
+        return self.insert_rows(row, rows) == count
+
+    def remove_rows(self, rows):
+        """Remove many rows, a beginRemoveRows batch per block of contiguous rows
+
+        If the rows are scattered in more than max_remove_batches blocks, the model is reset instead
+        """
+        rows = np.unique(np.asarray(rows, dtype=int))
+        if len(rows) == 0:
+            return
+        starts = np.nonzero(np.diff(rows) != 1)[0] + 1
+        if len(starts) >= self.max_remove_batches:
+            self.beginResetModel()
+            self._data = np.delete(self._data, rows)
+            self._checked = np.delete(self._checked, rows)
+            self.endResetModel()
+            return
+        blocks = np.split(rows, starts)
+        for block in blocks[::-1]:
+            self.beginRemoveRows(QModelIndex(), int(block[0]), int(block[-1]))
+            self._data = np.delete(self._data, block)
+            self._checked = np.delete(self._checked, block)
+            self.endRemoveRows()
+
+    def removeRows(self, row, count, parent):
+        self.remove_rows(range(row, row + count))
+        return True
+
+    def to_npy_bytes(self) -> bytes:
+        """The data as the content of a npy file"""
+        buffer = BytesIO()
+        np.save(buffer, self._data, allow_pickle=False)
+        return buffer.getvalue()
+
+    @staticmethod
+    def array_from_npy_bytes(npy_bytes: bytes) -> np.ndarray:
+        return np.load(BytesIO(npy_bytes), allow_pickle=False)
+
+
 class BooleanDelegate(QtWidgets.QItemEditorFactory):
     """
     TO implement custom widget editor for cells in a tableview
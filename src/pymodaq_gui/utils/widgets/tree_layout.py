@@ -8,34 +8,47 @@ class TreeLayout(QObject):
     qtpy class object based on QtreeWidget
     The function populate_tree has to be used in order to populate the tree with structure as nested lists of dicts
 
+    If a model is given, the tree is a QTreeView displaying this model (only the first col_counts
+    columns are shown) and the clicked signals emit QModelIndex objects
+
     """
     status_sig = Signal(str)
     item_clicked_sig = Signal(object)
     item_double_clicked_sig = Signal(object)
     
-    def __init__(self, parent=None, col_counts=1, labels=None):
+    def __init__(self, parent=None, col_counts=1, labels=None, model: QtCore.QAbstractItemModel = None):
         
         super().__init__()
 
         if parent is None:
             parent = QtWidgets.QWidget()
         self.parent = parent
+        self.model = model
 
         self.setupUi()
 
-        self.tree.setColumnCount(col_counts)
-        if labels is not None:
-            self.tree.setHeaderLabels(labels)
+        if model is None:
+            self.tree.setColumnCount(col_counts)
+            if labels is not None:
+                self.tree.setHeaderLabels(labels)
+            self.tree.itemClicked.connect(self.item_clicked_sig.emit)
+            self.tree.itemDoubleClicked.connect(self.item_double_clicked_sig.emit)
+        else:
+            self.tree.setModel(model)
+            for col_index in range(col_counts, model.columnCount()):
+                self.tree.setColumnHidden(col_index, True)
+            self.tree.clicked.connect(self.item_clicked_sig.emit)
+            self.tree.doubleClicked.connect(self.item_double_clicked_sig.emit)
 
         self.open_tree_pb.clicked.connect(self.expand_all)
         self.close_tree_pb.clicked.connect(self.collapse_all)
         self.open_tree_selected_pb.clicked.connect(self.open_tree_selection)
-        
-        self.tree.itemClicked.connect(self.item_clicked_sig.emit)
-        self.tree.itemDoubleClicked.connect(self.item_double_clicked_sig.emit)
 
     def _current_text(self, col_index: int = 2):
-        return self.tree.currentItem().text(col_index)
+        if self.model is None:
+            return self.tree.currentItem().text(col_index)
+        index = self.tree.currentIndex()
+        return index.sibling(index.row(), col_index).data()
 
     def current_node_path(self):
         return self._current_text(2)
@@ -43,6 +56,9 @@ class TreeLayout(QObject):
     def expand_all(self):
         self.tree.expandAll()
 
+    def expand_to_depth(self, depth: int):
+        self.tree.expandToDepth(depth)
+
     def collapse_all(self):
         self.tree.collapseAll()
 
@@ -54,7 +70,7 @@ class TreeLayout(QObject):
         vlayout = QtWidgets.QVBoxLayout()
         hlayout = QtWidgets.QHBoxLayout()
 
-        self.tree = CustomTree()
+        self.tree = CustomTree() if self.model is None else CustomTreeView()
         vlayout.addWidget(self.tree)
 
         iconopen = QtGui.QIcon()
@@ -158,6 +174,14 @@ class CustomTree(QtWidgets.QTreeWidget):
         self.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
 
 
+class CustomTreeView(QtWidgets.QTreeView):
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
+        self.setUniformRowHeights(True)
+
+
 if __name__ == '__main__':
 
 
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+import queue
+
+import numpy as np
+import pytest
+
+from pymodaq_data import data as data_mod
+from pymodaq_data.h5modules.saving import H5SaverLowLevel
+from pymodaq_data.h5modules.data_saving import DataToExportEnlargeableSaver
+
+from pymodaq_gui.h5modules import saving
+
+
+tested_backend = ['tables', 'h5py']
+N_FRAMES = 100
+
+
+@pytest.fixture(params=tested_backend)
+def get_h5saver(request, qtbot, tmp_path):
+    h5saver = saving.H5Saver(save_type='detector', backend=request.param)
+    h5saver.init_file(update_h5=True, addhoc_file_path=tmp_path.joinpath('async.h5'))
+    yield h5saver
+    h5saver.close()
+
+
+def add_earray(h5saver, shape=(10,)):
+    return h5saver.add_array(h5saver.raw_group, 'data', 'data', data_shape=shape, array_type=float,
+                             data_dimension='Data1D', enlargeable=True)
+
+
+class TestAsyncWriting:
+    def test_coalesced_appends(self, get_h5saver):
+        h5saver = get_h5saver
+        array = add_earray(h5saver)
+        h5saver.settings.child('async_options', 'async_write').setValue(True)
+        assert h5saver.is_async
+
+        frames = np.random.rand(N_FRAMES, 10)
+        with h5saver.writer.lock:  # the appends pile up in the queue
+            for frame in frames:
+                h5saver.append(array, frame)
+        assert h5saver.flush(wait=True).is_set()
+
+        assert array.attrs['shape'] == (N_FRAMES, 10)
+        assert np.allclose(array.read(), frames)
+        metrics = h5saver.writer.metrics()
+        assert metrics['n_requests'] == N_FRAMES + 1  # and the flush
+        assert metrics['n_writes'] < N_FRAMES
+        assert metrics['written_bytes'] == frames.nbytes
+        h5saver.update_write_metrics()
+        assert h5saver.settings['async_options', 'max_queue_depth'] > 1
+
+    def test_buffer_reuse_and_order(self, get_h5saver):
+        h5saver = get_h5saver
+        array = add_earray(h5saver, shape=(1,))
+        h5saver.set_async_writing(True)
+        buffer = np.zeros((1,))
+        for ind in range(N_FRAMES):
+            buffer[0] = ind
+            h5saver.append(array, buffer)
+            if ind == N_FRAMES // 2:
+                h5saver.submit(lambda: h5saver.set_attr(array, 'middle', len(array)))
+        h5saver.flush(wait=True)
+        assert np.allclose(array.read().squeeze(), np.arange(N_FRAMES))
+        assert 0 < h5saver.get_attr(array, 'middle') <= N_FRAMES // 2 + 1
+
+    def test_backpressure(self, get_h5saver):
+        h5saver = get_h5saver
+        array = add_earray(h5saver)
+        h5saver.settings.child('async_options', 'queue_size').setValue(1)
+        h5saver.set_async_writing(True)
+        with h5saver.writer.lock:
+            h5saver.append(array, np.zeros((10,)))  # taken by the writer which waits for the lock
+            h5saver.append(array, np.zeros((10,)))  # fills the queue
+            with pytest.raises(queue.Full):
+                h5saver.append(array, np.zeros((10,)), timeout=0.1)
+        h5saver.flush(wait=True)
+        assert array.attrs['shape'] == (2, 10)
+        assert h5saver.writer.metrics()['blocked_time'] >= 0.1
+
+    def test_flush_signal(self, qtbot, get_h5saver):
+        h5saver = get_h5saver
+        array = add_earray(h5saver)
+        h5saver.set_async_writing(True)
+        h5saver.append(array, np.ones((10,)))
+        with qtbot.waitSignal(h5saver.flushed_sig, timeout=5000):
+            event = h5saver.flush()
+        assert event.wait(5)
+
+    def test_flush_does_not_block(self, get_h5saver):
+        h5saver = get_h5saver
+        h5saver.set_async_writing(True)
+        with h5saver.writer.lock:  # the writer thread is busy
+            event = h5saver.flush()  # queued, the caller is not blocked
+            assert not event.wait(0.2)
+        assert event.wait(5)
+
+    def test_data_saver(self, get_h5saver):
+        h5saver = get_h5saver
+        data_saver = DataToExportEnlargeableSaver(h5saver, enl_axis_names=('time',), enl_axis_units=('s',))
+        h5saver.set_async_writing(True)
+        frame = np.zeros((10,))
+        dte = data_mod.DataToExport('dte', data=[data_mod.DataRaw('raw', data=[frame])])
+        for ind in range(N_FRAMES):
+            frame[:] = ind  # the data are copied before being queued
+            h5saver.add_data(data_saver, h5saver.raw_group, dte, axis_values=[float(ind)])
+        h5saver.flush(wait=True)
+        assert h5saver.writer.metrics()['n_requests'] == N_FRAMES + 1  # and the flush
+        array = h5saver.get_node('/RawData/Data1D/CH00/EnlData00')
+        assert np.allclose(array.read()[:, 0], np.arange(N_FRAMES))
+
+    def test_close_writes_pending(self, get_h5saver):
+        h5saver = get_h5saver
+        array = add_earray(h5saver)
+        h5saver.set_async_writing(True)
+        for ind in range(N_FRAMES):
+            h5saver.append(array, ind * np.ones((10,)))
+        file_path = h5saver.file_path
+        backend = h5saver.backend
+        h5saver.close_file()
+        assert h5saver.writer.is_running
+
+        h5reader = H5SaverLowLevel(backend=backend)
+        h5reader.init_file(file_path)
+        assert h5reader.get_node('/RawData/Data').attrs['shape'] == (N_FRAMES, 10)
+        h5reader.close_file()
+
+    def test_sync_mode(self, get_h5saver):
+        h5saver = get_h5saver
+        array = add_earray(h5saver)
+        assert not h5saver.is_async
+        h5saver.append(array, np.ones((10,)))
+        assert array.attrs['shape'] == (1, 10)
+        assert h5saver.flush().is_set()
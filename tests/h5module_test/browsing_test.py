@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+import threading
+
+import numpy as np
+import pytest
+
+from qtpy import QtWidgets
+
+from pymodaq_data import data as data_mod
+from pymodaq_data.h5modules.saving import H5SaverLowLevel
+from pymodaq_data.h5modules.data_saving import DataToExportSaver, DataLoader
+
+from pymodaq_gui.h5modules.browsing import H5Browser
+from pymodaq_gui.h5modules.node_loader import H5NodeLoader
+from pymodaq_gui.h5modules.tree_model import H5TreeModel
+
+
+tested_backend = ['tables', 'h5py']
+N_DETECTORS = 5
+
+
+def create_file(file_path, backend='tables'):
+    h5saver = H5SaverLowLevel(backend=backend)
+    h5saver.init_file(file_path, new_file=True)
+    saver = DataToExportSaver(h5saver)
+    for ind in range(N_DETECTORS):
+        det_group = h5saver.add_det_group(h5saver.raw_group, title=f'det{ind}')
+        dte = data_mod.DataToExport('mydte', data=[
+            data_mod.DataRaw('mydata', data=[ind + np.random.rand(10)])])
+        saver.add_data(det_group, dte)
+    h5saver.root().attrs['pymodaq_version'] = '5.0.0'
+    h5saver.close_file()
+    return file_path
+
+
+def get_browser(qtbot, tmp_path, backend='tables') -> H5Browser:
+    file_path = create_file(tmp_path.joinpath('browsing.h5'), backend)
+    win = QtWidgets.QMainWindow()
+    qtbot.addWidget(win)
+    return H5Browser(win, h5file_path=file_path, backend=backend)
+
+
+@pytest.fixture(params=tested_backend)
+def init_browser(request, qtbot, tmp_path):
+    browser = get_browser(qtbot, tmp_path, request.param)
+    yield browser
+    browser.quit_fun()
+
+
+@pytest.fixture
+def init_browser_loading(qtbot, tmp_path):
+    """Loading data with the h5py backend is not supported by the DataLoader"""
+    browser = get_browser(qtbot, tmp_path, 'tables')
+    yield browser
+    browser.quit_fun()
+
+
+class TestH5TreeModel:
+    def test_lazy_population(self, init_browser):
+        browser = init_browser
+        model: H5TreeModel = browser.view.tree_model
+        root_index = model.index(0, 0)
+        assert model.data(root_index.sibling(0, 2)) == '/'
+        raw_index = model.index(0, 0, root_index)
+        assert model.data(raw_index) == 'RawData'
+        assert model.rowCount(raw_index) == N_DETECTORS + 1  # detectors and the logger
+
+        det_index = model.index(0, 0, raw_index)
+        det_item = model.item_from_index(det_index)
+        assert det_item.path == '/RawData/Detector000'
+        assert det_item.pending_names is None
+        assert model.rowCount(det_index) == 0
+        assert model.hasChildren(det_index)
+        assert model.canFetchMore(det_index)
+
+        model.fetchMore(det_index)
+        assert model.rowCount(det_index) == 1
+        assert not model.canFetchMore(det_index)
+
+    def test_fetch_by_batch(self, init_browser):
+        browser = init_browser
+        model = H5TreeModel(fetch_batch_size=2)
+        model.set_backend(browser.h5utils)
+        root_index = model.index(0, 0)
+        model.fetchMore(root_index)
+        raw_index = model.index(0, 0, root_index)
+        model.fetchMore(raw_index)
+        assert model.rowCount(raw_index) == 2
+        model.fetch_all(raw_index)
+        assert model.rowCount(raw_index) == N_DETECTORS + 1
+        assert [model.data(model.index(row, 0, raw_index)) for row in range(N_DETECTORS)] == \
+               [f'Detector{ind:03d}' for ind in range(N_DETECTORS)]
+
+    def test_index_from_path(self, init_browser):
+        browser = init_browser
+        model = browser.view.tree_model
+        path = '/RawData/Detector003/Data1D/CH00/Data00'
+        index = model.index_from_path(path)
+        assert index.isValid()
+        assert model.item_from_index(index).path == path
+        assert not model.index_from_path('/RawData/Detector003/not_a_node').isValid()
+
+        model.clear()
+        assert model.rowCount() == 0
+        assert not model.index_from_path(path).isValid()
+
+
+def test_browser_show_data(qtbot, init_browser_loading):
+    browser = init_browser_loading
+    path = '/RawData/Detector002/Data1D/CH00/Data00'
+    browser.view.h5file_tree.tree.setCurrentIndex(browser.view.tree_model.index_from_path(path))
+    assert browser.get_tree_node_path() == path
+
+    nodes = []
+    browser.data_node_signal.connect(nodes.append)
+    with qtbot.waitSignal(browser.node_loader.data_loaded, timeout=5000) as blocker:
+        browser.show_h5_data(None)
+        # attributes are displayed before the data is loaded
+        assert 'data_type' in [child.name() for child in browser.settings_attributes.settings.children()]
+    assert nodes == [path]
+    assert blocker.args[0] == path
+    assert np.allclose(blocker.args[1][0], browser.hyper_viewer._data[0])
+    assert not browser.node_loader.is_loading
+
+
+class TestH5NodeLoader:
+    def test_newer_request_supersedes(self, qtbot, init_browser_loading):
+        browser = init_browser_loading
+        loader = browser.node_loader
+        loaded = []
+        loader.data_loaded.connect(lambda path, dwa: loaded.append(path))
+        with browser.node_loader.lock:  # the requests pile up while the file is locked
+            for ind in range(N_DETECTORS):
+                loader.load(f'/RawData/Detector{ind:03d}/Data1D/CH00/Data00')
+            assert loader.is_loading
+        qtbot.waitUntil(lambda: not loader.is_loading, timeout=5000)
+        assert loaded == [f'/RawData/Detector{N_DETECTORS - 1:03d}/Data1D/CH00/Data00']
+
+    def test_cancel(self, qtbot, init_browser_loading):
+        browser = init_browser_loading
+        loader = browser.node_loader
+        loaded = []
+        loader.data_loaded.connect(lambda path, dwa: loaded.append(path))
+        with browser.node_loader.lock:
+            loader.load('/RawData/Detector000/Data1D/CH00/Data00')
+            browser.cancel_loading()
+            assert not loader.is_loading
+        assert loader.wait(5000)
+        QtWidgets.QApplication.processEvents()
+        assert loaded == []
+
+    def test_lock_released_between_chunks(self, qtbot, tmp_path):
+        file_path = tmp_path.joinpath('large.h5')
+        h5saver = H5SaverLowLevel()
+        h5saver.init_file(file_path, new_file=True)
+        det_group = h5saver.add_det_group(h5saver.raw_group, title='det')
+        DataToExportSaver(h5saver).add_data(det_group, data_mod.DataToExport('mydte', data=[
+            data_mod.DataRaw('mydata', data=[np.arange(10000.)])]))
+        h5saver.close_file()
+        h5saver.open_file(file_path, 'r')
+
+        acquisitions = []
+
+        class RecordingLock:
+            def __init__(self):
+                self._lock = threading.RLock()
+
+            def __enter__(self):
+                self._lock.acquire()
+                acquisitions.append(threading.current_thread())
+
+            def __exit__(self, *args):
+                self._lock.release()
+
+        loader = H5NodeLoader(DataLoader(h5saver), RecordingLock(), chunk_bytes=8 * 100)
+        with qtbot.waitSignal(loader.data_loaded, timeout=5000) as blocker:
+            loader.load('/RawData/Detector000/Data1D/CH00/Data00')
+        assert np.allclose(blocker.args[1][0], np.arange(10000.))
+        assert len(acquisitions) > 100  # one per block of 100 values
+        h5saver.close_file()
+
+    def test_failure(self, qtbot, init_browser_loading):
+        loader = init_browser_loading.node_loader
+        with qtbot.waitSignal(loader.load_failed, timeout=5000) as blocker:
+            loader.load('/RawData/not_a_node')
+        assert blocker.args[0] == '/RawData/not_a_node'
+        assert not loader.is_loading
+
+
+def test_comments_invalidate_cache(qtbot, init_browser_loading):
+    browser = init_browser_loading
+    path = '/RawData/Detector001/Data1D/CH00/Data00'
+    browser.data_loader.load_data(path)
+    key = browser.data_loader.get_key(path)
+    assert key in browser.data_loader.cache
+
+    browser.view.h5file_tree.tree.setCurrentIndex(browser.view.tree_model.index_from_path(path))
+    browser.add_comments(True, comment='a comment')
+    assert key not in browser.data_loader.cache
+    assert browser.h5utils.get_node(path).attrs['comments'] == 'a comment'
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+import numpy as np
+import pytest
+
+from qtpy import QtWidgets
+
+from pymodaq_data import data as data_mod
+from pymodaq_data.h5modules.saving import H5SaverLowLevel
+from pymodaq_data.h5modules.data_saving import DataToExportSaver
+
+from pymodaq_gui.h5modules.browsing import H5Browser
+from pymodaq_gui.h5modules.bulk_export import (H5BulkExporter, get_array_nodes, get_format_from_filter,
+                                               get_export_filters)
+
+
+tested_backend = ['tables', 'h5py']
+N_DETECTORS = 3
+DATA1D_PATH = '/RawData/Detector{:03d}/Data1D/CH00/Data00'
+DATA2D_PATH = '/RawData/Detector{:03d}/Data2D/CH00/Data00'
+
+
+def create_file(file_path, backend='tables'):
+    h5saver = H5SaverLowLevel(backend=backend)
+    h5saver.init_file(file_path, new_file=True)
+    saver = DataToExportSaver(h5saver)
+    for ind in range(N_DETECTORS):
+        det_group = h5saver.add_det_group(h5saver.raw_group, title=f'det{ind}')
+        dte = data_mod.DataToExport('mydte', data=[
+            data_mod.DataRaw('data1D', data=[ind + np.arange(100.)]),
+            data_mod.DataRaw('data2D', data=[ind + np.arange(200.).reshape((10, 20))])])
+        saver.add_data(det_group, dte)
+    h5saver.root().attrs['pymodaq_version'] = '5.0.0'
+    h5saver.flush()
+    return h5saver
+
+
+@pytest.fixture(params=tested_backend)
+def get_h5saver(request, tmp_path):
+    h5saver = create_file(tmp_path.joinpath('export.h5'), request.param)
+    yield h5saver
+    h5saver.close_file()
+
+
+def run_export(qtbot, exporter: H5BulkExporter, *args):
+    with qtbot.waitSignal(exporter.finished, timeout=10000) as blocker:
+        exporter.export(*args)
+    return blocker.args[0]
+
+
+def test_filters():
+    filters = get_export_filters().split(';;')
+    assert [get_format_from_filter(file_filter) for file_filter in filters] == ['npy', 'npz', 'csv', 'h5']
+    assert get_format_from_filter('Text files (*.txt)') is None
+
+
+def test_get_array_nodes(get_h5saver):
+    paths = get_array_nodes(get_h5saver, ['/RawData/Detector001', DATA1D_PATH.format(1)])
+    assert DATA1D_PATH.format(1) in paths
+    assert DATA2D_PATH.format(1) in paths
+    assert len(paths) == len(set(paths))
+    assert '/RawData/Logger' not in get_array_nodes(get_h5saver, ['/RawData'])
+
+
+class TestBulkExporter:
+    def test_npy(self, qtbot, get_h5saver, tmp_path):
+        exporter = H5BulkExporter(chunk_bytes=64)  # many chunks per array
+        progress = []
+        exporter.progress.connect(lambda done, total: progress.append((done, total)))
+        assert run_export(qtbot, exporter, get_h5saver, ['/RawData'], tmp_path.joinpath('npy'), 'npy')
+        assert progress[-1][0] == progress[-1][1] > 0
+        for ind in range(N_DETECTORS):
+            array = np.load(tmp_path.joinpath('npy', *DATA2D_PATH.format(ind).strip('/').split('/')).with_suffix('.npy'))
+            assert np.allclose(array, ind + np.arange(200.).reshape((10, 20)))
+
+    def test_npz(self, qtbot, get_h5saver, tmp_path):
+        exporter = H5BulkExporter(chunk_bytes=64)
+        file_path = tmp_path.joinpath('export.npz')
+        assert run_export(qtbot, exporter, get_h5saver, ['/RawData/Detector002'], file_path, 'npz')
+        with np.load(file_path) as npz:
+            assert np.allclose(npz[DATA1D_PATH.format(2).strip('/')].squeeze(), 2 + np.arange(100.))
+            assert all([key.startswith('RawData/Detector002') for key in npz.keys()])
+
+    def test_csv(self, qtbot, get_h5saver, tmp_path):
+        exporter = H5BulkExporter(chunk_bytes=64)
+        assert run_export(qtbot, exporter, get_h5saver, ['/RawData/Detector000'], tmp_path, 'csv')
+        files = list(tmp_path.rglob('*.csv'))
+        assert tmp_path.joinpath(*DATA1D_PATH.format(0).strip('/').split('/')).with_suffix('.csv') in files
+        assert not tmp_path.joinpath(*DATA2D_PATH.format(0).strip('/').split('/')).with_suffix('.csv').exists()
+        array = np.loadtxt(tmp_path.joinpath(*DATA1D_PATH.format(0).strip('/').split('/')).with_suffix('.csv'),
+                           delimiter=',')
+        assert np.allclose(array, np.arange(100.))
+
+    def test_h5_copy(self, qtbot, get_h5saver, tmp_path):
+        exporter = H5BulkExporter()
+        file_path = tmp_path.joinpath('copy.h5')
+        assert run_export(qtbot, exporter, get_h5saver, ['/RawData/Detector001'], file_path, 'h5')
+        h5reader = H5SaverLowLevel(backend=get_h5saver.backend)
+        h5reader.open_file(file_path, 'r+')
+        assert np.allclose(h5reader.get_node(DATA2D_PATH.format(1)).read(), 1 + np.arange(200.).reshape((10, 20)))
+        assert '/RawData/Detector000' not in [node.path for node in h5reader.walk_nodes('/')]
+        h5reader.close_file()
+
+    def test_cancel(self, qtbot, get_h5saver, tmp_path):
+        exporter = H5BulkExporter(max_workers=1, chunk_bytes=64)
+        with exporter.lock:  # the tasks cannot read anything while the lock is held
+            with qtbot.waitSignal(exporter.finished, timeout=10000) as blocker:
+                exporter.export(get_h5saver, ['/RawData'], tmp_path, 'npy')
+                assert exporter.is_running
+                exporter.cancel()
+                exporter.lock.release()
+                try:
+                    exporter.wait()
+                finally:
+                    exporter.lock.acquire()
+        assert blocker.args == [False]
+        assert not exporter.is_running
+
+    def test_invalid_format(self, get_h5saver, tmp_path):
+        with pytest.raises(ValueError):
+            H5BulkExporter().export(get_h5saver, ['/RawData'], tmp_path, 'mat')
+
+
+def test_browser_bulk_export(qtbot, tmp_path):
+    create_file(tmp_path.joinpath('browsing.h5')).close_file()
+    win = QtWidgets.QMainWindow()
+    qtbot.addWidget(win)
+    browser = H5Browser(win, h5file_path=tmp_path.joinpath('browsing.h5'))
+    tree = browser.view.h5file_tree.tree
+    tree.selectionModel().select(browser.view.tree_model.index_from_path('/RawData/Detector000'),
+                                 tree.selectionModel().Select | tree.selectionModel().Rows)
+    tree.selectionModel().select(browser.view.tree_model.index_from_path('/RawData/Detector002'),
+                                 tree.selectionModel().Select | tree.selectionModel().Rows)
+    assert browser.view.selected_node_paths() == ['/RawData/Detector000', '/RawData/Detector002']
+    with qtbot.waitSignal(browser.bulk_exporter.finished, timeout=10000):
+        browser.bulk_export(browser.view.selected_node_paths(), tmp_path.joinpath('export.npz'), 'npz')
+    with np.load(tmp_path.joinpath('export.npz')) as npz:
+        assert DATA1D_PATH.format(2).strip('/') in npz.keys()
+        assert DATA1D_PATH.format(1).strip('/') not in npz.keys()
+    assert not browser.view._export_widget.isVisible()
+    browser.quit_fun()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+import numpy as np
+import pytest
+
+from pymodaq_gui.h5modules import saving
+from pymodaq_gui.h5modules.chunking import (get_chunk_shape, calibrate_compression, select_compression,
+                                            CompressionResult, MAX_UNKNOWN_ROWS)
+
+
+tested_backend = ['tables', 'h5py']
+
+
+@pytest.fixture(params=tested_backend)
+def get_h5saver(request, qtbot, tmp_path):
+    h5saver = saving.H5Saver(save_type='detector', backend=request.param)
+    h5saver.init_file(update_h5=True, addhoc_file_path=tmp_path.joinpath('chunking.h5'))
+    yield h5saver
+    h5saver.close()
+
+
+class TestChunkShape:
+    def test_small_elements(self):
+        assert get_chunk_shape((), float, expected_rows=10000, target_bytes=8 * 1024) == (1024,)
+        assert get_chunk_shape((1,), float, expected_rows=10000, target_bytes=8 * 1024) == (1024, 1)
+        assert get_chunk_shape((128,), np.uint16, expected_rows=10000, target_bytes=1024 ** 2) == (4096, 128)
+
+    def test_expected_rows(self):
+        assert get_chunk_shape((128,), np.uint16, expected_rows=100, target_bytes=1024 ** 2) == (100, 128)
+
+    def test_unknown_rows(self):
+        assert get_chunk_shape((), float, target_bytes=1024 ** 2) == (MAX_UNKNOWN_ROWS,)
+        assert get_chunk_shape((1,), float, target_bytes=1024 ** 2) == (MAX_UNKNOWN_ROWS, 1)
+        assert get_chunk_shape((1024,), float, target_bytes=8 * 1024) == (1, 1024)
+
+    def test_large_elements(self):
+        chunk_shape = get_chunk_shape((2048, 2048), np.float64, target_bytes=1024 ** 2)
+        assert chunk_shape[0] == 1
+        assert chunk_shape[-1] == 2048  # the fastest varying dimension is kept contiguous
+        assert 8 * np.prod(chunk_shape) <= 1024 ** 2
+
+
+class TestCompression:
+    @pytest.mark.parametrize('backend', tested_backend)
+    def test_calibrate(self, backend):
+        frame = np.tile(np.arange(256, dtype=np.uint16), (64, 1))
+        results = calibrate_compression(frame, backend, levels=(0, 5), n_frames=8)
+        assert [result.level for result in results] == [0, 5]
+        assert results[0].ratio == pytest.approx(1., rel=0.05)
+        assert results[1].ratio > 2
+        assert all([result.speed > 0 for result in results])
+
+    def test_select(self):
+        results = [CompressionResult('zlib', 0, 1000., 1.), CompressionResult('zlib', 1, 200., 3.),
+                   CompressionResult('zlib', 9, 20., 4.)]
+        assert select_compression(results, 1.).level == 0
+        assert select_compression(results, 0.5).level == 1
+        assert select_compression(results, 0.1).level == 9
+        assert select_compression([]) is None
+
+
+class TestH5SaverChunking:
+    def test_library_default(self, get_h5saver):
+        h5saver = get_h5saver
+        assert h5saver.settings['compression_options', 'chunk_size'] == 0
+        assert h5saver.get_chunk_shape((), np.float64) is None
+
+    def test_chunked_earray(self, get_h5saver):
+        h5saver = get_h5saver
+        h5saver.settings.child('compression_options', 'chunk_size').setValue(64)
+        h5saver.settings.child('compression_options', 'expected_rows').setValue(50)
+        array = h5saver.add_array(h5saver.raw_group, 'data', 'data', data_shape=(256,), array_type=np.float64,
+                                  data_dimension='Data1D', enlargeable=True)
+        chunks = array.array.chunkshape if h5saver.backend == 'tables' else array.array.chunks
+        assert tuple(chunks) == (32, 256)
+        assert array.attrs['shape'] == (0, 256)
+        h5saver.append(array, np.ones((256,)))
+        assert array.attrs['shape'] == (1, 256)
+
+    def test_calibrate(self, get_h5saver):
+        h5saver = get_h5saver
+        assert h5saver.calibrate_compression() == []
+        array = h5saver.add_array(h5saver.raw_group, 'data', 'data', data_shape=(1000,), array_type=np.float64,
+                                  data_dimension='Data1D', enlargeable=True)
+        h5saver.append(array, np.zeros((1000,)))
+        h5saver.settings.child('compression_options', 'size_budget').setValue(0.5)
+        results = h5saver.calibrate_compression()
+        assert len(results) > 1
+        assert h5saver.settings['compression_options', 'h5comp_level'] > 0
+        assert '*' in h5saver.settings['compression_options', 'calibration_results']
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+import os
+
+import numpy as np
+import pytest
+
+from pymodaq_data import data as data_mod
+from pymodaq_data.h5modules.saving import H5SaverLowLevel
+from pymodaq_data.h5modules.data_saving import DataToExportSaver
+
+from pymodaq_gui.h5modules.data_cache import DataCache, CachedDataLoader, get_nbytes
+
+
+DATA_PATH = '/RawData/Detector000/Data1D/CH00/Data00'
+
+
+def get_dwa(size=100):
+    return data_mod.DataRaw('mydata', data=[np.random.rand(size)])
+
+
+@pytest.fixture
+def h5saver(tmp_path):
+    h5saver = H5SaverLowLevel()
+    h5saver.init_file(tmp_path.joinpath('cache.h5'), new_file=True)
+    det_group = h5saver.add_det_group(h5saver.raw_group, title='det')
+    DataToExportSaver(h5saver).add_data(det_group, data_mod.DataToExport('mydte', data=[get_dwa(10)]))
+    h5saver.flush()
+    yield h5saver
+    h5saver.close_file()
+
+
+class TestDataCache:
+    def test_lru_eviction(self):
+        dwas = [get_dwa() for _ in range(4)]
+        nbytes = get_nbytes(dwas[0])
+        cache = DataCache(max_bytes=3 * nbytes)
+        for ind, dwa in enumerate(dwas[:3]):
+            cache.put(ind, dwa)
+        assert len(cache) == 3
+        assert cache.nbytes == 3 * nbytes
+
+        assert cache.get(0) == dwas[0]  # 0 becomes the most recently used
+        cache.put(3, dwas[3])
+        assert 1 not in cache
+        assert all([key in cache for key in (0, 2, 3)])
+        assert cache.nbytes == 3 * nbytes
+
+        cache.max_bytes = nbytes
+        assert list(cache._items.keys()) == [3]
+
+    def test_too_large(self):
+        cache = DataCache(max_bytes=10)
+        cache.put('key', get_dwa())
+        assert len(cache) == 0
+        assert cache.get('key') is None
+        assert cache.misses == 1
+
+    def test_copy(self):
+        dwa = get_dwa()
+        cache = DataCache()
+        cache.put('key', dwa)
+        dwa[0][0] = -1.
+        cached = cache.get('key')
+        assert cached[0][0] != -1.
+        cached[0][1] = -1.
+        assert cache.get('key')[0][1] != -1.
+        assert cache.hits == 2
+
+    def test_invalidate(self):
+        cache = DataCache()
+        cache.put(('file1', '/a'), get_dwa())
+        cache.put(('file1', '/b'), get_dwa())
+        cache.put(('file2', '/a'), get_dwa())
+        cache.invalidate('file1')
+        assert len(cache) == 1
+        assert cache.nbytes == get_nbytes(get_dwa())
+        cache.invalidate()
+        assert len(cache) == 0
+        assert cache.nbytes == 0
+
+
+class TestCachedDataLoader:
+    def test_load_from_cache(self, h5saver):
+        cache = DataCache()
+        loader = CachedDataLoader(h5saver, cache)
+        dwa = loader.load_data(DATA_PATH)
+        assert cache.misses == 1
+        assert len(cache) == 1
+        dwa_cached = loader.load_data(h5saver.get_node(DATA_PATH))  # same key from the node
+        assert cache.hits == 1
+        assert dwa_cached == dwa
+
+        loader.load_data(DATA_PATH, with_bkg=True)
+        assert len(cache) == 2
+
+    def test_modification_time(self, h5saver):
+        cache = DataCache()
+        loader = CachedDataLoader(h5saver, cache)
+        loader.load_data(DATA_PATH)
+        stat = os.stat(h5saver.filename)
+        os.utime(h5saver.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        loader.load_data(DATA_PATH)
+        assert cache.hits == 0
+        assert cache.misses == 2
+
+        loader.invalidate()
+        assert len(cache) == 0
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+import datetime
+import os
+
+import pytest
+
+from pymodaq_gui.h5modules import saving
+from pymodaq_gui.h5modules.directory_index import DirectoryIndex
+
+
+def set_old_mtime(path):
+    """Move the mtime of path in the past so that its content is not considered as racy"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 * 10 ** 9))
+
+
+class TestDirectoryIndex:
+    def test_cached_listing(self, tmp_path):
+        tmp_path.joinpath('dir').mkdir()
+        tmp_path.joinpath('file.h5').touch()
+        set_old_mtime(tmp_path)
+        index = DirectoryIndex()
+        assert index.subdirs(tmp_path) == ['dir']
+        assert index.files(tmp_path) == ['file.h5']
+        assert sorted(index.list(tmp_path)) == ['dir', 'file.h5']
+        assert index.n_scans == 1
+
+    def test_mtime_validation(self, tmp_path):
+        set_old_mtime(tmp_path)
+        index = DirectoryIndex()
+        assert index.list(tmp_path) == []
+        tmp_path.joinpath('other.h5').touch()  # created outside the index
+        assert index.files(tmp_path) == ['other.h5']
+        assert index.n_scans == 2
+
+    def test_racy_directory(self, tmp_path):
+        index = DirectoryIndex()
+        index.list(tmp_path)  # just created: the mtime cannot be trusted
+        index.list(tmp_path)
+        assert index.n_scans == 2
+
+    def test_add(self, tmp_path):
+        set_old_mtime(tmp_path)
+        index = DirectoryIndex()
+        index.list(tmp_path)
+        tmp_path.joinpath('new_dir').mkdir()
+        index.add(tmp_path.joinpath('new_dir'))
+        assert index.subdirs(tmp_path) == ['new_dir']
+        assert index.n_scans == 1
+
+    def test_missing(self, tmp_path):
+        index = DirectoryIndex()
+        assert index.list(tmp_path.joinpath('not_a_dir')) == []
+
+
+@pytest.fixture
+def path_index(monkeypatch):
+    index = DirectoryIndex(racy_delay=0.)
+    monkeypatch.setattr(saving.H5SaverBase, 'path_index', index)
+    return index
+
+
+def test_set_current_scan_path(path_index, tmp_path):
+    date = datetime.date(2026, 10, 19)
+    dataset_path, scan_name, _ = saving.H5SaverBase.set_current_scan_path(tmp_path, curr_date=date)
+    day_path = tmp_path.joinpath('2026', '20261019')
+    assert dataset_path == day_path.joinpath('Dataset_20261019_000')
+    assert scan_name == 'Scan000'
+
+    for ind in range(3):
+        day_path.joinpath(f'Dataset_20261019_{ind:03d}.h5').touch()
+        path_index.add(day_path.joinpath(f'Dataset_20261019_{ind:03d}.h5'))
+    n_scans = path_index.n_scans
+    dataset_path, _, _ = saving.H5SaverBase.set_current_scan_path(tmp_path, update_h5=True, curr_date=date)
+    assert dataset_path == day_path.joinpath('Dataset_20261019_003')
+    dataset_path, _, _ = saving.H5SaverBase.set_current_scan_path(tmp_path, update_h5=False, curr_date=date)
+    assert dataset_path == day_path.joinpath('Dataset_20261019_002')
+    assert path_index.n_scans == n_scans  # no directory has been scanned again
+
+
+def test_init_file_updates_index(qtbot, path_index, tmp_path):
+    h5saver = saving.H5Saver(save_type='detector')
+    h5saver.settings.child('base_path').setValue(str(tmp_path))
+    h5saver.init_file(update_h5=True)
+    file_path = h5saver.h5_file_path.joinpath(h5saver.h5_file_name)
+    assert file_path.name in path_index.files(file_path.parent)
+    h5saver.close_file()
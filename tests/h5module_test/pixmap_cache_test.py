@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+from qtpy import QtGui, QtCore, QtWidgets
+
+from pymodaq_gui.h5modules.pixmap_cache import PixmapCache
+from pymodaq_gui.h5modules.browsing import View
+
+
+def get_png(width=40, height=20) -> bytes:
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_RGB32)
+    image.fill(QtGui.QColor('red'))
+    buffer = QtCore.QBuffer()
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    image.save(buffer, 'PNG')
+    return bytes(buffer.data())
+
+
+class TestPixmapCache:
+    def test_decode(self, qtbot):
+        cache = PixmapCache()
+        pixmap = cache.decode('key', get_png())
+        assert pixmap.size() == QtCore.QSize(40, 20)
+        assert cache.decode('key', b'') is pixmap  # not decoded again
+
+        scaled = cache.get('key', 10)
+        assert scaled.height() == 10
+        assert cache.get('key', 10) is scaled
+        assert cache.get('other') is None
+
+    def test_eviction(self, qtbot):
+        cache = PixmapCache(max_items=2)
+        for key in range(3):
+            cache.decode(key, get_png())
+        assert len(cache) == 2
+        assert 0 not in cache
+
+    def test_request(self, qtbot):
+        cache = PixmapCache()
+        ready = []
+        cache.pixmap_ready.connect(lambda key, pixmap: ready.append((key, pixmap.height())))
+        with qtbot.waitSignal(cache.pixmap_ready, timeout=5000):
+            cache.request('key', get_png(), 10)
+            cache.request('key', get_png(), 5)  # pending, not decoded twice
+        qtbot.waitUntil(lambda: len(ready) == 2, timeout=5000)
+        assert sorted(ready) == [('key', 5), ('key', 10)]
+
+        cache.request('key', b'')  # from the cache
+        assert ready[-1] == ('key', 20)
+
+    def test_clear_pending(self, qtbot):
+        cache = PixmapCache()
+        ready = []
+        cache.pixmap_ready.connect(lambda key, pixmap: ready.append(key))
+        cache.request('old', get_png())
+        cache.clear()
+        assert len(cache._pending) == 0
+        with qtbot.waitSignal(cache.pixmap_ready, timeout=5000):
+            cache.request('new', get_png())
+        cache.wait()
+        QtWidgets.QApplication.processEvents()
+        assert ready == ['new']
+        assert 'old' not in cache
+
+
+def test_view_reuses_labels(qtbot):
+    widget = QtWidgets.QWidget()
+    qtbot.addWidget(widget)
+    view = View(widget, QtWidgets.QWidget(), QtWidgets.QWidget())
+    pngs = [get_png(), get_png(30, 30)]
+    view.show_pixmaps([('/node', 0), ('/node', 1)], pngs)
+    labels = list(view._pixmap_labels)
+    qtbot.waitUntil(lambda: all([label.pixmap() is not None for label in labels]), timeout=5000)
+    assert labels[0].pixmap().height() == view.pixmap_height
+
+    view.show_pixmaps([('/other', 0)], pngs[:1])
+    assert view._pixmap_labels == labels
+    assert labels[0].isVisibleTo(widget) and not labels[1].isVisibleTo(widget)
+    view.pixmap_cache.wait()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+import numpy as np
+import pytest
+
+from qtpy import QtWidgets
+
+from pymodaq_data import data as data_mod
+from pymodaq_data.h5modules.saving import H5SaverLowLevel
+from pymodaq_data.h5modules.data_saving import DataToExportSaver
+
+from pymodaq_gui.h5modules.browsing import H5Browser
+from pymodaq_gui.h5modules.preview import H5Previewer, compute_preview, get_strided_slices
+
+
+ARRAY_ND = np.random.rand(20, 30, 40)
+ARRAY_NAV = np.random.rand(50, 60)
+
+
+@pytest.fixture
+def h5saver(tmp_path):
+    h5saver = H5SaverLowLevel()
+    h5saver.init_file(tmp_path.joinpath('preview.h5'), new_file=True)
+    saver = DataToExportSaver(h5saver)
+    det_group = h5saver.add_det_group(h5saver.raw_group, title='det')
+    saver.add_data(det_group, data_mod.DataToExport('mydte', data=[
+        data_mod.DataRaw('nd', data=[ARRAY_ND], nav_indexes=(0,)),
+        data_mod.DataRaw('nav', data=[ARRAY_NAV], nav_indexes=(0, 1))]))
+    h5saver.root().attrs['pymodaq_version'] = '5.0.0'
+    h5saver.flush()
+    yield h5saver
+    h5saver.close_file()
+
+
+def get_node_path(h5saver, name):
+    for node in h5saver.walk_nodes('/RawData'):
+        if 'data_type' in node.attrs.attrs_name and node.attrs['data_type'] == 'data' and \
+                node.attrs['shape'] == (ARRAY_ND.shape if name == 'nd' else ARRAY_NAV.shape):
+            return node.path
+
+
+def test_strided_slices():
+    slices = get_strided_slices((1000, 10), 100)
+    assert slices == (slice(0, 1000, 10), slice(0, 10, 1))
+    assert np.zeros((1000, 10))[slices].shape == (100, 10)
+    assert np.zeros((1001, 10))[get_strided_slices((1001, 10), 100)].shape[0] <= 100
+
+
+class TestComputePreview:
+    def test_nav_mean(self, h5saver):
+        node = h5saver.get_node(get_node_path(h5saver, 'nd'))
+        preview = compute_preview(node, max_signal_points=256, max_nav_points=5)
+        assert preview.shape == ARRAY_ND.shape[1:]
+        assert np.allclose(preview, np.mean(ARRAY_ND[::4], axis=0))
+
+        preview = compute_preview(node, max_signal_points=10, max_nav_points=100)
+        assert np.allclose(preview, np.mean(ARRAY_ND[:, ::3, ::4], axis=0))
+
+    def test_0D_signal(self, h5saver):
+        node = h5saver.get_node(get_node_path(h5saver, 'nav'))
+        preview = compute_preview(node, max_signal_points=25)
+        assert np.allclose(preview, ARRAY_NAV[::2, ::3])
+
+    def test_group_and_cache(self, h5saver):
+        previewer = H5Previewer()
+        preview = previewer.get_preview(h5saver, '/RawData')
+        assert preview is not None
+        assert len(previewer.cache) == 1
+        assert previewer.get_preview(h5saver, '/RawData') is preview
+        assert previewer.cache.hits == 1
+        assert previewer.get_preview(h5saver, '/RawData/Logger') is None
+
+
+def test_browser_preview(qtbot, h5saver):
+    file_path = h5saver.filename
+    h5saver.close_file()
+    win = QtWidgets.QMainWindow()
+    qtbot.addWidget(win)
+    browser = H5Browser(win, h5file_path=file_path)
+    browser.get_action('preview').trigger()
+    assert browser.is_action_checked('preview')
+
+    index = browser.view.tree_model.index_from_path('/RawData/Detector000')
+    browser.view.h5file_tree.tree.setCurrentIndex(index)
+    assert len(browser.previewer.cache) == 1
+    browser.quit_fun()
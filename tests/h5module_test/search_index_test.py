@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from qtpy import QtWidgets
+
+from pymodaq_data import data as data_mod
+from pymodaq_data.h5modules.saving import H5SaverLowLevel
+from pymodaq_data.h5modules.data_saving import DataToExportSaver
+
+from pymodaq_gui.parameter import Parameter, ioxml
+from pymodaq_gui.h5modules import search_index
+from pymodaq_gui.h5modules.search_index import (H5SearchIndex, H5IndexBuilder, flatten_settings,
+                                                get_sidecar_path)
+from pymodaq_gui.h5modules.browsing import H5Browser
+
+
+N_DETECTORS = 4
+
+
+class RecordingLock:
+    """RLock counting its (outermost) acquisitions"""
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._depth = 0
+        self.n_acquisitions = 0
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._depth += 1
+        if self._depth == 1:
+            self.n_acquisitions += 1
+        return self
+
+    def __exit__(self, *args):
+        self._depth -= 1
+        self._lock.release()
+
+
+def get_settings(exposure: float, mode: str) -> Parameter:
+    return Parameter.create(name='settings', type='group', children=[
+        {'name': 'main_settings', 'type': 'group', 'children': [
+            {'name': 'exposure', 'type': 'float', 'value': exposure},
+            {'name': 'mode', 'type': 'list', 'limits': ['fast', 'slow'], 'value': mode}]},
+        {'name': 'comment', 'type': 'str', 'value': 'Some text'}])
+
+
+def create_file(file_path, backend='tables'):
+    h5saver = H5SaverLowLevel(backend=backend)
+    h5saver.init_file(file_path, new_file=True)
+    saver = DataToExportSaver(h5saver)
+    for ind in range(N_DETECTORS):
+        settings = get_settings(10. * ind, 'fast' if ind % 2 == 0 else 'slow')
+        det_group = h5saver.add_det_group(h5saver.raw_group, title=f'det{ind}',
+                                          settings_as_xml=ioxml.parameter_to_xml_string(settings))
+        saver.add_data(det_group, data_mod.DataToExport('mydte', data=[
+            data_mod.DataRaw('mydata', data=[np.random.rand(10)])]))
+    h5saver.root().attrs['pymodaq_version'] = '5.0.0'
+    h5saver.flush()
+    return h5saver
+
+
+@pytest.fixture
+def get_h5saver(tmp_path):
+    h5saver = create_file(tmp_path.joinpath('search.h5'))
+    yield h5saver
+    h5saver.close_file()
+
+
+def test_flatten_settings():
+    flat = flatten_settings(ioxml.parameter_to_xml_string(get_settings(2.5, 'slow')), prefix='settings')
+    assert flat == {'settings/main_settings/exposure': '2.5', 'settings/main_settings/mode': 'slow',
+                    'settings/comment': 'Some text'}
+
+
+class TestH5SearchIndex:
+    def test_search(self, get_h5saver):
+        index = H5SearchIndex()
+        index.build(get_h5saver)
+        assert '/RawData/Detector001' in index
+        assert index.search('exposure=20') == ['/RawData/Detector002']
+        assert index.search('mode=slow') == ['/RawData/Detector001', '/RawData/Detector003']
+        assert index.search('MODE=slow exposure=30') == ['/RawData/Detector003']
+        assert index.search('detector001 type=detector') == ['/RawData/Detector001']
+        assert '/RawData/Detector000/Data1D/CH00/Data00' in index.search('data_type=data')
+        assert index.search('mode=slow', limit=1) == ['/RawData/Detector001']
+        assert index.search('') == []
+        assert index.search('not_in_the_file') == []
+
+    def test_persistence(self, get_h5saver):
+        index = H5SearchIndex()
+        index.build(get_h5saver)
+        sidecar_path = index.save()
+        assert sidecar_path == get_sidecar_path(get_h5saver.filename)
+
+        loaded = H5SearchIndex.load(get_h5saver.filename)
+        assert loaded.is_valid(get_h5saver.filename)
+        assert loaded.search('exposure=20') == ['/RawData/Detector002']
+
+        stat = os.stat(get_h5saver.filename)
+        os.utime(get_h5saver.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert not H5SearchIndex.load(get_h5saver.filename).is_valid()
+
+    def test_incremental_build(self, get_h5saver, monkeypatch):
+        index = H5SearchIndex()
+        index.build(get_h5saver)
+        calls = []
+        flatten = search_index.flatten_settings
+        monkeypatch.setattr(search_index, 'flatten_settings',
+                            lambda *args, **kwargs: calls.append(args) or flatten(*args, **kwargs))
+        get_h5saver.get_node('/RawData/Detector001').attrs['settings'] = \
+            ioxml.parameter_to_xml_string(get_settings(100., 'slow'))
+        new_index = H5SearchIndex()
+        new_index.build(get_h5saver, previous=index)
+        assert len(calls) == 1  # only the modified settings are parsed again
+        assert new_index.search('exposure=100') == ['/RawData/Detector001']
+        assert new_index.search('exposure=20') == ['/RawData/Detector002']
+
+
+    def test_reindex_node(self, get_h5saver):
+        index = H5SearchIndex()
+        index.build(get_h5saver)
+        get_h5saver.get_node('/RawData/Detector002').attrs['comments'] = 'interesting'
+        get_h5saver.flush()
+        index.reindex_node(get_h5saver, '/RawData/Detector002')
+        assert index.search('comments=interesting') == ['/RawData/Detector002']
+        assert index.is_valid()
+        assert index.content_key is None  # only computed when saving
+        index.save(h5utils=get_h5saver)
+        assert index.matches_content(get_h5saver)
+
+    def test_lock_held_per_batch(self, get_h5saver, monkeypatch):
+        monkeypatch.setattr(search_index, 'NODE_BATCH', 4)
+        n_nodes = len(list(get_h5saver.walk_nodes('/')))
+        lock = RecordingLock()
+        index = H5SearchIndex()
+        index.build(get_h5saver, lock)
+        assert index.content_key is None  # not computed unless asked for
+        walk_acquisitions = lock.n_acquisitions - len(index)
+        assert walk_acquisitions > n_nodes // 4  # the walk through the nodes is done per batch
+        index.build(get_h5saver, lock, content_key=True)
+        assert index.content_key == search_index.get_content_key(get_h5saver)
+
+
+def test_index_builder(qtbot, get_h5saver):
+    builder = H5IndexBuilder()
+    with qtbot.waitSignal(builder.index_ready, timeout=10000) as blocker:
+        builder.build(get_h5saver)
+    assert blocker.args[0].search('exposure=10') == ['/RawData/Detector001']
+    assert not get_sidecar_path(get_h5saver.filename).is_file()  # persistence is opt-in
+
+
+def test_index_builder_persistence(qtbot, tmp_path, monkeypatch):
+    file_path = tmp_path.joinpath('persist.h5')
+    create_file(file_path).close_file()
+    builder = H5IndexBuilder(persist=True)
+    h5reader = H5SaverLowLevel()
+    h5reader.open_file(file_path, 'r+')
+    with qtbot.waitSignal(builder.index_ready, timeout=10000):
+        builder.build(h5reader)
+    h5reader.close_file()  # the r+ session changed the modification time of the file
+    assert get_sidecar_path(file_path).is_file()
+    assert not H5SearchIndex.load(file_path).is_valid()
+
+    builds = []
+    monkeypatch.setattr(H5SearchIndex, 'build', lambda *args, **kwargs: builds.append(args))
+    h5reader.open_file(file_path, 'r+')
+    with qtbot.waitSignal(builder.index_ready, timeout=10000) as blocker:
+        builder.build(h5reader)
+    h5reader.close_file()
+    assert builds == []  # the content did not change, the sidecar is used
+    assert blocker.args[0].search('mode=slow') == ['/RawData/Detector001', '/RawData/Detector003']
+
+
+def test_browser_persistence(qtbot, tmp_path, monkeypatch):
+    file_path = tmp_path.joinpath('browsing.h5')
+    create_file(file_path).close_file()
+    win = QtWidgets.QMainWindow()
+    qtbot.addWidget(win)
+    browser = H5Browser(win, h5file_path=file_path, persist_search_index=True)
+    qtbot.waitUntil(lambda: browser.search_index is not None, timeout=10000)
+    assert browser.view.select_node('/RawData/Detector003')
+    browser.add_comments(True, comment='interesting')
+    browser.quit_fun()
+    assert H5SearchIndex.load(file_path).content_key is not None
+
+    builds = []
+    monkeypatch.setattr(H5SearchIndex, 'build', lambda *args, **kwargs: builds.append(args))
+    win = QtWidgets.QMainWindow()
+    qtbot.addWidget(win)
+    browser = H5Browser(win, h5file_path=file_path, persist_search_index=True)
+    qtbot.waitUntil(lambda: browser.search_index is not None, timeout=10000)
+    assert builds == []  # loaded from the sidecar
+    assert browser.search('comments=interesting') == ['/RawData/Detector003']
+    browser.quit_fun()
+
+
+def test_browser_search(qtbot, tmp_path):
+    create_file(tmp_path.joinpath('browsing.h5')).close_file()
+    win = QtWidgets.QMainWindow()
+    qtbot.addWidget(win)
+    browser = H5Browser(win, h5file_path=tmp_path.joinpath('browsing.h5'))
+    assert browser.search('mode=slow') == []  # still indexing
+    qtbot.waitUntil(lambda: browser.search_index is not None, timeout=10000)
+    assert browser.search('mode=slow') == ['/RawData/Detector001', '/RawData/Detector003']
+
+    assert browser.view.select_node('/RawData/Detector003')
+    assert browser.get_tree_node_path() == '/RawData/Detector003'
+    browser.add_comments(True, comment='interesting')
+    assert browser.search('comments=interesting') == ['/RawData/Detector003']
+    assert browser.search_index.is_valid()
+    browser.quit_fun()
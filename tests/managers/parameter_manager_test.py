@@ -98,3 +98,150 @@ def test_load(qtbot, tmp_path):
 
     assert compareValuesParameter(ptree.settings, parameter_copy)
     assert compareStructureParameter(ptree.settings, parameter_copy)
+
+
+class RecordingParameterManager(RealParameterManager):
+    def __init__(self):
+        self.changed = []
+        self.batches = []
+        super().__init__()
+
+    def value_changed(self, param):
+        self.changed.append((param.name(), param.value()))
+
+    def values_changed(self, values):
+        self.batches.append({param.name(): value for param, value in values.items()})
+
+
+class TestChangeDispatch:
+    def test_default(self, qtbot):
+        manager = RecordingParameterManager()
+        manager.settings.child('numbers', 'afloat').setValue(2.)
+        manager.settings.child('numbers', 'afloat').setValue(3.)
+        assert manager.changed == [('afloat', 2.), ('afloat', 3.)]
+        assert manager.batches == [{'afloat': 2.}, {'afloat': 3.}]
+
+    def test_batch_update(self, qtbot):
+        manager = RecordingParameterManager()
+        with manager.batch_update() as settings:
+            settings.child('numbers', 'afloat').setValue(2.)
+            with manager.batch_update():
+                settings.child('numbers', 'linearslidefloat').setValue(10.)
+                settings.child('numbers', 'afloat').setValue(3.)
+            assert manager.changed == []
+            assert not manager.tree.updatesEnabled()
+        assert manager.changed == [('linearslidefloat', 10.), ('afloat', 3.)]
+        assert manager.batches == [{'linearslidefloat': 10., 'afloat': 3.}]
+        assert manager.tree.updatesEnabled()
+
+    def test_coalesce(self, qtbot):
+        manager = RecordingParameterManager()
+        manager.coalesce_changes = True
+        for value in range(2, 10):
+            manager.settings.child('numbers', 'afloat').setValue(float(value))
+        manager.settings.child('numbers', 'logslidefloat').setValue(1.)
+        assert manager.changed == []
+        qtbot.waitUntil(lambda: len(manager.batches) > 0, timeout=1000)
+        assert manager.changed == [('afloat', 9.), ('logslidefloat', 1.)]
+        assert manager.batches == [{'afloat': 9., 'logslidefloat': 1.}]
+
+        manager.settings.child('numbers', 'afloat').setValue(5.)
+        manager.dispatch_pending_changes()
+        assert manager.changed[-1] == ('afloat', 5.)
+
+
+def test_settings_index(qtbot):
+    manager = RealParameterManager()
+    afloat = manager.settings.child('numbers', 'afloat')
+    assert manager.settings_index.get(('numbers', 'afloat')) is afloat
+    manager.settings.child('numbers').addChild({'name': 'new', 'type': 'str'})
+    assert manager.settings_index.get_by_name('new') is manager.settings.child('numbers', 'new')
+    manager.settings.child('numbers').removeChild(afloat)
+    assert manager.settings_index.get_by_name('afloat') is None
+
+
+def test_snapshot_files(qtbot, tmp_path):
+    manager = RealParameterManager()
+    manager.settings.child('numbers', 'afloat').setValue(3.)
+    manager.save_settings_slot(tmp_path.joinpath('values.psnap'), with_structure=False)
+    manager.save_settings_slot(tmp_path.joinpath('settings.psnap'))
+
+    manager.settings.child('numbers', 'afloat').setValue(5.)
+    settings = manager.settings
+    manager.update_settings_slot(tmp_path.joinpath('values.psnap'))
+    assert manager.settings is settings  # updated in place
+    assert manager.settings['numbers', 'afloat'] == 3.
+
+    other = RealParameterManager()
+    other.load_settings_slot(tmp_path.joinpath('settings.psnap'))
+    assert compareStructureParameter(other.settings, manager.settings)
+    assert compareValuesParameter(other.settings, manager.settings)
+
+
+def test_settings_hasher(qtbot):
+    manager = RealParameterManager()
+    other = RealParameterManager()
+    assert manager.settings_hasher.values_hash() == other.settings_hasher.values_hash()
+    manager.settings.child('numbers', 'afloat').setValue(3.)
+    assert manager.settings_hasher.values_hash() != other.settings_hasher.values_hash()
+    assert manager.settings_hasher.diff(other.settings_hasher) == [('numbers', 'afloat')]
+    assert manager.settings_hasher.structure_hash() == other.settings_hasher.structure_hash()
+
+
+class LazyParameterManager(ParameterManager):
+    lazy_tree = True
+    params = [{'title': f'Group {ind}', 'name': f'group{ind:02d}', 'type': 'group', 'expanded': ind == 0,
+               'children': [{'name': f'afloat{ind_child}', 'type': 'float', 'value': ind_child}
+                            for ind_child in range(10)]}
+              for ind in range(50)]
+
+
+def get_item(param: Parameter):
+    return list(param.items.keys())[0] if len(param.items) > 0 else None
+
+
+class TestLazyTree:
+    def test_deferred_creation(self, qtbot):
+        manager = LazyParameterManager()
+        qtbot.addWidget(manager.settings_tree)
+        group = manager.settings.child('group01')
+        assert manager.tree.is_pending(get_item(group))
+        assert get_item(group.child('afloat0')) is None
+        assert len(manager.tree.listAllItems()) == 51  # the hidden top item and the groups
+
+        get_item(group).setExpanded(True)
+        assert not manager.tree.is_pending(get_item(group))
+        assert get_item(group).childCount() == 10
+        group.child('afloat3').setValue(12.)
+        assert get_item(group.child('afloat3')).widget.value() == pytest.approx(12.)
+
+    def test_expanded_in_view(self, qtbot):
+        manager = LazyParameterManager()
+        qtbot.addWidget(manager.settings_tree)
+        manager.settings_tree.resize(300, 400)
+        manager.settings_tree.show()
+        first = manager.settings.child('group00')
+        qtbot.waitUntil(lambda: not manager.tree.is_pending(get_item(first)), timeout=1000)
+        assert get_item(first).isExpanded()
+        assert get_item(first.child('afloat9')) is not None
+        assert manager.tree.is_pending(get_item(manager.settings.child('group49')))
+
+    def test_child_added(self, qtbot):
+        manager = LazyParameterManager()
+        qtbot.addWidget(manager.settings_tree)
+        manager.settings.addChild({'name': 'new', 'type': 'group', 'expanded': False, 'children': [
+            {'name': 'anint', 'type': 'int', 'value': 2}]})
+        assert manager.tree.is_pending(get_item(manager.settings.child('new')))
+        assert get_item(manager.settings.child('new', 'anint')) is None
+
+        pending = manager.settings.child('group02')
+        pending.addChild({'name': 'astr', 'type': 'str'})
+        get_item(pending).setExpanded(True)
+        assert [get_item(pending).child(ind).param.name() for ind in range(get_item(pending).childCount())][-1] \
+            == 'astr'
+
+    def test_default_not_lazy(self, qtbot):
+        manager = RealParameterManager()
+        qtbot.addWidget(manager.settings_tree)
+        assert not manager.tree.lazy
+        assert get_item(manager.settings.child('numbers', 'afloat')) is not None
@@ -5,6 +5,7 @@ Created the 29/08/2023
 @author: Sebastien Weber
 """
 import pytest
+from collections import OrderedDict
 
 
 from qtpy import QtWidgets
@@ -14,6 +15,7 @@ from pymodaq_utils.utils import find_objects_in_list_from_attr_name_val
 from pymodaq_gui.parameter import Parameter, ParameterTree
 from pymodaq_gui.parameter import utils as putils
 from pymodaq_gui.parameter import ioxml
+from pymodaq_gui.utils.widgets.table import TableModel
 from pathlib import Path
 
 
@@ -137,3 +139,128 @@ class TestXMLbackForth():
 
 
 
+class TestCodecs:
+
+    @pytest.mark.parametrize('text', ["str('DAQ1D')", 'int(3)', 'float(0.2)', "str('it''s')", '[1, 2.5]',
+                                      "{'a': 0, 'b': 1}", '{0: 1}', 'None', '[True, None]', '(1, 2)',
+                                      '[\'it\', "it\'s"]', "OrderedDict([('key1', 0.0), ('key2', 'value')])",
+                                      "['a\\\\b']", 'range(0, 3)'])
+    def test_literal_from_text(self, text):
+        assert ioxml.literal_from_text(text) == eval(text)
+        assert type(ioxml.literal_from_text(text)) is type(eval(text))
+
+    @pytest.mark.parametrize('text', ['DAQ0D', 'NaN', "__import__('os').getcwd()", "open('file.txt')",
+                                      "[1, 2].__class__", 'true', 'false', 'null', '[true, null]'])
+    def test_literal_from_text_invalid(self, text):
+        with pytest.raises(ValueError):
+            ioxml.literal_from_text(text)
+
+    def test_list_back_compatibility(self):
+        param_back = ioxml.XML_string_to_pobject(
+            b'<settings title="settings" type="group"><axis title="Axis" type="list" limits="[\'DAQ0D\']">'
+            b'DAQ0D</axis></settings>')
+        assert param_back['axis'] == 'DAQ0D'
+
+    @pytest.mark.parametrize('value', ['true', 'false', 'null'])
+    def test_list_json_constants(self, value):
+        param_back = ioxml.XML_string_to_pobject(
+            f'<settings title="settings" type="group"><axis title="Axis" type="list" '
+            f'limits="[\'{value}\', \'other\']">{value}</axis></settings>'.encode())
+        assert param_back['axis'] == value
+
+    def test_strings_with_json_constants(self):
+        assert ioxml.literal_from_text("['is true', 'null']") == ['is true', 'null']
+
+    def test_xml_output(self):
+        settings = Parameter.create(name='settings', type='group', children=[
+            {'title': 'Int:', 'name': 'int', 'type': 'int', 'value': 3, 'readonly': True},
+            {'title': 'List:', 'name': 'list', 'type': 'list', 'limits': ['a', 'b'], 'value': 'b'},
+            {'title': 'Push:', 'name': 'push', 'type': 'bool_push', 'value': True, 'label': 'Go'},
+            {'name': 'items', 'type': 'itemselect', 'value': dict(all_items=['x', 'y'], selected=['y'])},
+            {'name': 'table', 'type': 'table_view', 'value': TableModel([[0., 1.]], ['a', 'b'])},
+        ])
+        assert ioxml.parameter_to_xml_string(settings) == (
+            b'<settings type="group" title="settings" visible="1" removable="0" readonly="0">'
+            b'<int type="int" title="Int:" visible="1" removable="0" readonly="1">3</int>'
+            b'<list type="list" title="List:" visible="1" removable="0" readonly="0" limits="[\'a\', \'b\']">'
+            b'str(\'b\')</list>'
+            b'<push type="bool_push" title="Push:" visible="1" removable="0" readonly="0" label="Go">1</push>'
+            b'<items type="itemselect" title="items" visible="1" removable="0" readonly="0" '
+            b'all_items="[\'x\', \'y\']">[\'y\']</items>'
+            b'<table type="table_view" title="table" visible="1" removable="0" readonly="0">'
+            b'{"classname": "TableModel", "module": "pymodaq_gui.utils.widgets.table", "data": [[0.0, 1.0]], '
+            b'"header": ["a", "b"]}</table></settings>')
+
+    def test_get_value_codec(self):
+        assert ioxml.get_value_codec('led_push') is ioxml.BOOL_CODEC
+        assert ioxml.get_value_codec('bool') is ioxml.BOOL_CODEC
+        assert ioxml.get_value_codec('group') is ioxml.DEFAULT_CODEC
+        assert ioxml.get_value_codec('browsepath').empty == ''
+        assert ioxml.get_value_codec('int') is ioxml.VALUE_CODECS['int']
+
+    def test_register_value_codec(self, monkeypatch):
+        monkeypatch.setattr(ioxml, 'VALUE_CODECS', dict(ioxml.VALUE_CODECS))
+        monkeypatch.setattr(ioxml, '_resolved_codecs', dict())
+        ioxml.register_value_codec('str', encode=lambda elt, value: value.upper(),
+                                   decode=lambda elt, text: text.lower())
+        settings = Parameter.create(name='settings', type='group', children=[
+            {'name': 'text', 'type': 'str', 'value': 'Some Text'}])
+        xml_string = ioxml.parameter_to_xml_string(settings)
+        assert b'>SOME TEXT<' in xml_string
+        assert ioxml.XML_string_to_pobject(xml_string)['text'] == 'some text'
+
+
+class TestIterparse:
+
+    settings = Parameter.create(name='settings', type='group', children=ParameterEx.params)
+    preset_path = Path(__file__).resolve().parent.parent.joinpath('data/preset_default.xml')
+
+    def test_same_as_walk(self):
+        xml_string = ioxml.parameter_to_xml_string(self.settings)
+        walked = ioxml.walk_xml_to_parameter(XML_elt=ioxml.ET.fromstring(xml_string))
+        assert ioxml.XML_string_to_parameter(xml_string) == walked
+        assert ioxml.XML_string_to_parameter(xml_string.decode()) == walked
+
+    def test_file(self):
+        walked = ioxml.walk_xml_to_parameter(XML_elt=ioxml.ET.parse(str(self.preset_path)).getroot())
+        assert ioxml.XML_file_to_parameter(self.preset_path) == walked
+
+    def test_partial_loading(self):
+        xml_string = ioxml.parameter_to_xml_string(self.settings)
+        group = self.settings.child('numbers')
+        group_xml = ioxml.parameter_to_xml_string(group)
+        assert ioxml.XML_string_to_parameter(xml_string, path=[group.name()]) == \
+            ioxml.XML_string_to_parameter(group_xml)
+
+        leaf = [child for child in group.children() if child.type() == 'float'][0]
+        leaf_dicts = ioxml.XML_string_to_parameter(xml_string, path=[group.name(), leaf.name()])
+        assert len(leaf_dicts) == 1
+        assert leaf_dicts[0]['name'] == leaf.name()
+        assert leaf_dicts[0]['value'] == leaf.value()
+
+    def test_missing_path(self):
+        with pytest.raises(KeyError):
+            ioxml.XML_file_to_parameter(self.preset_path, path=['not_a_child'])
+
+
+def test_itemselect_ranges(monkeypatch):
+    assert ioxml.encode_index_ranges([0, 1, 2, 3, 7, 5, 6]) == '0-3,7,5-6'
+    assert ioxml.decode_index_ranges('0-3,7,5-6') == [0, 1, 2, 3, 7, 5, 6]
+
+    all_items = [f'ch{ind}' for ind in range(1000)]
+    selected = all_items[500:] + all_items[10:20]
+    settings = Parameter.create(name='settings', type='group', children=[
+        {'name': 'large', 'type': 'itemselect', 'value': dict(all_items=all_items, selected=selected)},
+        {'name': 'small', 'type': 'itemselect', 'value': dict(all_items=all_items, selected=['ch2'])}])
+
+    xml_string = ioxml.parameter_to_xml_string(settings)  # readable by older versions by default
+    assert b'selection=' not in xml_string
+    assert ioxml.XML_string_to_pobject(xml_string)['large'] == dict(all_items=all_items, selected=selected)
+
+    monkeypatch.setattr(ioxml, 'ITEMSELECT_RANGES', True)
+    xml_string = ioxml.parameter_to_xml_string(settings)
+    assert b'selection="ranges">500-999,10-19<' in xml_string
+    assert b">['ch2']<" in xml_string
+    settings_back = ioxml.XML_string_to_pobject(xml_string)
+    assert settings_back['large'] == dict(all_items=all_items, selected=selected)
+    assert settings_back['small'] == dict(all_items=all_items, selected=['ch2'])
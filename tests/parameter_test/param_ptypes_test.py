@@ -87,4 +87,59 @@ class TestItemSelect:
             # Reselecting item
             listwidget.select_item(listwidget.item(2), True)
             assert settings.value() == dict(all_items=['item1', 'item2', 'item3', ],
-                                            selected=['item1', 'item3'])
\ No newline at end of file
+                                            selected=['item1', 'item3'])
+
+
+class TestItemSelectLazy:
+
+    def get_settings(self, tree, checkbox, n_items=3):
+        settings = Parameter.create(name='items', type='itemselect', lazy=True, checkbox=checkbox, show_mb=True,
+                                    value=dict(all_items=[f'item{ind + 1}' for ind in range(n_items)],
+                                               selected=[]))
+        tree.setParameters(settings, showTop=False)
+        return settings, tree.listAllItems()[0].widget.itemselect
+
+    @pytest.mark.parametrize('checkbox', [True, False])
+    def test_setValue(self, init_ParameterTree, checkbox):
+        settings, view = self.get_settings(init_ParameterTree, checkbox)
+        settings.setValue(dict(all_items=['item1', 'item2', 'item3'], selected=['item2', 'item1', 'other']))
+        assert settings.value() == dict(all_items=['item1', 'item2', 'item3'], selected=['item2', 'item1'])
+        assert view.item_model.is_selected('item1')
+        assert not view.item_model.is_selected('item3')
+
+        settings.setValue(dict(all_items=['item1', 'item2', 'item3', 'item4'], selected=['item4']))
+        assert settings.value() == dict(all_items=['item1', 'item2', 'item3', 'item4'], selected=['item4'])
+        if not checkbox:
+            assert view.selected_texts() == ['item4']
+
+    @pytest.mark.parametrize('checkbox', [True, False])
+    def test_clicked(self, init_ParameterTree, checkbox):
+        settings, view = self.get_settings(init_ParameterTree, checkbox)
+        if checkbox:
+            view.model().setData(view.model().index(2, 0), QtCore.Qt.Checked, QtCore.Qt.CheckStateRole)
+            view.model().setData(view.model().index(0, 0), QtCore.Qt.Checked, QtCore.Qt.CheckStateRole)
+        else:
+            selection_model = view.selectionModel()
+            selection_model.select(view.model().index(2, 0), QtCore.QItemSelectionModel.Select)
+            selection_model.select(view.model().index(0, 0), QtCore.QItemSelectionModel.Select)
+        assert settings.value() == dict(all_items=['item1', 'item2', 'item3'], selected=['item3', 'item1'])
+
+        view.select_item('item3', False)
+        assert settings.value()['selected'] == ['item1']
+
+    def test_filter(self, init_ParameterTree):
+        settings, view = self.get_settings(init_ParameterTree, False, n_items=5000)
+        settings.setValue(dict(all_items=settings.value()['all_items'], selected=['item12', 'item4000']))
+        init_ParameterTree.listAllItems()[0].widget.filter_edit.setText('ITEM12')
+        assert view.model().rowCount() == 111  # item12, item120-129, item1200-1299
+        assert view.selected_texts() == ['item12']
+        assert settings.value()['selected'] == ['item12', 'item4000']  # the filter keeps the selection
+        assert view.search('item499') == ['item499', 'item4990', 'item4991', 'item4992', 'item4993',
+                                          'item4994', 'item4995', 'item4996', 'item4997', 'item4998', 'item4999']
+
+    def test_remove(self, init_ParameterTree):
+        settings, view = self.get_settings(init_ParameterTree, True)
+        settings.setValue(dict(all_items=['item1', 'item2', 'item3'], selected=['item2', 'item3']))
+        view.selectionModel().select(view.model().index(1, 0), QtCore.QItemSelectionModel.Select)
+        init_ParameterTree.listAllItems()[0].mb_buttonClicked()
+        assert settings.value() == dict(all_items=['item1', 'item3'], selected=['item3'])
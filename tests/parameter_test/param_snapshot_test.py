@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+from collections import OrderedDict
+
+import pytest
+from qtpy import QtGui
+
+from pymodaq_gui.examples.parameter_ex import ParameterEx
+from pymodaq_gui.parameter import Parameter, ioxml
+from pymodaq_gui.parameter import utils as putils
+from pymodaq_gui.parameter import snapshot
+from pymodaq_gui.parameter.snapshot import ParameterSnapshot, get_structure_hash, pack_value, unpack_value
+
+
+def get_settings() -> Parameter:
+    return Parameter.create(name='settings', type='group', children=ParameterEx.params)
+
+
+@pytest.mark.parametrize('value, param_type', [(None, 'str'), (True, 'bool'), (False, 'led'), (-12, 'int'),
+                                               (2 ** 70, 'int'), (0.1, 'float'), ('été', 'str'),
+                                               (QtGui.QColor(1, 2, 3), 'color'),
+                                               (OrderedDict(a=1., b='b'), 'table')])
+def test_pack_value(value, param_type):
+    value_back, _, offset = unpack_value(b'\x00' + pack_value(value, param_type), 1)
+    assert value_back == value
+    assert type(value_back) is type(value)
+
+
+def test_structure_hash():
+    settings = get_settings()
+    assert get_structure_hash(settings) == get_structure_hash(get_settings())
+    renamed = Parameter.create(name='other', type='group', children=ParameterEx.params)
+    assert get_structure_hash(renamed) == get_structure_hash(settings)
+
+    settings.child('numbers', 'afloat').setValue(1.)
+    assert get_structure_hash(settings) == get_structure_hash(get_settings())
+    settings.child('numbers').addChild({'name': 'new', 'type': 'int'})
+    assert get_structure_hash(settings) != get_structure_hash(get_settings())
+
+
+class TestParameterSnapshot:
+    def test_xml_round_trip(self):
+        settings = get_settings()
+        xml_string = ioxml.parameter_to_xml_string(settings)
+        param_snapshot = ParameterSnapshot.from_parameter(settings)
+        assert param_snapshot.to_xml() == xml_string
+        assert ParameterSnapshot.from_bytes(param_snapshot.to_bytes())[0].to_xml() == xml_string
+
+        from_xml = ParameterSnapshot.from_xml(xml_string)
+        assert from_xml.digest == param_snapshot.digest
+        assert ParameterSnapshot.from_xml(from_xml.to_xml()).to_xml() == from_xml.to_xml()
+
+    def test_to_parameter(self):
+        settings = get_settings()
+        param_snapshot = ParameterSnapshot.from_bytes(ParameterSnapshot.from_parameter(settings).to_bytes())[0]
+        assert param_snapshot.to_parameter_dicts() == \
+            ioxml.XML_string_to_parameter(ioxml.parameter_to_xml_string(settings))
+        settings_back = param_snapshot.to_parameter()
+        assert putils.compareStructureParameter(settings, settings_back)
+        assert putils.compareValuesParameter(settings, settings_back)
+
+    def test_value_only(self):
+        settings = get_settings()
+        settings.child('numbers', 'afloat').setValue(-5.)
+        settings.child('booleans', 'abool').setValue(False)
+        value_bytes = ParameterSnapshot.from_parameter(settings, with_structure=False).to_bytes()
+        assert len(value_bytes) < len(ParameterSnapshot.from_parameter(settings).to_bytes()) / 3
+
+        param_snapshot = ParameterSnapshot.from_bytes(value_bytes)[0]
+        assert not param_snapshot.has_structure
+        with pytest.raises(ValueError):
+            param_snapshot.to_xml()
+
+        other = get_settings()
+        changes = []
+        other.sigTreeStateChanged.connect(lambda param, tree_changes: changes.append(tree_changes))
+        param_snapshot.apply(other)
+        assert len(changes) == 1  # a single emission for all the values
+        assert putils.compareValuesParameter(settings, other)
+
+        other.child('numbers').removeChild(other.child('numbers', 'afloat'))
+        with pytest.raises(ValueError):
+            param_snapshot.apply(other)
+
+    def test_serializer(self):
+        settings = Parameter.create(name='settings', type='group', children=[
+            {'name': 'afloat', 'type': 'float', 'value': 2.},
+            {'name': 'color', 'type': 'color', 'value': QtGui.QColor(1, 2, 3)}])
+        param_snapshot = ParameterSnapshot.from_parameter(settings, with_structure=False)
+        bytes_str = putils.ser_factory.get_apply_serializer(param_snapshot)
+        snapshot_back = putils.ser_factory.get_apply_deserializer(bytes_str)
+        assert isinstance(snapshot_back, ParameterSnapshot)
+        assert snapshot_back.digest == param_snapshot.digest
+        assert snapshot_back.values == param_snapshot.values
+        assert snapshot_back.to_bytes() == param_snapshot.to_bytes()
+
+    def test_invalid_bytes(self):
+        with pytest.raises(ValueError):
+            ParameterSnapshot.from_bytes(b'not a snapshot')
+
+
+def test_file_conversions(tmp_path):
+    settings = get_settings()
+    file_path = snapshot.parameter_to_snapshot_file(settings, tmp_path.joinpath('settings.xml'))
+    assert file_path.suffix == f'.{snapshot.SNAPSHOT_EXTENSION}'
+    xml_path = snapshot.snapshot_file_to_xml_file(file_path)
+    assert xml_path.read_bytes() == ioxml.parameter_to_xml_string(settings)
+    assert snapshot.snapshot_from_file(
+        snapshot.xml_file_to_snapshot_file(xml_path, tmp_path.joinpath('back'))).digest == \
+        get_structure_hash(settings)
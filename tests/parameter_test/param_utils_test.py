@@ -6,9 +6,12 @@ Created the 28/10/2022
 """
 import numpy as np
 import pytest
-from qtpy import QtWidgets
+from collections import OrderedDict
+
+from qtpy import QtGui, QtWidgets
 from pymodaq_gui.parameter import Parameter, ParameterTree
 from pymodaq_gui.parameter import utils as putils
+from pymodaq_gui.parameter import ioxml
 from pymodaq_utils.utils import find_objects_in_list_from_attr_name_val
 
 params = [
@@ -242,3 +245,182 @@ def test_ParameterWithPath_serialize():
     assert param_back.path == p1_with_path.path
     assert putils.compareParameters(param_back.parameter, p1_with_path.parameter)
 
+
+
+def get_remote_settings():
+    return Parameter.create(name='settings', type='group', children=[
+        {'title': 'Main', 'name': 'main', 'type': 'group', 'children': [
+            {'title': 'Exposure', 'name': 'exposure', 'type': 'float', 'value': 1.},
+            {'title': 'Mode', 'name': 'mode', 'type': 'list', 'limits': ['fast', 'slow'], 'value': 'fast'},
+            {'title': 'Color', 'name': 'color', 'type': 'color', 'value': QtGui.QColor(255, 0, 0)},
+            {'title': 'Items', 'name': 'items', 'type': 'itemselect',
+             'value': dict(all_items=['a', 'b'], selected=['a'])},
+            {'title': 'Table', 'name': 'table', 'type': 'table', 'value': OrderedDict(a=1.)},
+        ]}])
+
+
+class TestParameterUpdates:
+    @pytest.mark.parametrize('name, value', [('exposure', 2.5), ('mode', 'slow'),
+                                             ('color', QtGui.QColor(0, 255, 0, 128)),
+                                             ('items', dict(all_items=['a', 'b', 'c'], selected=['b', 'c'])),
+                                             ('table', OrderedDict(a=1., b='text'))])
+    def test_value_update(self, name, value):
+        settings = get_remote_settings()
+        remote = get_remote_settings()
+        settings.child('main', name).setValue(value)
+        update = putils.ParameterValueUpdate.from_parameter(settings.child('main', name))
+        update_back: putils.ParameterValueUpdate = putils.ser_factory.get_apply_deserializer(
+            putils.ser_factory.get_apply_serializer(update))
+        assert update_back.path == ['settings', 'main', name]
+        param = update_back.apply(remote)
+        assert param is remote.child('main', name)
+        assert param.value() == value
+        assert type(param.value()) is type(value)
+
+    def test_value_update_size(self):
+        settings = get_remote_settings()
+        settings.child('main', 'exposure').setValue(2.)
+        update = putils.ParameterValueUpdate.from_parameter(settings.child('main', 'exposure'))
+        with_path = putils.ParameterWithPath(settings.child('main', 'exposure'))
+        assert len(putils.ser_factory.get_apply_serializer(update)) < \
+            len(putils.ser_factory.get_apply_serializer(with_path))
+
+    def test_structure_diff(self):
+        settings = get_remote_settings()
+        remote = get_remote_settings()
+        main = settings.child('main')
+        diff = putils.ParameterStructureDiff.from_parameter(main, removed=['mode'])
+        main.removeChild(main.child('mode'))
+        added = main.insertChild(1, {'title': 'Group', 'name': 'group', 'type': 'group', 'children': [
+            {'name': 'gain', 'type': 'int', 'value': 3}]})
+        diff.added.append((1, ioxml.parameter_to_xml_string(added)))
+
+        diff_back: putils.ParameterStructureDiff = putils.ser_factory.get_apply_deserializer(
+            putils.ser_factory.get_apply_serializer(diff))
+        remote_main = remote.child('main')
+        diff_back.apply(remote)
+        assert remote.child('main') is remote_main
+        assert remote_main.childs[1].name() == 'group'
+        assert remote['main', 'group', 'gain'] == 3
+        assert putils.compareValuesParameter(settings, remote)
+
+    def test_updates_from_changes(self):
+        settings = get_remote_settings()
+        remote = get_remote_settings()
+        changes = []
+        settings.sigTreeStateChanged.connect(lambda param, param_changes: changes.extend(param_changes))
+        settings.child('main', 'exposure').setValue(3.)
+        settings.child('main', 'exposure').setValue(4.)
+        settings.child('main').removeChild(settings.child('main', 'table'))
+        settings.child('main').addChild({'name': 'new', 'type': 'str', 'value': 'added'})
+        settings.child('main', 'new').setValue('modified')
+        settings.child('main').removeChild(settings.child('main', 'color'))
+
+        updates = putils.get_updates_from_changes(changes)
+        assert [type(update) for update in updates] == [putils.ParameterValueUpdate, putils.ParameterStructureDiff,
+                                                        putils.ParameterValueUpdate, putils.ParameterStructureDiff]
+        updates = [putils.ser_factory.get_apply_deserializer(putils.ser_factory.get_apply_serializer(update))
+                   for update in updates]
+        putils.apply_updates(remote, updates)
+        assert putils.compareValuesParameter(settings, remote)
+        assert remote['main', 'exposure'] == 4.
+        assert remote['main', 'new'] == 'modified'
+
+
+def test_iter_params():
+    settings = Parameter.create(name='settings', type='group', children=params)
+    assert list(putils.iter_params(settings)) == putils.iter_children_params(settings)
+    assert list(putils.iter_params(settings, output_type='name', filter_type=['group'])) == \
+        ['DAQ_type', 'axis', 'detector_type', 'Nviewers']
+    assert list(putils.iter_params(settings, filter_name=['axis'], select_filter=True)) == \
+        [settings.child('main_settings', 'axis')]
+    assert putils.iter_children(settings) == putils.iter_children(settings)  # no accumulation
+
+
+class TestParameterIndex:
+    def test_lookups(self):
+        settings = Parameter.create(name='settings', type='group', children=params)
+        index = putils.ParameterIndex(settings)
+        assert len(index) == 5
+        assert index.get(('main_settings', 'axis')) is settings.child('main_settings', 'axis')
+        assert index.get(['main_settings', 'not_a_param']) is None
+        assert index.get_path(settings.child('main_settings', 'Nviewers')) == ('main_settings', 'Nviewers')
+        assert index.get_by_name('detector_type') is putils.get_param_from_name(settings, 'detector_type')
+        assert index.get_by_type('list') == [settings.child('main_settings', 'DAQ_type'),
+                                             settings.child('main_settings', 'axis')]
+        assert index.get_by_name('unknown') is None
+
+    def test_changes(self):
+        settings = Parameter.create(name='settings', type='group', children=params)
+        index = putils.ParameterIndex(settings)
+        settings.sigTreeStateChanged.connect(lambda param, changes: index.apply_changes(changes))
+
+        settings.addChild({'name': 'other', 'type': 'group', 'children': [
+            {'name': 'axis', 'type': 'int', 'value': 2}]})
+        assert index.get(('other', 'axis')) is settings.child('other', 'axis')
+        assert index.get_all_by_name('axis') == [settings.child('main_settings', 'axis'),
+                                                 settings.child('other', 'axis')]
+        assert index.get_by_name('axis') is settings.child('main_settings', 'axis')
+
+        settings.child('main_settings').removeChild(settings.child('main_settings', 'axis'))
+        assert index.get(('main_settings', 'axis')) is None
+        assert index.get_by_name('axis') is settings.child('other', 'axis')
+
+        settings.child('other').setName('renamed')
+        assert index.get(('renamed', 'axis')) is settings.child('renamed', 'axis')
+        assert index.get(('other', 'axis')) is None
+
+        settings.removeChild(settings.child('renamed'))
+        assert index.get_by_type('int') == [settings.child('main_settings', 'Nviewers')]
+        assert len(index) == 4
+
+
+class TestParameterHasher:
+    def test_compare(self):
+        hashers = [putils.ParameterHasher(param) for param in (P1, P2, P3, P4)]
+        assert [hashers[0].structure_hash() == hasher.structure_hash() for hasher in hashers] == \
+            [putils.compareStructureParameter(P1, param) for param in (P1, P2, P3, P4)]
+        assert [hashers[0].values_hash() == hasher.values_hash() for hasher in hashers] == \
+            [putils.compareValuesParameter(P1, param) for param in (P1, P2, P3, P4)]
+
+    def test_diff(self):
+        assert putils.diff_parameters(P1, P2) == []
+        assert putils.diff_parameters(P1, P3) == [('numbers', 'afloat', 'aint')]
+        assert putils.diff_parameters(P1, P4) == [('numbers', 'afloat')]
+        assert putils.diff_parameters(P1, P4, structure_only=True) == []
+
+    def test_changes(self):
+        settings = Parameter.create(name='settings', type='group', children=params)
+        reference = putils.ParameterHasher(Parameter.create(name='other', type='group', children=params))
+        hasher = putils.ParameterHasher(settings)
+        settings.sigTreeStateChanged.connect(lambda param, changes: hasher.apply_changes(changes))
+        assert hasher.values_hash() == reference.values_hash()
+
+        settings.child('main_settings', 'Nviewers').setValue(3)
+        assert hasher.values_hash() != reference.values_hash()
+        assert hasher.structure_hash() == reference.structure_hash()
+        assert hasher.diff(reference) == [('main_settings', 'Nviewers')]
+        settings.child('main_settings', 'Nviewers').setValue(1)
+        assert hasher.values_hash() == reference.values_hash()
+
+        settings.child('main_settings').addChild({'name': 'new', 'type': 'int'})
+        settings.child('main_settings').removeChild(settings.child('main_settings', 'axis'))
+        assert hasher.diff(reference, structure_only=True) == [('main_settings', 'new'), ('main_settings', 'axis')]
+
+        settings.child('main_settings', 'new').setName('axis')
+        assert hasher.structure_hash() == putils.ParameterHasher(settings).structure_hash()
+        assert hasher.structure_hash() != reference.structure_hash()
+        assert hasher.diff(reference, structure_only=True) == [('main_settings',)]  # not in the same order
+
+    def test_incremental(self, monkeypatch):
+        settings = Parameter.create(name='settings', type='group', children=params)
+        hasher = putils.ParameterHasher(settings)
+        settings.sigTreeStateChanged.connect(lambda param, changes: hasher.apply_changes(changes))
+        hasher.values_hash()
+        digests = []
+        get_value_digest = putils.get_value_digest
+        monkeypatch.setattr(putils, 'get_value_digest',
+                            lambda param: digests.append(param.name()) or get_value_digest(param))
+        settings.child('main_settings', 'Nviewers').setValue(5)
+        hasher.values_hash()
+        assert digests == ['settings', 'main_settings', 'Nviewers']  # only the path to the root
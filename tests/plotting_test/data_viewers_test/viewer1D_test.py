@@ -36,8 +36,71 @@ class TestLineoutPlotter:
 
 
 class TestDataDisplayer:
-    #TODO
-    pass
+    def test_xy_labels_set_once(self, init_viewer1d):
+        prog, data = init_viewer1d
+        prog.show_data(data)
+        prog.get_action('xyplot').trigger()
+        displayer = prog.view.data_displayer
+        assert prog.view.plotitem.getAxis('bottom').labelText == data.labels[0]
+        config = displayer._xy_config
+        with mock.patch.object(prog.view.plotitem.getAxis('bottom'), 'setLabel') as mock_label:
+            prog.show_data(data)
+            mock_label.assert_not_called()
+        assert displayer._xy_config == config
+        assert np.allclose(displayer.get_plot_item(0).getData()[0], data[0])
+
+        prog.get_action('xyplot').trigger()
+        assert prog.view.plotitem.getAxis('bottom').labelText == data.axes[0].label
+
+    def test_xy_scatter(self, init_viewer1d):
+        prog, data = init_viewer1d
+        prog.show_data(data)
+        prog.get_action('xyplot').trigger()
+        prog.get_action('scatter').trigger()
+        displayer = prog.view.data_displayer
+        assert displayer._xy_current_item is displayer._xy_scatter_item
+        assert displayer._xy_scatter_item in prog.view.plotitem.items
+        assert np.allclose(displayer._xy_scatter_item.getData()[1], data[1])
+
+        prog.get_action('xyplot').trigger()
+        assert displayer._xy_scatter_item not in prog.view.plotitem.items
+        assert np.allclose(displayer.get_plot_item(0).getData()[1], data[0])
+
+    def test_xy_density(self, init_viewer1d):
+        prog, data = init_viewer1d
+        displayer = prog.view.data_displayer
+        displayer.xy_density_threshold = 100
+        displayer.xy_density_bins = 16
+        x = np.random.randn(1000)
+        dwa = data_mod.DataRaw('cloud', data=[x, 2 * x + np.random.randn(1000)])
+        prog.show_data(dwa)
+        prog.get_action('xyplot').trigger()
+        assert prog.is_action_visible('xy_density')
+        prog.get_action('xy_density').trigger()
+        assert displayer._xy_current_item is displayer._xy_density_item
+        assert displayer._xy_density_item.image.shape == (16, 16)
+        assert np.sum(displayer._xy_density_item.image) == pytest.approx(1000)
+
+        prog.get_action('xy_density').trigger()
+        assert displayer._xy_current_item is displayer.get_plot_item(0)
+
+
+    def test_xy_multi_channels(self, init_viewer1d):
+        prog, data = init_viewer1d
+        x = np.linspace(0, 1, 11)
+        dwa = data_mod.DataRaw('three', data=[x, 2 * x, 3 * x])
+        prog.show_data(dwa)
+        prog.get_action('xyplot').trigger()
+        displayer = prog.view.data_displayer
+        for ind in range(2):
+            assert np.allclose(displayer.get_plot_item(ind).getData()[0], x)
+            assert np.allclose(displayer.get_plot_item(ind).getData()[1], (ind + 2) * x)
+        assert displayer.get_plot_item(2).getData()[0] is None or displayer.get_plot_item(2).getData()[0].size == 0
+        assert prog.view.plotitem.getAxis('left').labelText == ' / '.join(dwa.labels[1:])
+
+        prog.get_action('scatter').trigger()  # no dedicated scatter item with more than two channels
+        assert displayer._xy_current_item is displayer.get_plot_item(0)
+        assert np.allclose(displayer.get_plot_item(1).getData()[1], 3 * x)
 
 
 class TestView1D:
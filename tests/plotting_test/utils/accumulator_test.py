@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+import numpy as np
+import pytest
+
+from qtpy import QtWidgets
+
+from pymodaq_data import data as data_mod
+
+from pymodaq_gui.plotting.utils.accumulator import Accumulator, AccumulationMode
+from pymodaq_gui.plotting.data_viewers.viewer1D import Viewer1D
+from pymodaq_gui.plotting.data_viewers.viewer2D import Viewer2D
+
+
+def get_frames(n_frames=7, shape=(10,)):
+    return [data_mod.DataRaw('mydata', data=[np.random.rand(*shape), np.random.rand(*shape)])
+            for _ in range(n_frames)]
+
+
+class TestAccumulator:
+    def test_mode(self):
+        accumulator = Accumulator()
+        assert accumulator.mode == AccumulationMode.RunningMean
+        accumulator.mode = 'Max hold'
+        assert accumulator.mode == AccumulationMode.MaxHold
+        accumulator.mode = 'EMA'
+        assert accumulator.mode == AccumulationMode.EMA
+        with pytest.raises(ValueError):
+            accumulator.mode = 'not a mode'
+
+    @pytest.mark.parametrize('length', [1, 3, 5])
+    def test_running_mean(self, length):
+        frames = get_frames()
+        accumulator = Accumulator(AccumulationMode.RunningMean, length)
+        for ind, frame in enumerate(frames):
+            dwa = accumulator.accumulate(frame)
+            for ind_channel in range(len(frame)):
+                expected = np.mean([frame_bis[ind_channel] for frame_bis in
+                                    frames[max(0, ind - length + 1):ind + 1]], axis=0)
+                assert np.allclose(dwa[ind_channel], expected)
+
+    def test_cumulative_mean(self):
+        frames = get_frames()
+        accumulator = Accumulator(AccumulationMode.CumulativeMean)
+        for frame in frames:
+            dwa = accumulator.accumulate(frame)
+        assert accumulator.n_frames == len(frames)
+        assert np.allclose(dwa[0], np.mean([frame[0] for frame in frames], axis=0))
+
+    def test_ema(self):
+        frames = get_frames()
+        accumulator = Accumulator(AccumulationMode.EMA, 4)
+        expected = frames[0][1]
+        for ind, frame in enumerate(frames):
+            dwa = accumulator.accumulate(frame)
+            if ind > 0:
+                expected = 0.75 * expected + 0.25 * frame[1]
+        assert np.allclose(dwa[1], expected)
+
+    @pytest.mark.parametrize('mode', ['MaxHold', 'MinHold'])
+    def test_hold(self, mode):
+        frames = get_frames(shape=(5, 6))
+        accumulator = Accumulator(mode)
+        for frame in frames:
+            dwa = accumulator.accumulate(frame)
+        func = np.max if mode == 'MaxHold' else np.min
+        assert np.allclose(dwa[0], func([frame[0] for frame in frames], axis=0))
+        assert dwa.shape == frames[0].shape
+
+    def test_reallocation(self):
+        accumulator = Accumulator(AccumulationMode.CumulativeMean)
+        for frame in get_frames(shape=(10,)):
+            accumulator.accumulate(frame)
+        frames = get_frames(3, shape=(20,))
+        for frame in frames:
+            dwa = accumulator.accumulate(frame)
+        assert accumulator.n_frames == 3
+        assert np.allclose(dwa[0], np.mean([frame[0] for frame in frames], axis=0))
+
+    def test_output_is_a_copy(self):
+        accumulator = Accumulator(AccumulationMode.MaxHold)
+        frames = get_frames(2)
+        dwa = accumulator.accumulate(frames[0])
+        array = dwa[0].copy()
+        accumulator.accumulate(frames[1] + 10)
+        assert np.allclose(dwa[0], array)
+
+
+@pytest.mark.parametrize('viewer_class, shape', [(Viewer1D, (10,)), (Viewer2D, (5, 6))])
+def test_viewer_accumulation(qtbot, viewer_class, shape):
+    widget = QtWidgets.QWidget()
+    prog = viewer_class(widget)
+    qtbot.addWidget(widget)
+
+    prog.activate_accumulation(True)
+    assert prog.is_action_checked('accumulate')
+    prog.get_action('accumulation_mode').setCurrentText(AccumulationMode.MaxHold.value)
+    assert prog.accumulator.mode == AccumulationMode.MaxHold
+
+    exported = []
+    prog.data_to_export_signal.connect(exported.append)
+    frames = get_frames(shape=shape)
+    for frame in frames:
+        prog.show_data(frame)
+    dwa = exported[-1].get_data_from_name('Accumulated_mydata')
+    assert np.allclose(dwa[0], np.max([frame[0] for frame in frames], axis=0))
+    assert prog._raw_data.name == 'mydata'  # the displayed data keep their name
+
+    n_frames = prog.accumulator.n_frames
+    prog.show_data_temp(frames[0] + 10)  # temporary displays are not accumulated
+    assert prog.accumulator.n_frames == n_frames
+    prog.show_data(frames[0])
+    assert np.allclose(prog._raw_data[0], np.max([frame[0] for frame in frames], axis=0))
+
+    prog.activate_accumulation(False)
+    assert not prog.accumulator.is_active
+    widget.close()
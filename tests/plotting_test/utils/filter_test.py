@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+import numpy as np
+import pytest
+
+from qtpy import QtWidgets
+
+from pymodaq_data import data as data_mod
+from pymodaq_utils import math_utils as mutils
+
+from pymodaq_gui.plotting.data_viewers.viewer1D import Viewer1D
+from pymodaq_gui.plotting.utils.filter import ROIBandReducer
+
+
+@pytest.fixture
+def init_viewer1d(qtbot):
+    widget = QtWidgets.QWidget()
+    prog = Viewer1D(widget)
+    qtbot.addWidget(widget)
+    x = np.linspace(0, 200, 201)
+    data = data_mod.DataRaw('mydata', data=[mutils.gauss1D(x, 75, 25), mutils.gauss1D(x, 120, 50, 2)],
+                            axes=[data_mod.Axis('myaxis', 'units', data=x)])
+    yield prog, data
+    widget.close()
+
+
+class TestROIBandReducer:
+    def test_reduce(self):
+        array = np.random.rand(3, 100)
+        slices = [slice(0, 10), slice(5, 50), slice(40, 100), slice(20, 20)]
+        reducer = ROIBandReducer()
+        reducer.set_bounds(slices)
+        assert len(reducer) == len(slices)
+
+        sums, means = reducer.reduce(array, axis=1)
+        assert sums.shape == (3, len(slices))
+        for ind, _slice in enumerate(slices[:-1]):
+            assert np.allclose(sums[:, ind], np.sum(array[:, _slice], axis=1))
+            assert np.allclose(means[:, ind], np.mean(array[:, _slice], axis=1))
+        assert np.allclose(sums[:, -1], 0.)
+        assert np.all(np.isnan(means[:, -1]))
+
+    def test_dtypes(self):
+        reducer = ROIBandReducer()
+        reducer.set_bounds([slice(0, 4)])
+        sums, means = reducer.reduce(np.arange(10, dtype=np.uint16))
+        assert sums[0] == 6
+        assert np.issubdtype(sums.dtype, np.integer)
+        assert means[0] == pytest.approx(1.5)
+
+        sums, means = reducer.reduce(np.ones((10,), dtype=np.float32))
+        assert sums.dtype == np.float32
+
+
+class TestFilter1DFromRois:
+    @pytest.mark.parametrize('use_channel', ['All', 'mydata_CH000'])
+    def test_batched_same_as_processors(self, init_viewer1d, use_channel):
+        prog, data = init_viewer1d
+        prog.show_data(data)
+        for ind in range(3):
+            prog.roi_manager.add_roi_programmatically('')
+        for ind, roi_key in enumerate(prog.roi_manager.ROIs):
+            prog.roi_manager.settings.child('ROIs', roi_key, 'math_function').setValue(
+                ['sum', 'mean', 'max'][ind])
+            prog.roi_manager.settings.child('ROIs', roi_key, 'use_channel').setValue(use_channel)
+            prog.roi_manager.ROIs[roi_key].setRegion((ind * 30, ind * 30 + 50))
+
+        filter_from_rois = prog.filter_from_rois
+        dte = filter_from_rois._filter_data(data)
+        assert len(dte) == 2 * len(prog.roi_manager.ROIs)
+
+        for roi_key, roi in prog.roi_manager.ROIs.items():
+            roi_param = prog.roi_manager.settings.child('ROIs', roi_key)
+            dte_ref = filter_from_rois.get_data_from_roi(roi, roi_param, data)
+            for dwa_ref in dte_ref:
+                dwa = dte.get_data_from_name_origin(dwa_ref.name, roi_key)
+                if use_channel != 'All':
+                    dwa_ref = dwa_ref.pop(0)
+                assert dwa.labels == dwa_ref.labels
+                assert dwa.shape == dwa_ref.shape
+                for array, array_ref in zip(dwa, dwa_ref):
+                    assert np.allclose(array, array_ref)
+
+    def test_bounds_invalidation(self, init_viewer1d):
+        prog, data = init_viewer1d
+        prog.show_data(data)
+        prog.roi_manager.add_roi_programmatically('')
+        roi_key = list(prog.roi_manager.ROIs.keys())[0]
+        prog.roi_manager.settings.child('ROIs', roi_key, 'math_function').setValue('sum')
+        prog.roi_manager.settings.child('ROIs', roi_key, 'use_channel').setValue('All')
+        roi = prog.roi_manager.ROIs[roi_key]
+
+        roi.setRegion((10, 20))
+        prog.roi_manager.roi_changed.emit()
+        dte = prog.filter_from_rois._filter_data(data)
+        assert np.allclose(dte.get_data_from_name_origin('IntData', roi_key)[0],
+                           np.sum(data[0][10:20]))
+
+        roi.setRegion((50, 100))
+        prog.roi_manager.roi_changed.emit()
+        dte = prog.filter_from_rois._filter_data(data)
+        assert np.allclose(dte.get_data_from_name_origin('IntData', roi_key)[0],
+                           np.sum(data[0][50:100]))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+import numpy as np
+import pytest
+
+from qtpy import QtWidgets
+
+from pymodaq_data import data as data_mod
+from pymodaq_utils import math_utils as mutils
+
+from pymodaq_gui.plotting.utils.persistence import PersistenceHistogram
+from pymodaq_gui.plotting.data_viewers.viewer1D import Viewer1D
+
+
+class TestPersistenceHistogram:
+    def test_binning(self):
+        persistence = PersistenceHistogram(amplitude_bins=10)
+        persistence.amplitude_range = (0, 10)
+        trace = np.array([0.5, 1.5, 9.5, 12., -1., np.nan])
+        persistence.add_traces(trace)
+        histogram = persistence.histogram
+        assert histogram.shape == (6, 10)
+        assert histogram[0, 0] == 1
+        assert histogram[1, 1] == 1
+        assert histogram[2, 9] == 1
+        assert np.sum(histogram) == 3  # out of range and nan values are dropped
+
+    def test_stack_of_traces(self):
+        persistence = PersistenceHistogram(amplitude_bins=64)
+        x = np.linspace(0, 100, 101)
+        traces = np.stack([mutils.gauss1D(x, 50 + jitter, 10) for jitter in np.random.randn(500)])
+        persistence.add_traces(traces)
+        assert persistence.n_traces == 500
+        assert np.allclose(np.sum(persistence.histogram, axis=1), 500)
+
+    def test_time_binning(self):
+        persistence = PersistenceHistogram(amplitude_bins=8, max_time_bins=100)
+        persistence.add_traces(np.random.rand(3, 1000))
+        assert persistence.n_time_bins == 100
+        assert np.allclose(np.sum(persistence.histogram, axis=1), 3 * 10)
+
+    def test_decay(self):
+        persistence = PersistenceHistogram(amplitude_bins=4, decay=0.5)
+        persistence.amplitude_range = (0, 4)
+        trace = np.array([0.5, 1.5])
+        persistence.add_traces(trace)
+        persistence.add_traces(trace)
+        assert persistence.histogram[0, 0] == pytest.approx(1.5)
+        with pytest.raises(ValueError):
+            persistence.decay = 2
+
+    def test_nan_first_trace(self):
+        persistence = PersistenceHistogram(amplitude_bins=10)
+        persistence.add_traces(np.full((10,), np.nan))
+        assert persistence.amplitude_range is None
+        assert persistence.histogram is None
+        persistence.add_traces(np.array([np.nan, 1., 2., np.inf]))
+        assert np.all(np.isfinite(persistence.amplitude_range))
+        assert np.sum(persistence.histogram) == 2
+
+    def test_widening(self):
+        persistence = PersistenceHistogram(amplitude_bins=100)
+        persistence.add_traces(np.linspace(0, 1, 11))
+        amp_range = persistence.amplitude_range
+        persistence.add_traces(np.linspace(0, 1, 11) + 5)
+        assert persistence.amplitude_range[0] == amp_range[0]
+        assert persistence.amplitude_range[1] > 6
+        assert np.sum(persistence.histogram) == 22  # the counts of the first trace are kept
+        amp_min, amp_max = persistence.amplitude_range
+        bin_width = (amp_max - amp_min) / persistence.amplitude_bins
+        assert list(np.nonzero(persistence.histogram[-1])[0]) == [int((1 - amp_min) / bin_width),
+                                                                  int((6 - amp_min) / bin_width)]
+
+    def test_fixed_range_not_widened(self):
+        persistence = PersistenceHistogram(amplitude_bins=10)
+        persistence.amplitude_range = (0, 10)
+        persistence.add_traces(np.array([5., 20.]))
+        assert persistence.amplitude_range == (0., 10.)
+        assert np.sum(persistence.histogram) == 1
+
+    def test_reset(self):
+        persistence = PersistenceHistogram()
+        persistence.add_traces(np.random.rand(10))
+        assert persistence.amplitude_range is not None
+        persistence.reset(keep_range=False)
+        assert persistence.histogram is None
+        assert persistence.amplitude_range is None
+
+
+def test_viewer1D_persistence(qtbot):
+    widget = QtWidgets.QWidget()
+    prog = Viewer1D(widget)
+    qtbot.addWidget(widget)
+    x = np.linspace(0, 200, 201)
+
+    prog.get_action('persistence').trigger()
+    displayer = prog.view.persistence_displayer
+    assert displayer.is_active
+    assert displayer.get_image_item() in prog.view.plotitem.items
+    for ind in range(20):
+        prog.show_data(data_mod.DataRaw('mydata', data=[mutils.gauss1D(x, 75 + ind, 25)],
+                                        axes=[data_mod.Axis('myaxis', 'units', data=x)]))
+    assert displayer.persistence.n_traces == 20
+    assert displayer.get_image_item().image.shape == displayer.persistence.histogram.shape
+
+    prog.get_action('persistence').trigger()
+    assert displayer.get_image_item() not in prog.view.plotitem.items
+    widget.close()
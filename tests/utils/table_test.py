@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Created the 19/10/2026
+"""
+import numpy as np
+from qtpy.QtCore import Qt, QModelIndex
+
+from pymodaq_gui.parameter import Parameter, ioxml
+from pymodaq_gui.utils.widgets.table import ArrayTableModel, TableModel, TableView
+
+
+class PositiveTableModel(ArrayTableModel):
+    def validate_rows(self, rows):
+        return rows['f1'] >= 0
+
+
+def get_model(n_rows=5, model_class=ArrayTableModel) -> ArrayTableModel:
+    return model_class([[ind, 0.5 * ind, f'name{ind}'] for ind in range(n_rows)], ['index', 'value', 'name'],
+                       dtypes=[int, float, 'U16'])
+
+
+class TestArrayTableModel:
+    def test_data(self, qtbot):
+        model = get_model()
+        assert model.rowCount() == 5
+        assert model.columnCount() == 3
+        assert model.data(model.index(2, 1), Qt.DisplayRole) == 1.
+        assert model.get_data(3, 2) == 'name3'
+        assert isinstance(model.get_data(3, 0), int)
+        assert model.get_data_all()[1] == (1, 0.5, 'name1')
+        assert model.raw_data is not model.array
+        assert model == get_model()
+        assert model != get_model(4)
+
+    def test_ndarray(self, qtbot):
+        model = ArrayTableModel(np.arange(12.).reshape((4, 3)), ['x', 'y', 'z'])
+        assert model.get_data(3, 1) == 10.
+        assert model.array.dtype.names == ('f0', 'f1', 'f2')
+
+    def test_set_data(self, qtbot):
+        model = get_model(model_class=PositiveTableModel)
+        assert model.setData(model.index(1, 1), 3., Qt.EditRole)
+        assert model.get_data(1, 1) == 3.
+        assert not model.setData(model.index(1, 1), -3., Qt.EditRole)
+        assert not model.setData(model.index(1, 0), 'not an int', Qt.EditRole)
+        assert model.get_data(1, 1) == 3.
+        assert model.setData(model.index(1, 2), 'x' * 16, Qt.EditRole)
+        assert not model.setData(model.index(1, 2), 'x' * 17, Qt.EditRole)  # not truncated
+        assert model.get_data(1, 2) == 'x' * 16
+        assert model.setData(model.index(1, 0), Qt.CheckState.Checked, Qt.CheckStateRole)
+        assert model.is_checked(1)
+
+    def test_insert_remove(self, qtbot):
+        model = get_model(model_class=PositiveTableModel)
+        inserted = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        n_rows = model.insert_rows(2, [[10, 1., 'a'], [11, -1., 'invalid'], [12, 2., 'b']])
+        assert n_rows == 2
+        assert inserted == [(2, 3)]
+        assert [model.get_data(row, 0) for row in range(model.rowCount())] == [0, 1, 10, 12, 2, 3, 4]
+
+        removed = []
+        model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+        model.remove_rows([6, 1, 2, 3])
+        assert removed == [(6, 6), (1, 3)]
+        assert [model.get_data(row, 0) for row in range(model.rowCount())] == [0, 2, 3]
+
+        model.insert_data(0, [20, 1., 'c'])  # TableModel API
+        model.remove_row(1)
+        assert [model.get_data(row, 0) for row in range(model.rowCount())] == [20, 2, 3]
+        model.clear()
+        assert model.rowCount() == 0
+
+        model = get_model(2)
+        assert model.insertRows(1, 2, QModelIndex())  # plain Qt API: default rows
+        assert model.get_data_all()[1:3] == [(0, 0., ''), (0, 0., '')]
+
+    def test_large(self, qtbot):
+        n_rows = 100000
+        model = ArrayTableModel(np.random.rand(n_rows, 3), ['x', 'y', 'z'])
+        view = TableView()
+        qtbot.addWidget(view)
+        view.setModel(model)
+        model.insert_rows(n_rows // 2, np.random.rand(n_rows, 3))
+        model.remove_rows(np.arange(0, 2 * n_rows, 2))
+        assert model.rowCount() == n_rows
+
+    def test_npy_serialization(self, qtbot):
+        model = get_model()
+        assert np.array_equal(ArrayTableModel.array_from_npy_bytes(model.to_npy_bytes()), model.array)
+
+        settings = Parameter.create(name='settings', type='group', children=[
+            {'name': 'table', 'type': 'table_view', 'value': model},
+            {'name': 'list_table', 'type': 'table_view', 'value': TableModel([[0., 1.]], ['a', 'b'])}])
+        xml_string = ioxml.parameter_to_xml_string(settings)
+        assert b'npy' in xml_string
+        settings_back = ioxml.XML_string_to_pobject(xml_string)
+        assert settings_back['table'] == model
+        assert settings_back['table'].header == model.header
+        assert settings_back['list_table'].get_data_all() == [[0., 1.]]